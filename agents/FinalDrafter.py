@@ -1,183 +1,269 @@
 from agno.agent import Agent
-from agno.models.google import Gemini
 from agno.tools import Toolkit
 from agno.tools.reasoning import ReasoningTools
-from agno.tools.tavily import TavilyTools
 from agno.team import Team
 import os
-from dotenv import load_dotenv
-from agno.models.huggingface import HuggingFace
+from payload_store import payload_store, DEFAULT_SLICE_CHARS
+from agent_registry import register, get_agent, load_env, require_env, lazy_attributes
 
 # Load environment variables
-load_dotenv("../.env")
+load_env()
 
-google_api_key = os.getenv("GOOGLE_API_KEY")
-tavily_api_key = os.getenv("TAVILY_API_KEY")
-token = os.getenv("HF_TOKEN")
+# Characters of stored payloads (see payload_store) each member may read per report run
+MATCH_DRAFTER_PAYLOAD_BUDGET = int(os.getenv("MATCH_DRAFTER_PAYLOAD_BUDGET", "60000"))
+PLAYER_DRAFTER_PAYLOAD_BUDGET = int(os.getenv("PLAYER_DRAFTER_PAYLOAD_BUDGET", "20000"))
+DRAFTING_LEAD_PAYLOAD_BUDGET = int(os.getenv("DRAFTING_LEAD_PAYLOAD_BUDGET", "12000"))
 
-# Validate environment variables
-if not google_api_key:
-    raise ValueError("GOOGLE_API_KEY not found in environment variables.")
-if not tavily_api_key:
-    raise ValueError("TAVILY_API_KEY not found in environment variables.")
+payload_instructions = (
+    "Large data (e.g. full ball-by-ball commentary) is passed around as a payload handle such as 'pl_1a2b3c4d5e' with a short summary. "
+    "Read only the parts you need with read_payload, e.g. one innings or a range of overs, instead of the whole payload."
+)
 
-llm = Gemini(id=os.getenv("GOOGLE_MODEL2"), api_key=google_api_key)
+class PayloadTools(Toolkit):
+    def __init__(self, member: str, char_budget: int):
+        super().__init__(name="Payload Reader", tools=[self.describe_payload, self.read_payload], instructions=payload_instructions, add_instructions=True)
+        self.member = member
+        self.char_budget = char_budget
+
+    def describe_payload(self, handle: str) -> str:
+        """
+        Describe a stored payload without reading it: what it is, its size, and per innings the over range and
+        the number of wickets, fours and sixes.
+
+        Args:
+            handle (str): Payload handle, e.g. "pl_1a2b3c4d5e".
+
+        Returns:
+            str: The payload summary, or an error message if the handle is unknown.
+        """
+        entry = payload_store.get(handle)
+        if entry is None:
+            return f"Error: unknown or expired payload handle {handle}."
+        return f"{entry['label']}, {entry['chars']} characters\n{entry['summary']}"
+
+    def read_payload(self, handle: str, innings: int | None = None, from_over: int | None = None, to_over: int | None = None, max_chars: int = DEFAULT_SLICE_CHARS) -> str:
+        """
+        Read part of a stored payload, such as one innings or a range of overs of the commentary.
+
+        Args:
+            handle (str): Payload handle, e.g. "pl_1a2b3c4d5e".
+            innings (int, optional): Only this innings (1, 2, ...).
+            from_over (int, optional): Only balls from this over on (ball 19.2 belongs to over 19).
+            to_over (int, optional): Only balls up to and including this over.
+            max_chars (int): Maximum number of characters to return.
+
+        Returns:
+            str: The requested slice as compact text, or an error message.
+
+        Usage:
+            Start with the slices that matter for the report (e.g. the death overs or the innings with the result-defining collapse)
+            and narrow the range when the slice is truncated. Your reading budget per report is limited.
+        """
+        remaining = payload_store.remaining_budget(self.member, self.char_budget)
+        if remaining <= 0:
+            return "Error: payload reading budget for this report is used up. Write the report with the data already read."
+        text = payload_store.get_slice(handle, innings=innings, from_over=from_over, to_over=to_over, max_chars=min(max_chars, remaining))
+        if text is None:
+            return f"Error: unknown or expired payload handle {handle}."
+        payload_store.charge(self.member, len(text))
+        return text
+
+
+def drafter_model():
+    # Provider SDKs are imported on first build, so importing this module stays cheap
+    from agno.models.google import Gemini
+
+    google_api_key, = require_env("GOOGLE_API_KEY")
+    return Gemini(id=os.getenv("GOOGLE_MODEL2"), api_key=google_api_key)
+
+
+def tavily_tools():
+    from agno.tools.tavily import TavilyTools
+
+    tavily_api_key, = require_env("TAVILY_API_KEY")
+    return TavilyTools(api_key=tavily_api_key, format="json")
 
-model = HuggingFace(
-    "mistralai/Mixtral-8x7B-Instruct-v0.1", 
-    provider="hf-inference", 
-    api_key=token,
-)
 
 # Enhanced Batting Statistics Report Drafter Agent
-batting_stats_drafter_agent = Agent(
-    name="Batting Statistics Report Specialist",
-    description=(
-        "A specialized agent that crafts detailed, publication-ready reports on cricket players' batting statistics, "
-        "presenting data in a clear, tabular Markdown format for professional use."
-    ),
-    role=(
-        "As a Senior Sports Journalist, you are tasked with creating high-quality reports on cricket players' batting statistics, "
-        "ensuring accurate and engaging presentation of performance data for sports publications."
-    ),
-    model=llm,
-    instructions=[
-        "Generate a detailed report on cricket player's batting statistics based on provided JSON or textual data.",
-        "Structure the report in Markdown format, using well-organized tables to present all batting statistics across all formats.",
-        "Include all data from the provided JSON or text without omission or modification, ensuring accuracy and completeness.",
-        "Use ReasoningTools to logically organize the data into a clear, readable format suitable for a sports newspaper.",
-        "Optionally, use TavilyTools to fetch supplementary information (e.g., recent batting achievements or milestones) to enhance the report's context, citing sources appropriately.",
-        "Ensure the report maintains a professional journalistic tone, is human-readable, and is ready for publication.",
-        "Include a header with the report title and the current date and time ({datetime}) for timeliness.",
-        "The final output must be in Markdown format with proper formatting and no invented or altered data.",
-        "Never Include any Cricbuzz ID of any Match or Player in the report, as it is not allowed to be used in any publication.",
-        "Ensure the report is comprehensive, covering all relevant batting statistics such as runs scored, averages and strike rates across formats (Test, ODI, T20, IPL), and includes any notable records or achievements.",
-    ],
-    tools=[ReasoningTools(), TavilyTools(api_key=tavily_api_key, format="json")],
-    show_tool_calls=True,
-)
+@register("batting_stats_drafter_agent")
+def build_batting_stats_drafter_agent():
+    return Agent(
+        name="Batting Statistics Report Specialist",
+        description=(
+            "A specialized agent that crafts detailed, publication-ready reports on cricket players' batting statistics, "
+            "presenting data in a clear, tabular Markdown format for professional use."
+        ),
+        role=(
+            "As a Senior Sports Journalist, you are tasked with creating high-quality reports on cricket players' batting statistics, "
+            "ensuring accurate and engaging presentation of performance data for sports publications."
+        ),
+        model=drafter_model(),
+        instructions=[
+            "Generate a detailed report on cricket player's batting statistics based on provided JSON or textual data.",
+            "Structure the report in Markdown format, using well-organized tables to present all batting statistics across all formats.",
+            "Include all data from the provided JSON or text without omission or modification, ensuring accuracy and completeness.",
+            "Use ReasoningTools to logically organize the data into a clear, readable format suitable for a sports newspaper.",
+            "Optionally, use TavilyTools to fetch supplementary information (e.g., recent batting achievements or milestones) to enhance the report's context, citing sources appropriately.",
+            "Ensure the report maintains a professional journalistic tone, is human-readable, and is ready for publication.",
+            "Include a header with the report title and the current date and time ({datetime}) for timeliness.",
+            "The final output must be in Markdown format with proper formatting and no invented or altered data.",
+            "Never Include any Cricbuzz ID of any Match or Player in the report, as it is not allowed to be used in any publication.",
+            "Ensure the report is comprehensive, covering all relevant batting statistics such as runs scored, averages and strike rates across formats (Test, ODI, T20, IPL), and includes any notable records or achievements.",
+        ],
+        tools=[ReasoningTools(), tavily_tools(), PayloadTools("batting_drafter", PLAYER_DRAFTER_PAYLOAD_BUDGET)],
+        show_tool_calls=True,
+    )
+
+
 
 # Enhanced Bowling Statistics Report Drafter Agent
-bowling_stats_drafter_agent = Agent(
-    name="Bowling Statistics Report Specialist",
-    description=(
-        "A specialized agent that produces detailed, publication-ready reports on cricket players' bowling statistics, "
-        "formatted in clear, tabular Markdown for professional sports publications."
-    ),
-    role=(
-        "As a Senior Sports Journalist, you are responsible for crafting high-quality reports on cricket players' bowling statistics, "
-        "presenting performance data in an engaging and accurate manner for sports media."
-    ),
-    model=llm,
-    instructions=[
-        "Generate a detailed report on cricket players' bowling statistics based on provided JSON or textual data.",
-        "Structure the report in Markdown format, using well-organized tables to present all bowling statistics (e.g., wickets, average, economy rate) across formats (Test, ODI, T20, IPL).",
-        "Include all data from the provided JSON or text without omission or modification, ensuring accuracy and completeness.",
-        "Use ReasoningTools to logically organize the data into a clear, readable format suitable for a sports newspaper.",
-        "Optionally, use TavilyTools to fetch supplementary information (e.g., notable bowling performances or records) to enhance the report's context, citing sources appropriately.",
-        "Ensure the report maintains a professional journalistic tone, is human-readable, and is ready for publication.",
-        "Include a header with the report title and the current date and time ({datetime}) for timeliness.",
-        "The final output must be in Markdown format with proper formatting and no invented or altered data."
-    ],
-    tools=[ReasoningTools(), TavilyTools(api_key=tavily_api_key, format="json")],
-    show_tool_calls=True,
-)
+@register("bowling_stats_drafter_agent")
+def build_bowling_stats_drafter_agent():
+    return Agent(
+        name="Bowling Statistics Report Specialist",
+        description=(
+            "A specialized agent that produces detailed, publication-ready reports on cricket players' bowling statistics, "
+            "formatted in clear, tabular Markdown for professional sports publications."
+        ),
+        role=(
+            "As a Senior Sports Journalist, you are responsible for crafting high-quality reports on cricket players' bowling statistics, "
+            "presenting performance data in an engaging and accurate manner for sports media."
+        ),
+        model=drafter_model(),
+        instructions=[
+            "Generate a detailed report on cricket players' bowling statistics based on provided JSON or textual data.",
+            "Structure the report in Markdown format, using well-organized tables to present all bowling statistics (e.g., wickets, average, economy rate) across formats (Test, ODI, T20, IPL).",
+            "Include all data from the provided JSON or text without omission or modification, ensuring accuracy and completeness.",
+            "Use ReasoningTools to logically organize the data into a clear, readable format suitable for a sports newspaper.",
+            "Optionally, use TavilyTools to fetch supplementary information (e.g., notable bowling performances or records) to enhance the report's context, citing sources appropriately.",
+            "Ensure the report maintains a professional journalistic tone, is human-readable, and is ready for publication.",
+            "Include a header with the report title and the current date and time ({datetime}) for timeliness.",
+            "The final output must be in Markdown format with proper formatting and no invented or altered data."
+        ],
+        tools=[ReasoningTools(), tavily_tools(), PayloadTools("bowling_drafter", PLAYER_DRAFTER_PAYLOAD_BUDGET)],
+        show_tool_calls=True,
+    )
+
+
 
 # Enhanced Player Info and Statistics Report Drafter Agent
-player_info_stats_drafter_agent = Agent(
-    name="Comprehensive Player Report Specialist",
-    description=(
-        "A specialized agent that compiles comprehensive, publication-ready reports on cricket players, "
-        "integrating general information, career details, and batting and bowling statistics in a professional Markdown format."
-    ),
-    role=(
-        "As a Senior Sports Journalist, you are tasked with producing detailed reports that combine cricket players' general information, career milestones, "
-        "and batting and bowling statistics, formatted for sports publications."
-    ),
-    model=llm,
-    instructions=[
-        "Generate a comprehensive report on cricket players, including general information, career details, and batting and bowling statistics, based on provided JSON or textual data.",
-        "Structure the report in Markdown format with distinct sections: General Information, Career Milestones, Batting Statistics, and Bowling Statistics.",
-        "Delegate batting statistics to the Batting Statistics Report Specialist and bowling statistics to the Bowling Statistics Report Specialist, ensuring seamless integration of their outputs.",
-        "Present general information (e.g., name, role, team) and career details (e.g., debut, teams) in a narrative or tabular format, followed by statistics in tables.",
-        "Include all data from the provided JSON or text without omission or modification, ensuring accuracy and completeness.",
-        "Use ReasoningTools to organize the report logically and ensure a cohesive flow across sections.",
-        "Optionally, use TavilyTools to fetch supplementary information (e.g., recent player achievements or career highlights) to enhance the report, citing sources appropriately.",
-        "Ensure the report is human-readable, maintains a professional journalistic tone, and is ready for publication in a sports newspaper.",
-        "Include a header with the report title and the current date and time ({datetime}) for timeliness.",
-        "The final output must be in Markdown format with proper formatting and no invented or altered data."
-    ],
-    tools=[
-        batting_stats_drafter_agent,
-        bowling_stats_drafter_agent,
-        ReasoningTools(),
-        TavilyTools(api_key=tavily_api_key, format="json")
-    ],
-    show_tool_calls=True,
-)
+@register("player_info_stats_drafter_agent")
+def build_player_info_stats_drafter_agent():
+    return Agent(
+        name="Comprehensive Player Report Specialist",
+        description=(
+            "A specialized agent that compiles comprehensive, publication-ready reports on cricket players, "
+            "integrating general information, career details, and batting and bowling statistics in a professional Markdown format."
+        ),
+        role=(
+            "As a Senior Sports Journalist, you are tasked with producing detailed reports that combine cricket players' general information, career milestones, "
+            "and batting and bowling statistics, formatted for sports publications."
+        ),
+        model=drafter_model(),
+        instructions=[
+            "Generate a comprehensive report on cricket players, including general information, career details, and batting and bowling statistics, based on provided JSON or textual data.",
+            "Structure the report in Markdown format with distinct sections: General Information, Career Milestones, Batting Statistics, and Bowling Statistics.",
+            "Delegate batting statistics to the Batting Statistics Report Specialist and bowling statistics to the Bowling Statistics Report Specialist, ensuring seamless integration of their outputs.",
+            "Present general information (e.g., name, role, team) and career details (e.g., debut, teams) in a narrative or tabular format, followed by statistics in tables.",
+            "Include all data from the provided JSON or text without omission or modification, ensuring accuracy and completeness.",
+            "Use ReasoningTools to organize the report logically and ensure a cohesive flow across sections.",
+            "Optionally, use TavilyTools to fetch supplementary information (e.g., recent player achievements or career highlights) to enhance the report, citing sources appropriately.",
+            "Ensure the report is human-readable, maintains a professional journalistic tone, and is ready for publication in a sports newspaper.",
+            "Include a header with the report title and the current date and time ({datetime}) for timeliness.",
+            "The final output must be in Markdown format with proper formatting and no invented or altered data."
+        ],
+        tools=[
+            get_agent("batting_stats_drafter_agent"),
+            get_agent("bowling_stats_drafter_agent"),
+            ReasoningTools(),
+            tavily_tools(),
+            PayloadTools("player_drafter", PLAYER_DRAFTER_PAYLOAD_BUDGET),
+        ],
+        show_tool_calls=True,
+    )
+
+
 
 # Enhanced Cricket Match Report Drafter Agent
-match_report_drafter = Agent(
-    name="Cricket Match Report Specialist",
-    description=(
-        "A specialized agent that crafts comprehensive, publication-ready reports on cricket matches, "
-        "integrating match details, scores, key moments and post match awards in a professional Markdown format."
-    ),
-    role=(
-        "As a Senior Sports Journalist, you are responsible for producing engaging and detailed reports on cricket matches, "
-        "ensuring all match data is presented accurately and compellingly for sports publications."
-    ),
-    model=llm,
-    instructions=[
-        "Generate a comprehensive report on a cricket match based on provided JSON or textual data, such as scorecards, commentary, or general match information.",
-        "Structure the report in Markdown format with clear sections (e.g., Match Overview, Key Moments, Scorecard) and use tables for structured data like scores or player performances.",
-        "Include all data from the provided JSON or text without omission or modification, ensuring accuracy and completeness.",
-        "Use ReasoningTools to organize the data logically and create a narrative that captures the match's significance and key events.",
-        "Optionally, use TavilyTools to fetch supplementary information (e.g., match context, team form, or historical significance) to enhance the report, citing sources appropriately.",
-        "Ensure the report maintains a professional journalistic tone, is engaging, human-readable, and ready for publication in a sports newspaper.",
-        "Include a header with the report title and the current date and time ({datetime}) for timeliness.",
-        "The final output must be in Markdown format with proper formatting and no invented or altered data."
-    ],
-    tools=[ReasoningTools(), TavilyTools(api_key=tavily_api_key, format="json")],
-    show_tool_calls=True,
-)
+@register("match_report_drafter")
+def build_match_report_drafter():
+    return Agent(
+        name="Cricket Match Report Specialist",
+        description=(
+            "A specialized agent that crafts comprehensive, publication-ready reports on cricket matches, "
+            "integrating match details, scores, key moments and post match awards in a professional Markdown format."
+        ),
+        role=(
+            "As a Senior Sports Journalist, you are responsible for producing engaging and detailed reports on cricket matches, "
+            "ensuring all match data is presented accurately and compellingly for sports publications."
+        ),
+        model=drafter_model(),
+        instructions=[
+            "Generate a comprehensive report on a cricket match based on provided JSON or textual data, such as scorecards, commentary, or general match information.",
+            "Structure the report in Markdown format with clear sections (e.g., Match Overview, Key Moments, Scorecard) and use tables for structured data like scores or player performances.",
+            "Include all data from the provided JSON or text without omission or modification, ensuring accuracy and completeness.",
+            "Use ReasoningTools to organize the data logically and create a narrative that captures the match's significance and key events.",
+            "Optionally, use TavilyTools to fetch supplementary information (e.g., match context, team form, or historical significance) to enhance the report, citing sources appropriately.",
+            "When the commentary is given as a payload handle, use describe_payload to see the innings and over ranges, then read_payload only the phases that shape the story (e.g. powerplay, collapses, the final overs).",
+            "Ensure the report maintains a professional journalistic tone, is engaging, human-readable, and ready for publication in a sports newspaper.",
+            "Include a header with the report title and the current date and time ({datetime}) for timeliness.",
+            "The final output must be in Markdown format with proper formatting and no invented or altered data."
+        ],
+        tools=[ReasoningTools(), tavily_tools(), PayloadTools("match_drafter", MATCH_DRAFTER_PAYLOAD_BUDGET)],
+        show_tool_calls=True,
+    )
+
+
 
 # Team Definition (unchanged, included for completeness)
-FinalReportDraftingTeam = Team(
-    name="Elite Cricket Report Syndicate",
-    description=(
-        "A specialized team of senior sports journalist agents that collaboratively produce publication-ready, comprehensive reports on cricket matches, players, or both, "
-        "integrating match details, player profiles, and performance statistics in a professional and engaging format."
-    ),
-    members=[
-        batting_stats_drafter_agent,
-        bowling_stats_drafter_agent,
-        player_info_stats_drafter_agent,
-        match_report_drafter
-    ],
-    tools=[ReasoningTools(), TavilyTools(api_key=tavily_api_key, format="json")],
-    mode="coordinate",
-    model=llm,
-    instructions=[
-        "Operate as a cohesive team of Senior Sports Journalists to draft comprehensive, publication-ready reports on cricket matches, players, or both, based on user queries and provided JSON or textual data.",
-        "Analyze the user query to determine whether it pertains to a match, player(s), or both, and delegate tasks to the appropriate agent(s):",
-        "  - Use `match_report_drafter` for match-related queries (e.g., scorecards, commentary, general match info).",
-        "  - Use `player_info_stats_drafter_agent` for player-related queries, which will coordinate with `batting_stats_drafter_agent` and `bowling_stats_drafter_agent` for statistics.",
-        "Ensure all provided JSON or textual data is included in the report without omission or modification.",
-        "Use ReasoningTools to structure data logically and TavilyTools to fetch supplementary information (e.g., recent player achievements or match context) to enhance report quality, if needed.",
-        "Integrate outputs from member agents into a single, cohesive Markdown report with clear sections (e.g., Match Overview, Player Profile, Batting Statistics, Bowling Statistics) and tabular formats where appropriate.",
-        "Maintain a professional, journalistic tone suitable for a sports newspaper, ensuring clarity, accuracy, and engagement.",
-        "Handle errors gracefully, including invalid data or API failures, by including error messages in the report or delegating to appropriate agents for resolution.",
-        "The final report must be in Markdown format, well-organized, and ready for conversion to .docx for publication.",
-        "Include the current date and time (provided as {datetime}) in the report header to reflect the report's timeliness.",
-        "Every report must be detailed with atleast the atleast the overview, background of the cricket match or player, and a conclusion section that summarizes the key points and insights along with otehr all parts of the report",
-        "The final output must be a single, cohesive Markdown report saved as a .md file, meeting the highest standards of professional sports journalism."
-    ],
-    enable_agentic_context=True,
-    share_member_interactions=True,
-    success_criteria=(
-        "The Elite Cricket Report Syndicate succeeds when it accurately delegates tasks based on the query, incorporates all provided data into a professional, publication-ready Markdown report "
-        "with clear sections and tables, handles errors gracefully, enhances content with relevant supplementary information, and delivers a single cohesive output suitable for .docx conversion."
-    ),
-    add_datetime_to_instructions=True,
-)
\ No newline at end of file
+@register("FinalReportDraftingTeam")
+def build_final_report_drafting_team():
+    return Team(
+        name="Elite Cricket Report Syndicate",
+        description=(
+            "A specialized team of senior sports journalist agents that collaboratively produce publication-ready, comprehensive reports on cricket matches, players, or both, "
+            "integrating match details, player profiles, and performance statistics in a professional and engaging format."
+        ),
+        members=[
+            get_agent("batting_stats_drafter_agent"),
+            get_agent("bowling_stats_drafter_agent"),
+            get_agent("player_info_stats_drafter_agent"),
+            get_agent("match_report_drafter"),
+        ],
+        tools=[ReasoningTools(), tavily_tools(), PayloadTools("drafting_lead", DRAFTING_LEAD_PAYLOAD_BUDGET)],
+        mode="coordinate",
+        model=drafter_model(),
+        instructions=[
+            "Operate as a cohesive team of Senior Sports Journalists to draft comprehensive, publication-ready reports on cricket matches, players, or both, based on user queries and provided JSON or textual data.",
+            "Analyze the user query to determine whether it pertains to a match, player(s), or both, and delegate tasks to the appropriate agent(s):",
+            "  - Use `match_report_drafter` for match-related queries (e.g., scorecards, commentary, general match info).",
+            "  - Use `player_info_stats_drafter_agent` for player-related queries, which will coordinate with `batting_stats_drafter_agent` and `bowling_stats_drafter_agent` for statistics.",
+            "Ensure all provided JSON or textual data is included in the report without omission or modification.",
+            "Ranking and comparison tables received from the data fetchers are computed exactly; reproduce their numbers and order as given instead of recalculating averages, strike rates, economies or rankings.",
+            "Pass payload handles (e.g. 'pl_1a2b3c4d5e') to members unchanged together with their summaries; do not read the whole payload yourself, members read the slices they need.",
+            "Use ReasoningTools to structure data logically and TavilyTools to fetch supplementary information (e.g., recent player achievements or match context) to enhance report quality, if needed.",
+            "Integrate outputs from member agents into a single, cohesive Markdown report with clear sections (e.g., Match Overview, Player Profile, Batting Statistics, Bowling Statistics) and tabular formats where appropriate.",
+            "Maintain a professional, journalistic tone suitable for a sports newspaper, ensuring clarity, accuracy, and engagement.",
+            "Handle errors gracefully, including invalid data or API failures, by including error messages in the report or delegating to appropriate agents for resolution.",
+            "The final report must be in Markdown format, well-organized, and ready for conversion to .docx for publication.",
+            "Include the current date and time (provided as {datetime}) in the report header to reflect the report's timeliness.",
+            "Every report must be detailed with atleast the atleast the overview, background of the cricket match or player, and a conclusion section that summarizes the key points and insights along with otehr all parts of the report",
+            "The final output must be a single, cohesive Markdown report saved as a .md file, meeting the highest standards of professional sports journalism."
+        ],
+        enable_agentic_context=True,
+        share_member_interactions=True,
+        success_criteria=(
+            "The Elite Cricket Report Syndicate succeeds when it accurately delegates tasks based on the query, incorporates all provided data into a professional, publication-ready Markdown report "
+            "with clear sections and tables, handles errors gracefully, enhances content with relevant supplementary information, and delivers a single cohesive output suitable for .docx conversion."
+        ),
+        add_datetime_to_instructions=True,
+    )
+
+
+__getattr__ = lazy_attributes(__name__, [
+    "batting_stats_drafter_agent",
+    "bowling_stats_drafter_agent",
+    "player_info_stats_drafter_agent",
+    "match_report_drafter",
+    "FinalReportDraftingTeam",
+])
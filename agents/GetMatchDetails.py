@@ -1,25 +1,11 @@
 import os
-from dotenv import load_dotenv
-import requests
-from agno.models.groq import Groq
-from agno.models.google import Gemini
 from agno.tools import Toolkit
 from agno.agent import Agent
 from agno.tools.reasoning import ReasoningTools
-
-# Load environment variables
-load_dotenv("../.env")
-
-x_api_token = os.getenv("X-RAPID-API-KEY")
-x_api_host = os.getenv("X-RAPID-API-HOST")
-google_api_key = os.getenv("GOOGLE_API_KEY")
-
-# Validate environment variables
-if not x_api_token or not x_api_host:
-    raise ValueError("X-RAPID-API-KEY or X-RAPID-API-HOST not found in environment variables.")
-
-goog_llm = Gemini(id=os.getenv("GOOGLE_MODEL1"),api_key=google_api_key)
-groq_llm = Groq(id="llama3-70b-8192",api_key=os.getenv("GROQ_API_KEY"))
+import cricbuzz_client
+from compaction import compact, for_model
+from payload_store import offload_if_large
+from agent_registry import register, require_env, lazy_attributes
 
 cricket_instructions = "You are an AI-powered tool that can fetch information about any cricket match, given the cricket match ID using all available tools."
 
@@ -27,12 +13,42 @@ class CricketMatchTools(Toolkit):
     def __init__(self):
         super().__init__(
             name="Cricket Tool",
-            tools=[self.get_match_score_card, self.get_match_commentary, self.get_general_match_info],
+            tools=[self.get_match_dossier, self.get_match_score_card, self.get_match_commentary, self.get_general_match_info],
             instructions=cricket_instructions,
             add_instructions=True
         )
 
-    def get_match_score_card(self, matchID: int) -> dict:
+    def get_match_dossier(self, matchID: int) -> str | dict:
+        """
+        Fetch the general info, full scorecard and commentary of a cricket match in one call.
+
+        Args:
+            matchID (int): Unique ID of the cricket match.
+
+        Returns:
+            str: Compact text with "matchID", "info", "scorecard" and "commentary" sections, each holding the data
+                 of the corresponding endpoint (or an error message if that endpoint failed).
+
+        Usage:
+            Use this tool for full match reports instead of calling the individual tools one after another.
+        """
+        if not isinstance(matchID, int) or matchID <= 0:
+            return {"error": "Invalid matchID. Must be a positive integer."}
+
+        results = cricbuzz_client.fetch_many([(endpoint, matchID) for endpoint in cricbuzz_client.MATCH_SECTIONS.values()])
+        dossier = {"matchID": matchID, **dict(zip(cricbuzz_client.MATCH_SECTIONS, results))}
+        # Large commentary is stored for this run and only its handle and summary go into the dossier
+        commentary = dossier.pop("commentary")
+        label = f"match_commentary:{matchID}"
+        commentary = offload_if_large(commentary, for_model(commentary, label), label)
+        dossier_text = for_model(dossier, f"match_dossier:{matchID}")
+        if not isinstance(dossier_text, str):
+            return {**dossier_text, "commentary": commentary}
+        if not isinstance(commentary, str):
+            commentary = compact(commentary)
+        return f"{dossier_text}\ncommentary:\n{commentary}"
+
+    def get_match_score_card(self, matchID: int) -> str | dict:
         """
         Fetch the complete scorecard of a specific cricket match.
 
@@ -40,7 +56,7 @@ class CricketMatchTools(Toolkit):
             matchID (int): Unique ID of the cricket match.
 
         Returns:
-            dict: JSON data containing detailed scorecard information for each innings.
+            str: Compact text form of the JSON data containing detailed scorecard information for each innings.
 
         Usage:
             Use this tool when you need in-depth statistics of each player’s performance in a given match.
@@ -48,20 +64,9 @@ class CricketMatchTools(Toolkit):
         if not isinstance(matchID, int) or matchID <= 0:
             return {"error": "Invalid matchID. Must be a positive integer."}
 
-        url = f"https://cricbuzz-cricket.p.rapidapi.com/mcenter/v1/{matchID}/scard"
-        headers = {
-            "x-rapidapi-key": x_api_token,
-            "x-rapidapi-host": x_api_host
-        }
-
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            return {"error": f"API request failed: {str(e)}"}
+        return for_model(cricbuzz_client.fetch("match_scorecard", matchID), f"match_scorecard:{matchID}")
 
-    def get_match_commentary(self, matchID: int) -> dict:
+    def get_match_commentary(self, matchID: int) -> str | dict:
         """
         Retrieve the live or past ball-by-ball text commentary of a cricket match.
 
@@ -69,7 +74,8 @@ class CricketMatchTools(Toolkit):
             matchID (int): Unique ID of the cricket match.
 
         Returns:
-            dict: JSON data with over-wise and ball-wise commentary.
+            str: Compact text form of the JSON data with over-wise and ball-wise commentary. Long commentary is
+                 returned as a payload handle with a per-innings summary instead.
 
         Usage:
             Use this tool to reconstruct the flow of the match or understand key moments.
@@ -77,20 +83,11 @@ class CricketMatchTools(Toolkit):
         if not isinstance(matchID, int) or matchID <= 0:
             return {"error": "Invalid matchID. Must be a positive integer."}
 
-        url = f"https://cricbuzz-cricket.p.rapidapi.com/mcenter/v1/{matchID}/comm"
-        headers = {
-            "x-rapidapi-key": x_api_token,
-            "x-rapidapi-host": x_api_host
-        }
-
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            return {"error": f"API request failed: {str(e)}"}
+        commentary = cricbuzz_client.fetch("match_commentary", matchID)
+        label = f"match_commentary:{matchID}"
+        return offload_if_large(commentary, for_model(commentary, label), label)
 
-    def get_general_match_info(self, matchID: int) -> dict:
+    def get_general_match_info(self, matchID: int) -> str | dict:
         """
         Get general metadata and high-level details about a cricket match.
 
@@ -98,7 +95,7 @@ class CricketMatchTools(Toolkit):
             matchID (int): Unique ID of the cricket match.
 
         Returns:
-            dict: JSON data including teams, venue, toss result, match status, and team lineups.
+            str: Compact text form of the JSON data including teams, venue, toss result, match status, and team lineups.
 
         Usage:
             Use this tool to extract contextual and logistical information about the match.
@@ -106,49 +103,50 @@ class CricketMatchTools(Toolkit):
         if not isinstance(matchID, int) or matchID <= 0:
             return {"error": "Invalid matchID. Must be a positive integer."}
 
-        url = f"https://cricbuzz-cricket.p.rapidapi.com/mcenter/v1/{matchID}"
-        headers = {
-            "x-rapidapi-key": x_api_token,
-            "x-rapidapi-host": x_api_host
-        }
-
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            return {"error": f"API request failed: {str(e)}"}
-
-cricket_data_agent = Agent(
-    name="Cricket Data Fetcher",
-    model=goog_llm,
-    role="Cricket Data Specialist",
-    description=(
-        "An agent designed to fetch raw JSON data for cricket matches using a provided match ID. "
-        "It retrieves scorecards, ball-by-ball commentary, or general match information without analyzing or summarizing the data."
-    ),
-    tools=[CricketMatchTools(), ReasoningTools()],
-    instructions="""
+        return for_model(cricbuzz_client.fetch("match_info", matchID), f"match_info:{matchID}")
+
+@register("cricket_data_agent")
+def build_cricket_data_agent():
+    from agno.models.google import Gemini
+
+    require_env("X-RAPID-API-KEY", "X-RAPID-API-HOST")
+    goog_llm = Gemini(id=os.getenv("GOOGLE_MODEL1"), api_key=os.getenv("GOOGLE_API_KEY"))
+
+    return Agent(
+        name="Cricket Data Fetcher",
+        model=goog_llm,
+        role="Cricket Data Specialist",
+        description=(
+            "An agent designed to fetch raw JSON data for cricket matches using a provided match ID. "
+            "It retrieves scorecards, ball-by-ball commentary, or general match information without analyzing or summarizing the data."
+        ),
+        tools=[CricketMatchTools(), ReasoningTools()],
+        instructions="""
         Your role is to fetch JSON data for cricket matches based on the matchID provided by the user, using the CricketMatchTools toolkit.
 
         Available tools:
-        1. **get_match_score_card(matchID: int)**: Retrieves the full match scorecard with detailed player statistics.
-        2. **get_match_commentary(matchID: int)**: Fetches over-wise and ball-by-ball match commentary.
-        3. **get_general_match_info(matchID: int)**: Obtains general match details such as teams, venue, toss result, and status.
+        1. **get_match_dossier(matchID: int)**: Retrieves general info, the full scorecard and commentary together in a single call.
+        2. **get_match_score_card(matchID: int)**: Retrieves the full match scorecard with detailed player statistics.
+        3. **get_match_commentary(matchID: int)**: Fetches over-wise and ball-by-ball match commentary.
+        4. **get_general_match_info(matchID: int)**: Obtains general match details such as teams, venue, toss result, and status.
 
         Response requirements:
         - Call only the tool(s) specified by the user's request (e.g., scorecard, commentary, or general info).
+        - When the request needs more than one kind of match data (e.g., a full match report), call `get_match_dossier` once instead of the individual tools.
         - You can use the ReasontingTools to reason about ambiguios user requests and determine the most suitable tool to call.
-        - Return the raw JSON data as received from the API, formatted with proper indentation for readability.
+        - Return the tool output exactly as received. It is already in a compact text form (pipe-separated tables and indented sections); do NOT convert it back to JSON or re-indent it.
+        - Long commentary comes back as a payload handle line (e.g. "[payload handle pl_1a2b3c4d5e: ...]") with a summary; return it unchanged, it is read later by the report drafters.
         - Do NOT analyze, summarize, or provide explanations of the data.
         - If the user specifies a particular type of data (e.g., "get scorecard for matchID 123"), use only the corresponding tool.
-        - Pretty-print the JSON output using json.dumps with an indent of 2 for clarity.
 
         Example queries:
         - "Fetch the scorecard for match ID 45063"
         - "Get commentary for match ID 99500"
         - "Retrieve general info for match ID 67320"
 
-        Use only the provided tools and return only the JSON data.
+        Use only the provided tools and return only the data they return.
         """
-)
\ No newline at end of file
+    )
+
+
+__getattr__ = lazy_attributes(__name__, ["cricket_data_agent"])
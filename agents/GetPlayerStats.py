@@ -1,56 +1,179 @@
 from agno.agent import Agent
-from agno.models.google import Gemini
-from agno.models.groq import Groq
 from agno.tools import Toolkit
 from agno.tools.reasoning import ReasoningTools
 import os
-import requests
-from dotenv import load_dotenv
-load_dotenv("../.env")
-
-google_api_key = os.getenv("GOOGLE_API_KEY")
-x_rapidapi_key=os.getenv("X-RAPID-API-KEY")
-x_rapidapi_host=os.getenv("X-RAPID-API-HOST")
+from agent_registry import register, lazy_attributes
 
 cricket_instructions = "You are an AI-powered tool that can fetch information about any cricket player given the player ID by using all the available tools to the full potential."
 
 from agno.agent import Toolkit
-import requests
+import cricbuzz_client
+from compaction import for_model
+import stats_engine
 
 class CricketPlayerTool(Toolkit):
     def __init__(self):
-        super().__init__(name="Cricket Player Tool", tools=[self.get_player_batting_stats, self.get_player_bowling_stats, self.get_player_info, self.get_player_career_info], instructions=cricket_instructions, add_instructions=True)
+        super().__init__(name="Cricket Player Tool", tools=[self.get_player_dossier, self.get_multiple_players_stats, self.rank_players, self.compare_players, self.get_player_batting_stats, self.get_player_bowling_stats, self.get_player_info, self.get_player_career_info], instructions=cricket_instructions, add_instructions=True)
 
-    def get_player_batting_stats(self, playerID: int) -> dict:
+    def get_player_dossier(self, playerID: int) -> str | dict:
         """
-        Fetch batting statistics for a specific cricket player.
+        Fetch the full dossier of a cricket player (profile, career, batting and bowling statistics) in one call.
 
         Args:
             playerID (int): Unique ID of the cricket player.
 
         Returns:
-            dict: JSON data containing batting statistics across formats (Test, ODI, T20, IPL).
+            str: Compact text with "playerID", "info", "career", "batting" and "bowling" sections, each holding the
+                 data of the corresponding endpoint (or an error message if that endpoint failed).
 
         Usage:
-            Use this tool to retrieve detailed batting performance metrics, such as runs, average, and strike rate.
+            Use this tool for full player reports instead of calling the four individual tools one after another.
         """
         if not isinstance(playerID, int) or playerID <= 0:
             return {"error": "Invalid playerID. Must be a positive integer."}
 
-        url = f"https://cricbuzz-cricket.p.rapidapi.com/stats/v1/player/{playerID}/batting"
-        headers = {
-            "x-rapidapi-key": x_rapidapi_key,
-            "x-rapidapi-host": x_rapidapi_host
-        }
+        results = cricbuzz_client.fetch_many([(endpoint, playerID) for endpoint in cricbuzz_client.PLAYER_SECTIONS.values()])
+        dossier = {"playerID": playerID, **dict(zip(cricbuzz_client.PLAYER_SECTIONS, results))}
+        return for_model(dossier, f"player_dossier:{playerID}")
+
+    def get_multiple_players_stats(self, playerIDs: list[int], stat_kinds: list[str] | None = None) -> str | dict:
+        """
+        Fetch statistics for several cricket players at once, e.g. for "Top N" or comparison reports.
+
+        Args:
+            playerIDs (list[int]): Unique IDs of the cricket players. Repeated IDs are fetched only once.
+            stat_kinds (list[str], optional): Data to fetch for every player, any of "batting", "bowling", "info" and
+                                              "career". Defaults to ["batting", "bowling"].
 
+        Returns:
+            str: Compact text with a "players" entry per player holding the requested sections and an "errors" list
+                 naming any section that could not be fetched, plus "failed" listing the IDs that failed entirely.
+
+        Usage:
+            Use this tool whenever statistics of more than one player are needed, instead of one call per player.
+        """
+        invalid = [playerID for playerID in playerIDs if not isinstance(playerID, int) or playerID <= 0]
+        if not playerIDs or invalid:
+            return {"error": f"Invalid playerIDs {invalid}. Must be a non-empty list of positive integers."}
+
+        stat_kinds = list(dict.fromkeys(stat_kinds or ["batting", "bowling"]))
         try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            return {"error": f"API request failed: {str(e)}"}
+            players = cricbuzz_client.fetch_players_bulk(playerIDs, stat_kinds)
+        except ValueError as e:
+            return {"error": str(e)}
+        failed = [player["playerID"] for player in players if len(player["errors"]) == len(stat_kinds)]
+        return for_model({"players": players, "failed": failed}, f"players_bulk:{len(players)}")
+
+    def _load_stats_table(self, playerIDs: list[int], kind: str):
+        # Fetches the stats and names of every player concurrently and loads them into a stats_engine table
+        invalid = [playerID for playerID in playerIDs if not isinstance(playerID, int) or playerID <= 0]
+        if not playerIDs or invalid:
+            return None, [], {"error": f"Invalid playerIDs {invalid}. Must be a non-empty list of positive integers."}
+        if kind not in stats_engine.KINDS:
+            return None, [], {"error": f"Invalid kind. Must be one of {', '.join(stats_engine.KINDS)}."}
+
+        players = cricbuzz_client.fetch_players_bulk(playerIDs, [kind, "info"])
+        failed = [player["playerID"] for player in players if kind in player["errors"]]
+        payloads = [
+            (player["playerID"], (player["info"] or {}).get("name") or f"Player {player['playerID']}", player[kind])
+            for player in players if kind not in player["errors"]
+        ]
+        if not payloads:
+            return None, failed, {"error": f"Could not fetch {kind} statistics for any of the players {failed}."}
+        return stats_engine.load_tables(kind, payloads), failed, None
+
+    def rank_players(self, playerIDs: list[int], kind: str = "batting", metric: str | None = None, format_name: str = "All", top_n: int | None = None) -> str | dict:
+        """
+        Rank cricket players by a batting or bowling statistic, computed exactly from their career numbers.
 
-    def get_player_bowling_stats(self, playerID: int) -> dict:
+        Args:
+            playerIDs (list[int]): Unique IDs of the candidate players.
+            kind (str): "batting" or "bowling".
+            metric (str, optional): Statistic to rank by. Batting: "runs", "average", "strike_rate", "boundary_pct",
+                                    "balls_per_boundary", "conversion_pct", "runs_per_match", "hundreds", "fifties", "sixes".
+                                    Bowling: "wickets", "average", "economy", "strike_rate", "wickets_per_match",
+                                    "maiden_pct", "five_wickets". Defaults to runs (batting) or wickets (bowling).
+            format_name (str): "Test", "ODI", "T20", "IPL" or "All" for the whole career across formats.
+            top_n (int, optional): Number of players to return. Defaults to all ranked players.
+
+        Returns:
+            str: A Markdown ranking table with the usual statistics and the percentile of the ranking statistic
+                 among the candidates, followed by notes on players left out.
+
+        Usage:
+            Use this tool for "Top N" and "best ... by ..." reports instead of ranking players by hand. Rate statistics
+            only rank players with at least 10 innings (batting) or 300 balls (bowling) in that format.
+        """
+        table, failed, error = self._load_stats_table(playerIDs, kind)
+        if error:
+            return error
+        try:
+            order = stats_engine.rank(table, metric, format_name)
+        except ValueError as e:
+            return {"error": str(e)}
+        ranked = order[:top_n] if top_n else order
+        metric = metric or stats_engine.DEFAULT_RANK_METRIC[kind]
+        format_name = table.formats[table.format_index(format_name)]
+
+        lines = [f"{kind.capitalize()} ranking by {metric} ({format_name})", ""]
+        lines.append(stats_engine.to_markdown(table, format_name, order=ranked, with_percentile=metric))
+        unranked = [table.names[p] for p in range(len(table.player_ids)) if p not in order]
+        if unranked:
+            lines.append(f"\nNot ranked (no data or below the minimum sample in {format_name}): {', '.join(unranked)}")
+        if failed:
+            lines.append(f"\nStatistics unavailable for player IDs: {', '.join(map(str, failed))}")
+        return "\n".join(lines)
+
+    def compare_players(self, playerIDs: list[int], kind: str = "batting", format_name: str = "All") -> str | dict:
+        """
+        Compare cricket players' batting or bowling statistics side by side, with derived statistics (average,
+        strike rate, economy, boundary %) computed exactly and a per-format breakdown for each player.
+
+        Args:
+            playerIDs (list[int]): Unique IDs of the players to compare.
+            kind (str): "batting" or "bowling".
+            format_name (str): Format of the side-by-side table: "Test", "ODI", "T20", "IPL" or "All".
+
+        Returns:
+            str: A Markdown comparison table followed by one format-split table per player.
+
+        Usage:
+            Use this tool for head-to-head and multi-player comparison reports.
+        """
+        table, failed, error = self._load_stats_table(playerIDs, kind)
+        if error:
+            return error
+        try:
+            format_name = table.formats[table.format_index(format_name)]
+        except ValueError as e:
+            return {"error": str(e)}
+
+        lines = [f"{kind.capitalize()} comparison ({format_name})", "", stats_engine.to_markdown(table, format_name)]
+        for p, name in enumerate(table.names):
+            lines.extend(["", f"{name}: {kind} by format", "", stats_engine.format_splits(table, p)])
+        if failed:
+            lines.append(f"\nStatistics unavailable for player IDs: {', '.join(map(str, failed))}")
+        return "\n".join(lines)
+
+    def get_player_batting_stats(self, playerID: int) -> str | dict:
+        """
+        Fetch batting statistics for a specific cricket player.
+
+        Args:
+            playerID (int): Unique ID of the cricket player.
+
+        Returns:
+            str: Compact text form of the JSON data containing batting statistics across formats (Test, ODI, T20, IPL).
+
+        Usage:
+            Use this tool to retrieve detailed batting performance metrics, such as runs, average, and strike rate.
+        """
+        if not isinstance(playerID, int) or playerID <= 0:
+            return {"error": "Invalid playerID. Must be a positive integer."}
+
+        return for_model(cricbuzz_client.fetch("player_batting", playerID), f"player_batting:{playerID}")
+
+    def get_player_bowling_stats(self, playerID: int) -> str | dict:
         """
         Fetch bowling statistics for a specific cricket player.
 
@@ -58,7 +181,7 @@ class CricketPlayerTool(Toolkit):
             playerID (int): Unique ID of the cricket player.
 
         Returns:
-            dict: JSON data containing bowling statistics across formats (Test, ODI, T20, IPL).
+            str: Compact text form of the JSON data containing bowling statistics across formats (Test, ODI, T20, IPL).
 
         Usage:
             Use this tool to retrieve detailed bowling performance metrics, such as wickets, average, and economy rate.
@@ -66,20 +189,9 @@ class CricketPlayerTool(Toolkit):
         if not isinstance(playerID, int) or playerID <= 0:
             return {"error": "Invalid playerID. Must be a positive integer."}
 
-        url = f"https://cricbuzz-cricket.p.rapidapi.com/stats/v1/player/{playerID}/bowling"
-        headers = {
-            "x-rapidapi-key": x_rapidapi_key,
-            "x-rapidapi-host": x_rapidapi_host
-        }
-
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            return {"error": f"API request failed: {str(e)}"}
+        return for_model(cricbuzz_client.fetch("player_bowling", playerID), f"player_bowling:{playerID}")
 
-    def get_player_info(self, playerID: int) -> dict:
+    def get_player_info(self, playerID: int) -> str | dict:
         """
         Fetch profile information for a specific cricket player.
 
@@ -87,7 +199,7 @@ class CricketPlayerTool(Toolkit):
             playerID (int): Unique ID of the cricket player.
 
         Returns:
-            dict: JSON data including name, date of birth, role, batting style, and bowling style.
+            str: Compact text form of the JSON data including name, date of birth, role, batting style, and bowling style.
 
         Usage:
             Use this tool to extract personal and professional details about the player.
@@ -95,20 +207,9 @@ class CricketPlayerTool(Toolkit):
         if not isinstance(playerID, int) or playerID <= 0:
             return {"error": "Invalid playerID. Must be a positive integer."}
 
-        url = f"https://cricbuzz-cricket.p.rapidapi.com/stats/v1/player/{playerID}"
-        headers = {
-            "x-rapidapi-key": x_rapidapi_key,
-            "x-rapidapi-host": x_rapidapi_host
-        }
-
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            return {"error": f"API request failed: {str(e)}"}
+        return for_model(cricbuzz_client.fetch("player_info", playerID), f"player_info:{playerID}")
 
-    def get_player_career_info(self, playerID: int) -> dict:
+    def get_player_career_info(self, playerID: int) -> str | dict:
         """
         Fetch career information for a specific cricket player.
 
@@ -116,7 +217,7 @@ class CricketPlayerTool(Toolkit):
             playerID (int): Unique ID of the cricket player.
 
         Returns:
-            dict: JSON data including teams, debut matches, and last matches across formats.
+            str: Compact text form of the JSON data including teams, debut matches, and last matches across formats.
 
         Usage:
             Use this tool to extract career milestones and team affiliations for the player.
@@ -124,42 +225,42 @@ class CricketPlayerTool(Toolkit):
         if not isinstance(playerID, int) or playerID <= 0:
             return {"error": "Invalid playerID. Must be a positive integer."}
 
-        url = f"https://cricbuzz-cricket.p.rapidapi.com/stats/v1/player/{playerID}/career"
-        headers = {
-            "x-rapidapi-key": x_rapidapi_key,
-            "x-rapidapi-host": x_rapidapi_host
-        }
-
-        try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.RequestException as e:
-            return {"error": f"API request failed: {str(e)}"}
+        return for_model(cricbuzz_client.fetch("player_career", playerID), f"player_career:{playerID}")
         
 
-cricket_player_agent = Agent(
-    name="Cricket Player Data Fetcher",
-    model=Gemini(id=os.getenv("GOOGLE_MODEL1"), api_key=google_api_key),
-    role="Cricket Player Data Specialist",
-    description=(
-        "An agent designed to fetch raw JSON data for cricket players using a provided player ID. "
-        "It retrieves batting statistics, bowling statistics, profile information, or career details without analyzing or summarizing the data."
-    ),
-    tools=[CricketPlayerTool(), ReasoningTools()],
-    instructions="""
+@register("cricket_player_agent")
+def build_cricket_player_agent():
+    from agno.models.google import Gemini
+
+    return Agent(
+        name="Cricket Player Data Fetcher",
+        model=Gemini(id=os.getenv("GOOGLE_MODEL1"), api_key=os.getenv("GOOGLE_API_KEY")),
+        role="Cricket Player Data Specialist",
+        description=(
+            "An agent designed to fetch raw JSON data for cricket players using a provided player ID. "
+            "It retrieves batting statistics, bowling statistics, profile information, or career details without analyzing or summarizing the data."
+        ),
+        tools=[CricketPlayerTool(), ReasoningTools()],
+        instructions="""
         Your role is to fetch raw JSON data for cricket players based on the playerID provided by the user, using the CricketPlayerTool toolkit.
 
         Available tools in CricketPlayerTool:
-        1. **get_player_batting_stats(playerID: int)**: Retrieves batting statistics across formats.
-        2. **get_player_bowling_stats(playerID: int)**: Fetches bowling statistics across formats.
-        3. **get_player_info(playerID: int)**: Obtains profile details such as name, date of birth, role, batting style, and bowling style.
-        4. **get_player_career_info(playerID: int)**: Retrieves career details including teams, debut matches, and last matches.
+        1. **get_player_dossier(playerID: int)**: Retrieves profile, career, batting and bowling data together in a single call.
+        2. **get_multiple_players_stats(playerIDs: list[int], stat_kinds: list[str])**: Retrieves the requested data kinds ("batting", "bowling", "info", "career") for several players in a single call.
+        3. **rank_players(playerIDs: list[int], kind: str, metric: str, format_name: str, top_n: int)**: Ranks players by a batting or bowling statistic and returns a finished Markdown table.
+        4. **compare_players(playerIDs: list[int], kind: str, format_name: str)**: Returns finished Markdown comparison tables with derived statistics and per-format splits.
+        5. **get_player_batting_stats(playerID: int)**: Retrieves batting statistics across formats.
+        6. **get_player_bowling_stats(playerID: int)**: Fetches bowling statistics across formats.
+        7. **get_player_info(playerID: int)**: Obtains profile details such as name, date of birth, role, batting style, and bowling style.
+        8. **get_player_career_info(playerID: int)**: Retrieves career details including teams, debut matches, and last matches.
 
         Response requirements:
         - Call only the tool(s) specified by the user's request (e.g., batting stats, bowling stats, profile, or career info).
         - Do not call any tool that is not relevant to the user's request.
-        - Return the raw JSON data as received from the API.
+        - When the request needs more than one kind of player data (e.g., a full player report), call `get_player_dossier` once instead of the individual tools.
+        - For "Top N" or ranking requests, call `rank_players` once with all candidate IDs; for comparisons, call `compare_players` once. Their tables are computed exactly, do not recompute them.
+        - For other requests covering several players, call `get_multiple_players_stats` once with all player IDs instead of one call per player.
+        - Return the data exactly as received from the tools. It is already in a compact text form (pipe-separated tables and indented sections); do NOT convert it to JSON.
         - You can use the ReasontingTools to reason about ambiguios user requests and determine the most suitable tool to call.
         - Do NOT analyze, summarize, or provide explanations of the data.
         - If the user specifies a particular type of data (e.g., "get batting stats for playerID 123"), use only the corresponding tool.
@@ -170,9 +271,14 @@ cricket_player_agent = Agent(
         - "Get bowling statistics for player ID 625383"
         - "Retrieve profile info for player ID 28081"
         - "Get career info for player ID 253802"
+        - "Fetch everything about player ID 1413"
+        - "Get bowling stats for player IDs 9311, 625383 and 8271"
+        - "Rank player IDs 9311, 625383 and 8271 by bowling economy in T20"
 
-        Use only the provided tools and return only the JSON data.
+        Use only the provided tools and return only the data they return.
         """,
-)
+    )
     
 
+
+__getattr__ = lazy_attributes(__name__, ["cricket_player_agent"])
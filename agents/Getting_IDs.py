@@ -1,62 +1,127 @@
 from agno.agent import Agent
-from agno.models.google import Gemini
 import os
 from agno.team.team import Team
-from dotenv import load_dotenv
-from agno.tools.tavily import TavilyTools
 from agno.tools.reasoning import ReasoningTools
-load_dotenv("../.env")
-
-google_api_key=os.getenv("GOOGLE_API_KEY")
-tavily_api_key = os.getenv("TAVILY_API_KEY")
-
-model = Gemini(id=os.getenv("GOOGLE_MODEL2"),api_key=google_api_key)
-
-match_id_agent = Agent(
-    name="Cricbuzz MatchID Finder",
-    model=model,
-    tools=[TavilyTools(api_key=tavily_api_key, format="json")],
-    role="Cricbuzz Match ID Finding Agent using TavilySearch",
-    description="You are an AI agent that can find the Match ID on Cricbuzz for the match specified by the user.",
-    instructions="When the user provides a match name or details in the query, use the TavilySearch tool to find its ID on Cricbuzz. Ensure the search is specific to Cricbuzz and the match context, and return the ID in the format specified.",
-    markdown=True,
-    show_tool_calls=True,
-    expected_output="""ID: {id}"""
-)
-
-player_id_agent = Agent(
-    name="Cricbuzz PlayerID Finder",
-    model=model,
-    tools=[TavilyTools(api_key=tavily_api_key, format="json")],
-    role="Cricbuzz Player ID Finding Agent using DuckDuckGoSearch",
-    description="You are an AI agent that can find the Player ID on Cricbuzz for the player specified by the user.",
-    instructions="When the user provides a player name in the query, use the TavilySearch tool to find their ID on Cricbuzz. Ensure the search is specific to Cricbuzz and the player's profile, and return the ID in the format specified.",
-    markdown=True,
-    show_tool_calls=True,
-    expected_output="""ID: {id}"""
-)
-
-Getting_ID_Team = Team(
-    members=[match_id_agent, player_id_agent],
-    name="Cricbuzz ID Finding Team",
-    mode="coordinate",
-    model=model,
-    show_tool_calls=True,
-    markdown=True,
-    tools=[ReasoningTools()],
-    description="You are a coordinating team that directs user queries to the appropriate agent to find either a Match ID or a Player ID on Cricbuzz.",
-    instructions="""
+from agno.tools import Toolkit
+from id_index import get_id_index, KINDS
+from agent_registry import register, get_agent, require_env, lazy_attributes
+
+
+def id_finder_model():
+    # Provider SDKs are imported on first build, so importing this module stays cheap
+    from agno.models.google import Gemini
+
+    google_api_key, = require_env("GOOGLE_API_KEY")
+    return Gemini(id=os.getenv("GOOGLE_MODEL2"), api_key=google_api_key)
+
+
+def tavily_tools():
+    from agno.tools.tavily import TavilyTools
+
+    return TavilyTools(api_key=os.getenv("TAVILY_API_KEY"), format="json")
+
+id_index_instructions = "You can look up Cricbuzz IDs of already known players and matches in a local index, and record newly found IDs in it."
+
+class CricbuzzIDIndexTools(Toolkit):
+    def __init__(self):
+        super().__init__(name="Cricbuzz ID Index", tools=[self.lookup_cricbuzz_id, self.remember_cricbuzz_id], instructions=id_index_instructions, add_instructions=True)
+
+    def lookup_cricbuzz_id(self, name: str, kind: str) -> dict:
+        """
+        Look up the Cricbuzz ID of a player or match in the local ID index.
+
+        Args:
+            name (str): Player name (e.g. "Virat Kohli") or match description (e.g. "RCB vs PBKS IPL 2025 Final").
+            kind (str): "player" or "match".
+
+        Returns:
+            dict: {"id", "name", "score"} if the index knows the player or match, otherwise {"found": False}.
+
+        Usage:
+            Use this tool before any web search; only search the web when it returns {"found": False}.
+        """
+        if kind not in KINDS:
+            return {"error": f"Invalid kind. Must be one of {', '.join(KINDS)}."}
+        return get_id_index().lookup(kind, name) or {"found": False}
+
+    def remember_cricbuzz_id(self, name: str, kind: str, cricbuzz_id: int) -> dict:
+        """
+        Record a Cricbuzz ID found through web search, so the next lookup of the same player or match is instant.
+
+        Args:
+            name (str): Player name or match description the ID belongs to.
+            kind (str): "player" or "match".
+            cricbuzz_id (int): The Cricbuzz ID that was found.
+
+        Returns:
+            dict: {"saved": True} on success, or {"error": ...}.
+        """
+        if kind not in KINDS:
+            return {"error": f"Invalid kind. Must be one of {', '.join(KINDS)}."}
+        if not isinstance(cricbuzz_id, int) or cricbuzz_id <= 0:
+            return {"error": "Invalid cricbuzz_id. Must be a positive integer."}
+        get_id_index().add(kind, name, cricbuzz_id, source="team")
+        return {"saved": True}
+
+@register("match_id_agent")
+def build_match_id_agent():
+    return Agent(
+        name="Cricbuzz MatchID Finder",
+        model=id_finder_model(),
+        tools=[tavily_tools()],
+        role="Cricbuzz Match ID Finding Agent using TavilySearch",
+        description="You are an AI agent that can find the Match ID on Cricbuzz for the match specified by the user.",
+        instructions="When the user provides a match name or details in the query, use the TavilySearch tool to find its ID on Cricbuzz. Ensure the search is specific to Cricbuzz and the match context, and return the ID in the format specified.",
+        markdown=True,
+        show_tool_calls=True,
+        expected_output="""ID: {id}"""
+    )
+
+
+@register("player_id_agent")
+def build_player_id_agent():
+    return Agent(
+        name="Cricbuzz PlayerID Finder",
+        model=id_finder_model(),
+        tools=[tavily_tools()],
+        role="Cricbuzz Player ID Finding Agent using DuckDuckGoSearch",
+        description="You are an AI agent that can find the Player ID on Cricbuzz for the player specified by the user.",
+        instructions="When the user provides a player name in the query, use the TavilySearch tool to find their ID on Cricbuzz. Ensure the search is specific to Cricbuzz and the player's profile, and return the ID in the format specified.",
+        markdown=True,
+        show_tool_calls=True,
+        expected_output="""ID: {id}"""
+    )
+
+
+@register("Getting_ID_Team")
+def build_getting_id_team():
+    return Team(
+        members=[get_agent("match_id_agent"), get_agent("player_id_agent")],
+        name="Cricbuzz ID Finding Team",
+        mode="coordinate",
+        model=id_finder_model(),
+        show_tool_calls=True,
+        markdown=True,
+        tools=[CricbuzzIDIndexTools(), ReasoningTools()],
+        description="You are a coordinating team that directs user queries to the appropriate agent to find either a Match ID or a Player ID on Cricbuzz.",
+        instructions="""
     Analyze the user's query to determine whether it refers to a cricket match or a player or both. 
+    - First call `lookup_cricbuzz_id` for every player and match in the query. If it returns an ID, use it directly and do not route that player or match to any agent.
+    - After an agent finds an ID, call `remember_cricbuzz_id` with the player name or match description and the ID.
     - If the query contains terms related to a match (e.g., team names, tournament, series, or date), route it to the `match_id_agent`.
     - If the query contains a player's name or terms related to a cricketer, route it to the `player_id_agent`.
     - Use the ReasoningTools to interpret ambiguous queries and decide the best agent to handle the request.
     - The query may contain both match and player details; in such cases, route it to the `match_id_agent` first, and then to the `player_id_agent` if necessary.
     - Ensure the selected agent processes the query and returns the ID in the format: `ID: {id}`.
+    - If the query names several players (e.g., a "Top 5" list or a comparison), send all of them to the `player_id_agent` in a single delegation and return one line per player in the format: `{player_name}: {id}`.
     - If either agent fails to find the ID, return a message indicating that the ID could not be found.
     - If either Match ID or Player ID, any one of them is to be rqeuired than the output should be in the format : `ID: {id}`.
     - If Both Match ID and Player ID are to be required then the output should be in the format : `Match ID: {match_id}, Player ID: {player_id}`.
     """,
-    enable_agentic_context=True,
-    share_member_interactions=True,
-    success_criteria="The Team succeeds when it has successfully Fetched the CORRECT ID for a given Cricket Match or a Cricket Player."
-)
+        enable_agentic_context=True,
+        share_member_interactions=True,
+        success_criteria="The Team succeeds when it has successfully Fetched the CORRECT ID for a given Cricket Match or a Cricket Player."
+    )
+
+
+__getattr__ = lazy_attributes(__name__, ["match_id_agent", "player_id_agent", "Getting_ID_Team"])
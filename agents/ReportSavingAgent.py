@@ -1,58 +1,148 @@
 from agno.agent import Agent
 from agno.tools import tool
-from agno.models.google import Gemini
+import logging
 import os
-from dotenv import load_dotenv
 from pathlib import Path
-import markdown
-from docx import Document
-import pypandoc
-from datetime import datetime
+from docx_writer import convert_markdown_file
+from artifact_store import get_artifact_store
+from run_context import get_run_id
+from agent_registry import register, load_env, require_env, lazy_attributes
+from tracing import span
+from datetime import datetime, timezone
 import re
 
-report_filepath = ""
-
 # Load environment variables
-load_dotenv("../.env")
-google_api_key = os.getenv("GOOGLE_API_KEY")
+load_env()
 
-# Validate environment variables
-if not google_api_key:
-    raise ValueError("GOOGLE_API_KEY not found in environment variables.")
+logger = logging.getLogger(__name__)
 
 # Base directory for saving reports
 base_directory = Path("../reports/")
 
-def md_to_docx_with_pandoc(md_file_path, output_path):
+# "direct" saves the team's final report in code once it is done; "agent" keeps `saving_agent` as a team member
+# that saves it through the `write_file` tool
+REPORT_SAVE_MODE = os.getenv("REPORT_SAVE_MODE", "direct")
+DIRECT = "direct"
+AGENT = "agent"
+if REPORT_SAVE_MODE not in (DIRECT, AGENT):
+    raise ValueError(f"Unknown REPORT_SAVE_MODE: {REPORT_SAVE_MODE}. Expected '{DIRECT}' or '{AGENT}'.")
+
+# Longest file name (without timestamp and extension) derived from a report title
+MAX_FILENAME_CHARS = 80
+
+_TITLE_LINE = re.compile(r"^#{1,2}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+
+def report_directory(report_id: str = None) -> Path:
+    """Directory a report's files are written to: its own subdirectory inside a report run, else the base directory."""
+    return base_directory / report_id if report_id else base_directory
+
+
+def save_markdown_report(filename: str, markdown_report: str) -> Path:
     """
-    Converts a Markdown file to a DOCX file using Pandoc.
+    Writes a report as `filename`.md, converts it to DOCX and, inside a report run, records both files in the
+    run's artifacts (see `artifact_store`).
 
-    Args:
-        md_file_path (str): Path to the input Markdown file.
-        output_path (str): Path where the DOCX file will be saved.
+    Each run writes into its own directory, so concurrent runs never overwrite each other's files.
+
+    Returns:
+        Path: The DOCX file.
 
     Raises:
-        RuntimeError: If Pandoc conversion fails or Pandoc is not installed.
-        OSError: If file operations encounter permission or path issues.
+        ValueError: If markdown_report is empty.
+        OSError: If file writing or directory creation fails.
+        RuntimeError: If DOCX conversion fails.
+    """
+    if not markdown_report.strip():
+        raise ValueError("Markdown report cannot be empty.")
+
+    # Sanitize filename
+    filename = re.sub(r'[<>:"/\\|?*]', '_', filename.strip())
+    if not filename.endswith(".md"):
+        filename += ".md"
+
+    report_id = get_run_id()
+    directory = report_directory(report_id)
+    directory.mkdir(parents=True, exist_ok=True)
+    filepath = directory / filename
+    with open(filepath, "w", encoding="utf-8") as file:
+        file.write(markdown_report)
+
+    docx_path = filepath.with_suffix(".docx")
+    convert_markdown_file(filepath, docx_path)
+    logger.info("Saved DOCX to %s", docx_path)
+
+    if report_id:
+        store = get_artifact_store()
+        store.record(report_id, "md", filepath)
+        store.record(report_id, "docx", docx_path)
+    return docx_path
+
+
+def report_title(markdown_report: str, query: str = None) -> str:
+    """Returns the report's title: its first H1/H2 heading, else the query, else "Cricket Report"."""
+    match = _TITLE_LINE.search(markdown_report)
+    if match:
+        title = re.sub(r"[*_`]", "", match.group(1)).strip()
+        if title:
+            return title
+    return (query or "").strip() or "Cricket Report"
+
+
+def report_filename(title: str, now: datetime) -> str:
+    """Derives a file name (without extension) from a report title, with a timestamp so reports never overwrite."""
+    stem = re.sub(r"[^\w-]+", "_", title).strip("_")[:MAX_FILENAME_CHARS].rstrip("_") or "cricket_report"
+    return f"{stem}_{now.strftime('%Y%m%d%H%M%S')}"
+
+
+def with_report_header(markdown_report: str, title: str, now: datetime) -> str:
+    """
+    Prepends the header every saved report carries: the title and the generation time in UTC. When the report
+    already starts with its title heading, only the time line is added below it.
+    """
+    generated = f"*Generated: {now.strftime('%Y-%m-%d %H:%M:%S')} UTC*"
+    body = markdown_report.strip()
+    first_line, _, rest = body.partition("\n")
+    if _TITLE_LINE.fullmatch(first_line):
+        return f"{first_line}\n\n{generated}\n\n{rest.lstrip()}\n"
+    return f"# {title}\n\n{generated}\n\n{body}\n"
+
+
+def persist_report(markdown_report: str, query: str = None, now: datetime = None) -> dict:
+    """
+    Saves a finished report without an LLM: derives the file name from its title (or the query), adds the header,
+    writes the .md and .docx files and, inside a report run, records them in the run's artifacts.
+
+    Args:
+        markdown_report (str): The team's final markdown report.
+        query (str, optional): The user's query, used for the title when the report has no heading.
+        now (datetime, optional): Generation time (UTC); defaults to the current time.
 
     Returns:
-        None: Prints a success message upon completion.
+        dict: {"title", "markdown_path", "docx_path"}.
+
+    Raises:
+        ValueError: If markdown_report is empty.
+        OSError: If file writing fails.
+        RuntimeError: If DOCX conversion fails.
     """
-    try:
-        pypandoc.convert_file(md_file_path, 'docx', outputfile=output_path)
-        print(f"Saved DOCX to {output_path}")
-    except pypandoc.PandocError as e:
-        raise RuntimeError(f"Pandoc conversion failed: {str(e)}")
-    except OSError as e:
-        raise OSError(f"File operation failed: {str(e)}")
+    # Checked before the header is added, which would make any report non-empty
+    if not markdown_report.strip():
+        raise ValueError("Markdown report cannot be empty.")
+    now = now or datetime.now(timezone.utc)
+    title = report_title(markdown_report, query)
+    with span("save", "report", chars=len(markdown_report)):
+        docx_path = save_markdown_report(report_filename(title, now), with_report_header(markdown_report, title, now))
+    return {"title": title, "markdown_path": str(docx_path.with_suffix(".md")), "docx_path": str(docx_path)}
 
 @tool
 def write_file(filename: str, markdown_report: str) -> str:
     """
     Saves a cricket report in Markdown format as a .md file and converts it to DOCX.
 
-    The function ensures the report is saved in the base directory (`../reports/`), creates the directory if it doesn't exist,
-    and sanitizes the filename to prevent invalid characters. It also converts the Markdown file to DOCX using Pandoc.
+    The function ensures the report is saved under the base directory (`../reports/`, in the report run's own subdirectory), creates the directory if it doesn't exist,
+    and sanitizes the filename to prevent invalid characters. It also converts the Markdown file to DOCX, in-process
+    (see `docx_writer`), with Pandoc as the fallback for markdown the native renderer does not support.
 
     Args:
         filename (str): Desired filename for the report (without extension). If no .md extension is provided, it is appended.
@@ -66,42 +156,15 @@ def write_file(filename: str, markdown_report: str) -> str:
     Raises:
         ValueError: If markdown_report is empty or invalid.
         OSError: If file writing or directory creation fails due to permissions or invalid paths.
-        RuntimeError: If Pandoc conversion fails.
+        RuntimeError: If DOCX conversion fails.
 
     Example:
         >>> write_file("match_123", "# Match Report\nDetails here.")
         "Markdown report saved to ../reports/match_123.md and converted to .docx format."
     """
     try:
-        # Validate input
-        if not markdown_report.strip():
-            raise ValueError("Markdown report cannot be empty.")
-
-        # Sanitize filename
-        filename = re.sub(r'[<>:"/\\|?*]', '_', filename.strip())
-        if not filename.endswith(".md"):
-            filename += ".md"
-
-        # Ensure base directory exists
-        base_dir = base_directory
-        base_dir.mkdir(parents=True, exist_ok=True)
-
-        # Construct filepath
-        filepath = base_dir / filename
-
-        # Write Markdown file
-        with open(filepath, "w", encoding="utf-8") as file:
-            file.write(markdown_report)
-
-        # Convert to DOCX
-        docx_path = filepath.with_suffix(".docx")
-        md_to_docx_with_pandoc(filepath, str(docx_path))
-
-        global report_filepath
-        report_filepath = str(docx_path)
-
-        return f"Markdown report saved to {filepath} and converted to .docx format."
-
+        docx_path = save_markdown_report(filename, markdown_report)
+        return f"Markdown report saved to {docx_path.with_suffix('.md')} and converted to .docx format."
     except ValueError as e:
         return f"Error saving report: {str(e)}"
     except OSError as e:
@@ -109,41 +172,39 @@ def write_file(filename: str, markdown_report: str) -> str:
     except RuntimeError as e:
         return f"Error saving report: {str(e)}"
     
-def get_file_path() -> str:
-    """
-    Returns the path of the last saved report file.
-
-    This function retrieves the global variable `report_filepath`, which is set during the file writing process.
-
-    Returns:
-        str: The path of the last saved report file, or an empty string if no file has been saved yet.
-    """
-    return report_filepath if report_filepath else "../reports/Indian_Batsmen_Batting_Statistics_and_T20_Recommendation.docx"
-
 # Enhanced Saving Agent
-saving_agent = Agent(
-    name="Cricket Report Archivist",
-    description=(
-        "A specialized agent designed to strictly preserve and save entire cricket reports in their original Markdown format, "
-        "ensuring no content is altered, omitted, or modified, and converting them to DOCX for publication."
-    ),
-    role=(
-        "As a Senior Sports Archivist, you are responsible for saving cricket reports in their exact, unmodified Markdown format "
-        "as .md files and ensuring their accurate conversion to DOCX, maintaining all original content, formatting, and structure."
-    ),
-    tools=[write_file],
-    show_tool_calls=True,
-    model=Gemini(id=os.getenv("GOOGLE_MODEL2"), api_key=google_api_key),
-    instructions=[
-        "Save the entire provided cricket report in its original Markdown format as a .md file in the base directory (`../reports/`).",
-        "Use the `write_file` tool to save the report exactly as received, without modifying, summarizing, or omitting any content, and convert it to DOCX.",
-        "Ensure the filename matches the report's identifier (e.g., player name, match ID, or title extracted from the first H1 or H2 heading). If no identifier is present, use 'cricket_report_{timestamp}' with the format 'YYYYMMDDHHMMSS'.",
-        "Prepend a header to the Markdown content with the report title (extracted from the first H1 or H2 heading, if present) and the current date/time in the format 'YYYY-MM-DD HH:MM:SS UTC' (e.g., '2025-06-24 19:13:00 UTC'), ensuring the original report content remains unchanged below the header.",
-        "Preserve all Markdown elements (headings, paragraphs, lists, tables, etc.) exactly as provided, ensuring identical rendering in both .md and .docx outputs.",
-        "Sanitize filenames to remove invalid characters and prevent path issues.",
-        "Avoid overwriting existing files unless explicitly instructed; append a timestamp (e.g., '_20250624191300') to the filename to resolve conflicts.",
-        "Handle errors gracefully, returning clear feedback via the `write_file` tool (e.g., 'Error saving report: Permission denied'). Expected errors include permission issues, invalid paths, or Pandoc conversion failures.",
-        "Ensure the output .docx file accurately reflects the original Markdown content, with all formatting preserved for publication.",
-        "Return only the success or error message from the `write_file` tool as the final output."
-    ]
-)
\ No newline at end of file
+@register("saving_agent")
+def build_saving_agent():
+    from agno.models.google import Gemini
+
+    google_api_key, = require_env("GOOGLE_API_KEY")
+
+    return Agent(
+        name="Cricket Report Archivist",
+        description=(
+            "A specialized agent designed to strictly preserve and save entire cricket reports in their original Markdown format, "
+            "ensuring no content is altered, omitted, or modified, and converting them to DOCX for publication."
+        ),
+        role=(
+            "As a Senior Sports Archivist, you are responsible for saving cricket reports in their exact, unmodified Markdown format "
+            "as .md files and ensuring their accurate conversion to DOCX, maintaining all original content, formatting, and structure."
+        ),
+        tools=[write_file],
+        show_tool_calls=True,
+        model=Gemini(id=os.getenv("GOOGLE_MODEL2"), api_key=google_api_key),
+        instructions=[
+            "Save the entire provided cricket report in its original Markdown format as a .md file in the base directory (`../reports/`).",
+            "Use the `write_file` tool to save the report exactly as received, without modifying, summarizing, or omitting any content, and convert it to DOCX.",
+            "Ensure the filename matches the report's identifier (e.g., player name, match ID, or title extracted from the first H1 or H2 heading). If no identifier is present, use 'cricket_report_{timestamp}' with the format 'YYYYMMDDHHMMSS'.",
+            "Prepend a header to the Markdown content with the report title (extracted from the first H1 or H2 heading, if present) and the current date/time in the format 'YYYY-MM-DD HH:MM:SS UTC' (e.g., '2025-06-24 19:13:00 UTC'), ensuring the original report content remains unchanged below the header.",
+            "Preserve all Markdown elements (headings, paragraphs, lists, tables, etc.) exactly as provided, ensuring identical rendering in both .md and .docx outputs.",
+            "Sanitize filenames to remove invalid characters and prevent path issues.",
+            "Avoid overwriting existing files unless explicitly instructed; append a timestamp (e.g., '_20250624191300') to the filename to resolve conflicts.",
+            "Handle errors gracefully, returning clear feedback via the `write_file` tool (e.g., 'Error saving report: Permission denied'). Expected errors include permission issues, invalid paths, or DOCX conversion failures.",
+            "Ensure the output .docx file accurately reflects the original Markdown content, with all formatting preserved for publication.",
+            "Return only the success or error message from the `write_file` tool as the final output."
+        ]
+    )
+
+
+__getattr__ = lazy_attributes(__name__, ["saving_agent"])
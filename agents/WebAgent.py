@@ -1,47 +1,44 @@
 from agno.agent import Agent
-from agno.models.google import Gemini
 from agno.tools.reasoning import ReasoningTools
-from agno.tools.tavily import TavilyTools
+from agent_registry import register, require_env, lazy_attributes
 import os
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv("../.env")
 
-google_api_key = os.getenv("GOOGLE_API_KEY")
-tavily_api_key = os.getenv("TAVILY_API_KEY")
+@register("Web_Search_Agent")
+def build_web_search_agent():
+    # Provider SDKs are imported here, so importing this module stays cheap until the agent is first used
+    from agno.models.google import Gemini
+    from agno.tools.tavily import TavilyTools
 
-# Validate environment variables
-if not google_api_key:
-    raise ValueError("GOOGLE_API_KEY not found in environment variables.")
-if not tavily_api_key:
-    raise ValueError("TAVILY_API_KEY not found in environment variables.")
+    google_api_key, tavily_api_key = require_env("GOOGLE_API_KEY", "TAVILY_API_KEY")
+    llm = Gemini(id=os.getenv("GOOGLE_MODEL1"), api_key=google_api_key)
 
-llm = Gemini(id=os.getenv("GOOGLE_MODEL1"), api_key=google_api_key)
+    # Enhanced Web Search Agent
+    return Agent(
+        name="Cricket Web Research Specialist",
+        description=(
+            "A specialized agent that retrieves accurate and relevant cricket-related information from the web, "
+            "delivering concise, publication-ready details in Markdown format for sports journalism."
+        ),
+        role=(
+            "As a Senior Sports Researcher, you are tasked with gathering precise cricket-related information from the web, "
+            "ensuring responses are accurate, relevant, and formatted for integration into professional sports reports."
+        ),
+        instructions=[
+            "Retrieve cricket-related information from the web using TavilyTools based on the user's query.",
+            "Provide concise, accurate, and relevant information strictly addressing the user's request, avoiding extraneous details unless explicitly asked.",
+            "Use ReasoningTools to evaluate and structure the retrieved data logically, ensuring clarity and coherence.",
+            "Format the output in Markdown, using headings, lists, or tables as appropriate to present the information in a human-readable, publication-ready manner.",
+            "Cite sources from TavilyTools results to ensure credibility, including a brief reference (e.g., website name or URL) in the Markdown output.",
+            "Avoid hallucination by relying solely on verified information from TavilyTools, cross-checking data where necessary.",
+            "Include a header with the query title (e.g., 'Cricket Information: [Query Summary]') and the current date and time ({datetime}) for timeliness.",
+            "Handle errors gracefully, returning a clear message (e.g., 'No relevant information found for [query]') if the search yields no results or encounters issues.",
+            "Ensure the output is suitable for integration into sports reports, maintaining a professional journalistic tone."
+        ],
+        tools=[ReasoningTools(), TavilyTools(api_key=tavily_api_key, format="json")],
+        model=llm,
+        show_tool_calls=True
+    )
 
-# Enhanced Web Search Agent
-Web_Search_Agent = Agent(
-    name="Cricket Web Research Specialist",
-    description=(
-        "A specialized agent that retrieves accurate and relevant cricket-related information from the web, "
-        "delivering concise, publication-ready details in Markdown format for sports journalism."
-    ),
-    role=(
-        "As a Senior Sports Researcher, you are tasked with gathering precise cricket-related information from the web, "
-        "ensuring responses are accurate, relevant, and formatted for integration into professional sports reports."
-    ),
-    instructions=[
-        "Retrieve cricket-related information from the web using TavilyTools based on the user's query.",
-        "Provide concise, accurate, and relevant information strictly addressing the user's request, avoiding extraneous details unless explicitly asked.",
-        "Use ReasoningTools to evaluate and structure the retrieved data logically, ensuring clarity and coherence.",
-        "Format the output in Markdown, using headings, lists, or tables as appropriate to present the information in a human-readable, publication-ready manner.",
-        "Cite sources from TavilyTools results to ensure credibility, including a brief reference (e.g., website name or URL) in the Markdown output.",
-        "Avoid hallucination by relying solely on verified information from TavilyTools, cross-checking data where necessary.",
-        "Include a header with the query title (e.g., 'Cricket Information: [Query Summary]') and the current date and time ({datetime}) for timeliness.",
-        "Handle errors gracefully, returning a clear message (e.g., 'No relevant information found for [query]') if the search yields no results or encounters issues.",
-        "Ensure the output is suitable for integration into sports reports, maintaining a professional journalistic tone."
-    ],
-    tools=[ReasoningTools(), TavilyTools(api_key=tavily_api_key, format="json")],
-    model=llm,
-    show_tool_calls=True
-)
\ No newline at end of file
+
+__getattr__ = lazy_attributes(__name__, ["Web_Search_Agent"])
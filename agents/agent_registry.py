@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+from dotenv import load_dotenv
+from tracing import trace_tool_call
+
+ENV_FILE = "../.env"
+
+# Build every registered agent in a background thread once the server has started ("0" builds them on first use)
+AGENT_WARMUP = os.getenv("AGENT_WARMUP", "1") != "0"
+
+_env_loaded = False
+_env_lock = threading.Lock()
+
+
+def load_env():
+    """Loads ../.env into the environment, once per process."""
+    global _env_loaded
+    if not _env_loaded:
+        with _env_lock:
+            if not _env_loaded:
+                load_dotenv(ENV_FILE)
+                _env_loaded = True
+
+
+def require_env(*names) -> tuple:
+    """
+    Returns the values of the given environment variables.
+
+    Raises:
+        ValueError: If any of them is not set.
+    """
+    load_env()
+    missing = [name for name in names if not os.getenv(name)]
+    if missing:
+        raise ValueError(f"{' or '.join(missing)} not found in environment variables.")
+    return tuple(os.getenv(name) for name in names)
+
+
+class AgentRegistry:
+    """
+    Builds agents and teams on first use instead of at import.
+
+    Agent modules register a factory per agent under the name it used to have as a module attribute; `get` builds
+    it once (thread-safe) and returns the same instance afterwards. `build` returns a new instance instead, for
+    callers that run a team concurrently. `warm_up` builds everything ahead of the first request, and `ready` tells
+    whether that has finished without errors.
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._instances = {}
+        self._errors = {}
+        self._build_seconds = {}
+        self._lock = threading.RLock()
+        self._warmup = None
+        self._warmup_seconds = None
+        # Instances of the `build` running on this thread, handed out by `get` instead of the shared ones
+        self._building = threading.local()
+
+    def register(self, name: str):
+        """Decorator registering `factory()` as the builder of the agent or team `name`."""
+        def decorator(factory):
+            with self._lock:
+                self._factories[name] = factory
+            return factory
+        return decorator
+
+    def names(self) -> list:
+        with self._lock:
+            return list(self._factories)
+
+    def get(self, name: str):
+        """
+        Returns the agent or team `name`, building it (and the members it uses) on first call.
+
+        Raises:
+            KeyError: If no factory is registered under `name`.
+            ValueError: If its configuration (e.g. an API key) is missing.
+        """
+        building = getattr(self._building, "instances", None)
+        if building is not None:
+            if name not in building:
+                building[name] = self._create(name)
+            return building[name]
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            if name not in self._instances:
+                if name not in self._factories:
+                    raise KeyError(f"No agent registered as {name}.")
+                started = time.perf_counter()
+                try:
+                    instance = self._create(name)
+                except Exception as e:
+                    self._errors[name] = f"{type(e).__name__}: {e}"
+                    raise
+                self._instances[name] = instance
+                self._errors.pop(name, None)
+                self._build_seconds[name] = round(time.perf_counter() - started, 3)
+            return self._instances[name]
+
+    def build(self, name: str):
+        """
+        Builds a new instance of the agent or team `name` that is not cached, together with new instances of the
+        members it gets through `get_agent`.
+
+        agno keeps the state of a run (run response, memory, team context) on the agent or team, so each thread
+        running a team concurrently needs its own.
+
+        Raises:
+            KeyError: If no factory is registered under `name`.
+            ValueError: If its configuration (e.g. an API key) is missing.
+        """
+        outer = getattr(self._building, "instances", None)
+        self._building.instances = {}
+        try:
+            return self.get(name)
+        finally:
+            self._building.instances = outer
+
+    def _create(self, name: str):
+        if name not in self._factories:
+            raise KeyError(f"No agent registered as {name}.")
+        load_env()
+        instance = self._factories[name]()
+        # Every agent and team reports its tool calls and member delegations as trace spans
+        if hasattr(instance, "tool_hooks"):
+            instance.tool_hooks = [*(instance.tool_hooks or []), trace_tool_call]
+        return instance
+
+    def warm_up(self, names=None) -> dict:
+        """Builds the given agents (all registered ones by default); returns the errors by name."""
+        started = time.perf_counter()
+        for name in names or self.names():
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"Agent warm-up: {name} could not be built: {e}")
+        self._warmup_seconds = round(time.perf_counter() - started, 3)
+        with self._lock:
+            return dict(self._errors)
+
+    def start_warm_up(self, names=None) -> threading.Thread:
+        """Runs `warm_up` in a daemon thread, so the server keeps answering while the agents are built."""
+        with self._lock:
+            if self._warmup is None:
+                self._warmup = threading.Thread(target=self.warm_up, args=(names,), name="agent-warmup", daemon=True)
+                self._warmup.start()
+            return self._warmup
+
+    def ready(self) -> bool:
+        """True when no warm-up is running and no agent failed to build."""
+        with self._lock:
+            warming = self._warmup is not None and self._warmup.is_alive()
+            return not warming and not self._errors
+
+    def stats(self) -> dict:
+        """Returns which agents are built, their build times and errors, and the warm-up state."""
+        with self._lock:
+            if self._warmup is None:
+                warmup = "not started"
+            else:
+                warmup = "running" if self._warmup.is_alive() else "done"
+            return {
+                "registered": len(self._factories),
+                "built": sorted(self._instances),
+                "build_seconds": dict(self._build_seconds),
+                "errors": dict(self._errors),
+                "warmup": warmup,
+                "warmup_seconds": self._warmup_seconds,
+            }
+
+
+registry = AgentRegistry()
+register = registry.register
+get_agent = registry.get
+build_agent = registry.build
+
+
+def lazy_attributes(module: str, names):
+    """
+    Returns a module-level `__getattr__` resolving the given names through the registry, so
+    `from WebAgent import Web_Search_Agent` keeps working and builds the agent only when it is imported.
+    """
+    names = set(names)
+
+    def __getattr__(name):
+        if name in names:
+            return get_agent(name)
+        raise AttributeError(f"module {module!r} has no attribute {name!r}")
+
+    return __getattr__
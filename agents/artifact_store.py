@@ -0,0 +1,150 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+ARTIFACT_INDEX_PATH = os.getenv("REPORT_ARTIFACT_INDEX_PATH", "../cache/artifacts.sqlite3")
+
+# Artifact kinds a report can have, with the media type each is served as
+MEDIA_TYPES = {
+    "md": "text/markdown; charset=utf-8",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "html": "text/html; charset=utf-8",
+    "audio": "audio/mpeg",
+}
+KINDS = tuple(MEDIA_TYPES)
+
+
+def file_digest(path) -> tuple:
+    """Returns (sha256 hex digest, size in bytes) of a file."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+            size += len(block)
+    return digest.hexdigest(), size
+
+
+class ArtifactStore:
+    """
+    Index of the files produced for each report (markdown, DOCX, HTML, narration audio), keyed by report ID.
+
+    The report ID is the ID of the job that generated the report, so concurrent runs never see each other's files.
+    Each entry records the file's path, content hash and size; an entry whose file has since been deleted (e.g. an
+    evicted narration) is treated as missing.
+
+    Args:
+        path (str | Path): Location of the SQLite index.
+    """
+
+    def __init__(self, path=ARTIFACT_INDEX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS artifacts (
+                report_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                path TEXT NOT NULL,
+                sha256 TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (report_id, kind)
+            )
+            """
+        )
+        self.counters = {"recorded": 0, "hits": 0, "misses": 0}
+
+    def record(self, report_id: str, kind: str, path, sha256: str = None, size: int = None) -> dict:
+        """
+        Records an existing file as the report's artifact of the given kind, replacing any earlier one.
+
+        Args:
+            report_id (str): ID of the report (its job ID).
+            kind (str): One of "md", "docx", "html" or "audio".
+            path (str | Path): The file.
+            sha256 (str, optional): Content hash, if already known; computed from the file otherwise.
+            size (int, optional): File size, if already known.
+
+        Returns:
+            dict: The artifact entry.
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown artifact kind: {kind}. Expected one of {', '.join(KINDS)}.")
+        path = Path(path).resolve()
+        if sha256 is None or size is None:
+            sha256, size = file_digest(path)
+        entry = {"kind": kind, "path": str(path), "sha256": sha256, "size": size, "created_at": time.time()}
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?)",
+                (report_id, kind, entry["path"], sha256, size, entry["created_at"]),
+            )
+            self.counters["recorded"] += 1
+        return entry
+
+    def write(self, report_id: str, kind: str, path, data: bytes) -> dict:
+        """Writes `data` to `path` (atomically, via a temporary file) and records it as the report's artifact."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
+        return self.record(report_id, kind, path, hashlib.sha256(data).hexdigest(), len(data))
+
+    def get(self, report_id: str, kind: str):
+        """Returns the report's artifact of the given kind, or None if there is none or its file is gone."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT kind, path, sha256, size, created_at FROM artifacts WHERE report_id = ? AND kind = ?",
+                (report_id, kind),
+            ).fetchone()
+        entry = self._entry(row)
+        with self._lock:
+            self.counters["hits" if entry else "misses"] += 1
+        return entry
+
+    def list(self, report_id: str) -> dict:
+        """Returns every artifact of a report whose file still exists, by kind."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, path, sha256, size, created_at FROM artifacts WHERE report_id = ?", (report_id,)
+            ).fetchall()
+        entries = [self._entry(row) for row in rows]
+        return {entry["kind"]: entry for entry in entries if entry}
+
+    @staticmethod
+    def _entry(row):
+        if row is None or not os.path.exists(row[1]):
+            return None
+        kind, path, sha256, size, created_at = row
+        return {"kind": kind, "path": path, "sha256": sha256, "size": size, "created_at": created_at}
+
+    def stats(self) -> dict:
+        """Returns counters plus the number of reports and artifacts indexed."""
+        with self._lock:
+            reports, artifacts = self._conn.execute(
+                "SELECT COUNT(DISTINCT report_id), COUNT(*) FROM artifacts"
+            ).fetchone()
+            return {**self.counters, "reports": reports, "artifacts": artifacts}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Returns the process-wide artifact store, opened on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ArtifactStore()
+    return _store
@@ -0,0 +1,538 @@
+"""
+Local stand-in for the Cricbuzz RapidAPI: serves fixtures for every endpoint of `cricbuzz_client.ENDPOINTS`, with
+a configurable response latency, and counts the requests it answers.
+
+Fixtures recorded from the live API (`record`) are served as they are; any other player or match ID gets a
+deterministic synthetic payload shaped like the real one (stats tables, scorecards, ball-by-ball commentary).
+
+Run from the agents directory:
+
+    python -m benchmarks.cricbuzz_stub serve [--port 8765] [--latency 0.05]
+    python -m benchmarks.cricbuzz_stub record --players 1413 9311 --matches 115056
+
+and point the server at it with CRICBUZZ_BASE_URL=http://127.0.0.1:8765. Recording calls the live API with the
+keys in ../.env and stores the responses under benchmarks/fixtures/<endpoint>/<id>.json.
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, namedtuple
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+Entity = namedtuple("Entity", "kind id name aliases")
+
+# Players and matches the benchmark scenarios ask about; the stand-in search tools find them by name or alias
+PLAYERS = [
+    Entity("player", 1413, "Virat Kohli", ("Kohli",)),
+    Entity("player", 576, "Rohit Sharma", ("Rohit",)),
+    Entity("player", 9311, "Jasprit Bumrah", ("Bumrah",)),
+    Entity("player", 11808, "Shubman Gill", ("Gill",)),
+    Entity("player", 8733, "KL Rahul", ()),
+    Entity("player", 8019, "Joe Root", ("Root",)),
+    Entity("player", 8095, "Pat Cummins", ("Cummins",)),
+    Entity("player", 8117, "Trent Boult", ("Boult",)),
+]
+MATCHES = [
+    Entity("match", 115056, "Royal Challengers Bengaluru vs Punjab Kings Indian Premier League 2025 Final", ("RCB vs PBKS",)),
+    Entity("match", 112455, "India vs Australia Border-Gavaskar Trophy 2024-25 5th Test", ("IND vs AUS",)),
+]
+BOWLERS = {9311, 8095, 8117}
+# International side of the non-Indian catalog players
+NATIONS = {8019: "England", 8095: "Australia", 8117: "New Zealand"}
+
+# Match ID -> (team 1, short name, team 2, short name, format, series, description, catalog players per team)
+MATCH_DETAILS = {
+    115056: ("Royal Challengers Bengaluru", "RCB", "Punjab Kings", "PBKS", "T20", "Indian Premier League 2025",
+             "Final", ([1413], [])),
+    112455: ("India", "IND", "Australia", "AUS", "TEST", "Border-Gavaskar Trophy 2024-25", "5th Test",
+             ([1413, 576, 9311, 11808, 8733], [8095])),
+}
+
+FORMATS = ["Test", "ODI", "T20", "IPL"]
+# Typical strike rates per format, for synthetic batting tables
+STRIKE_RATES = {"Test": (48, 65), "ODI": (80, 95), "T20": (120, 145), "IPL": (120, 150)}
+OVERS = {"TEST": 90, "ODI": 50, "T20": 20}
+
+
+def find_entities(text: str) -> list:
+    """Catalog players and matches named in `text` (full name or alias, case-insensitive), in catalog order."""
+    lowered = text.lower()
+    return [
+        entity for entity in PLAYERS + MATCHES
+        if any(re.search(r"\b" + re.escape(name.lower()) + r"\b", lowered) for name in (entity.name, *entity.aliases))
+    ]
+
+
+def _player(player_id: int) -> Entity:
+    return next((entity for entity in PLAYERS if entity.id == player_id), Entity("player", player_id, f"Player {player_id}", ()))
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def _app_index(title: str, path: str) -> dict:
+    return {"seoTitle": f"{title} | Cricbuzz.com", "webURL": f"https://www.cricbuzz.com/{path}"}
+
+
+def player_info(player_id: int) -> dict:
+    player = _player(player_id)
+    rng = random.Random(f"info:{player_id}")
+    nation = NATIONS.get(player_id, "India")
+    bowler = player_id in BOWLERS
+    sentences = [
+        f"{player.name} made his first-class debut at {rng.randint(17, 21)} and was fast-tracked into the national side.",
+        f"Known for {'relentless accuracy and a deceptive action' if bowler else 'his appetite for big runs and calm finishing'}, "
+        f"he has been a mainstay across formats for more than {rng.randint(5, 15)} seasons.",
+        f"He captained his state side at junior level and has led {'the attack' if bowler else 'the batting'} in several ICC events.",
+        "Injuries interrupted his career twice, but each comeback was followed by a run of match-winning performances.",
+    ]
+    return {
+        "id": str(player_id),
+        "bat": "Right Handed Bat",
+        "bowl": "Right-arm fast" if bowler else "Right-arm medium",
+        "name": player.name,
+        "nickName": player.aliases[0] if player.aliases else "",
+        "role": "Bowler" if bowler else "Batsman",
+        "birthPlace": rng.choice(["Delhi", "Mumbai", "Ahmedabad", "Sheffield", "Sydney", "Rotorua"]),
+        "intlTeam": nation,
+        "teams": f"{nation}, {nation} A, Royal Challengers Bengaluru",
+        "DoB": f"{rng.choice(['March', 'June', 'November'])} {rng.randint(1, 28)}, {rng.randint(1987, 1999)}",
+        "image": f"http://i.cricketcb.com/stats/img/faceImages/{player_id}.jpg",
+        "bio": " ".join(rng.choice(sentences) for _ in range(24)),
+        "rankings": {
+            "bat": {"testRank": str(rng.randint(1, 60)), "odiRank": str(rng.randint(1, 60)), "t20Rank": str(rng.randint(1, 60)),
+                    "testBestRank": str(rng.randint(1, 10)), "odiBestRank": str(rng.randint(1, 10))},
+            "bowl": {"testRank": str(rng.randint(1, 90)), "odiBestRank": str(rng.randint(1, 40))},
+            "all": {"testRank": str(rng.randint(10, 90))},
+        },
+        "appIndex": _app_index(f"{player.name} Profile", f"profiles/{player_id}/{_slug(player.name)}"),
+        "DoBFormat": "",
+        "faceImageId": str(170000 + player_id % 1000),
+    }
+
+
+def player_career(player_id: int) -> dict:
+    rng = random.Random(f"career:{player_id}")
+    values = []
+    for format_name in ("test", "odi", "t20", "ipl"):
+        year = rng.randint(2008, 2016)
+        values.append({
+            "name": format_name,
+            "debut": f"vs {rng.choice(['Sri Lanka', 'West Indies', 'England'])}, {year}",
+            "lastPlayed": f"vs {rng.choice(['Australia', 'South Africa', 'Pakistan'])}, {rng.randint(year + 2, 2025)}",
+        })
+    return {"values": values, "appIndex": _app_index("Career", f"profiles/{player_id}")}
+
+
+def _series_spinner(rng) -> list:
+    return [{"seriesId": rng.randint(3000, 9000), "seriesName": f"Series {n}"} for n in range(12)]
+
+
+def player_batting(player_id: int) -> dict:
+    rng = random.Random(f"batting:{player_id}")
+    bowler = player_id in BOWLERS
+    columns = []
+    for format_name in FORMATS:
+        matches = rng.randint(40, 260)
+        innings = int(matches * (1.7 if format_name == "Test" else 0.95))
+        not_outs = rng.randint(2, max(3, innings // 7))
+        average = rng.uniform(8, 18) if bowler else rng.uniform(28, 56)
+        runs = int((innings - not_outs) * average)
+        strike_rate = rng.uniform(*STRIKE_RATES[format_name]) * (0.8 if bowler else 1)
+        balls = int(runs * 100 / strike_rate)
+        hundreds = 0 if bowler else runs // rng.randint(700, 1400)
+        columns.append({
+            "Matches": matches, "Innings": innings, "Runs": runs, "Balls": balls,
+            "Highest": rng.randint(30, 70) if bowler else rng.randint(110, 254),
+            "Average": f"{runs / max(1, innings - not_outs):.2f}", "SR": f"{runs * 100 / max(1, balls):.2f}",
+            "Not Out": not_outs, "Fours": int(runs * 0.45 / 4), "Sixes": int(runs * (0.06 if format_name == "Test" else 0.14) / 6),
+            "Ducks": rng.randint(0, 12), "50s": 0 if bowler else runs // rng.randint(300, 500), "100s": hundreds,
+            "200s": hundreds // 4 if format_name == "Test" else 0, "300s": 0, "400s": 0,
+        })
+    rows = [{"values": [header] + [str(column[header]) for column in columns]} for header in columns[0]]
+    return {"headers": ["ROWHEADER"] + FORMATS, "values": rows, "appIndex": _app_index("Batting", f"profiles/{player_id}"),
+            "seriesSpinner": _series_spinner(rng)}
+
+
+def player_bowling(player_id: int) -> dict:
+    rng = random.Random(f"bowling:{player_id}")
+    bowler = player_id in BOWLERS
+    columns = []
+    for format_name in FORMATS:
+        matches = rng.randint(40, 200)
+        innings = int(matches * (1.8 if format_name == "Test" else 0.95)) if bowler else rng.randint(0, 20)
+        balls = innings * rng.randint(24, 36 if format_name != "Test" else 100)
+        economy = rng.uniform(*(((2.6, 3.4) if format_name == "Test" else (4.6, 8.2)) if bowler else (5.5, 9.0)))
+        runs = int(balls * economy / 6)
+        wickets = int(balls / rng.uniform(20, 55)) if bowler else rng.randint(0, 8)
+        columns.append({
+            "Matches": matches, "Innings": innings, "Balls": balls, "Runs": runs,
+            "Maidens": int(balls / 6 * (0.2 if format_name == "Test" else 0.04)), "Wickets": wickets,
+            "Avg": f"{runs / wickets:.2f}" if wickets else "-", "Eco": f"{runs * 6 / max(1, balls):.2f}",
+            "SR": f"{balls / wickets:.2f}" if wickets else "-",
+            "BBI": f"{rng.randint(1, 7)}/{rng.randint(5, 60)}" if wickets else "-", "BBM": "-",
+            "4w": wickets // 25, "5w": wickets // 40, "10w": wickets // 200,
+        })
+    rows = [{"values": [header] + [str(column[header]) for column in columns]} for header in columns[0]]
+    return {"headers": ["ROWHEADER"] + FORMATS, "values": rows, "appIndex": _app_index("Bowling", f"profiles/{player_id}"),
+            "seriesSpinner": _series_spinner(rng)}
+
+
+def player_search(name: str) -> dict:
+    players = [
+        {"id": str(entity.id), "name": entity.name, "teamName": "India", "faceImageId": str(170000 + entity.id % 1000),
+         "dob": "1988-11-05"}
+        for entity in find_entities(name) if entity.kind == "player"
+    ]
+    return {"player": players, "category": "player"}
+
+
+def _details(match_id: int) -> tuple:
+    if match_id in MATCH_DETAILS:
+        return MATCH_DETAILS[match_id]
+    return ("Team A", "TMA", "Team B", "TMB", "ODI", "Benchmark Series", f"Match {match_id}", ([], []))
+
+
+def _squad(match_id: int, team: int) -> list:
+    details = _details(match_id)
+    short = details[1 + 2 * team]
+    known = [_player(player_id).name for player_id in details[7][team]]
+    return known + [f"{short} Player {n}" for n in range(len(known) + 1, 12)]
+
+
+def _team(match_id: int, team: int, team_id: int) -> dict:
+    details = _details(match_id)
+    return {
+        "id": team_id,
+        "name": details[2 * team],
+        "shortName": details[1 + 2 * team],
+        "playerDetails": [
+            {"id": team_id * 100 + n, "name": name, "fullName": name, "captain": n == 0, "keeper": n == 4,
+             "substitute": False, "teamId": team_id, "battingStyle": "RHB", "bowlingStyle": "Right-arm medium",
+             "teamName": details[2 * team], "faceImageId": 591000 + n}
+            for n, name in enumerate(_squad(match_id, team))
+        ],
+        "imageId": 860038 + team,
+    }
+
+
+def _match_header(match_id: int) -> dict:
+    details = _details(match_id)
+    return {
+        "matchId": match_id, "matchDescription": details[6], "matchFormat": details[4], "matchType": "League",
+        "complete": True, "state": "Complete", "status": f"{details[0]} won by 6 runs",
+        "team1": {"id": 59, "name": details[0], "shortName": details[1]},
+        "team2": {"id": 65, "name": details[2], "shortName": details[3]},
+        "seriesName": details[5],
+    }
+
+
+def match_info(match_id: int) -> dict:
+    details = _details(match_id)
+    start = 1748872800000 + match_id % 1000 * 86400000
+    return {
+        "matchInfo": {
+            "matchId": match_id, "matchDescription": details[6], "matchFormat": details[4], "matchType": "League",
+            "complete": True, "domestic": details[4] == "T20", "matchStartTimestamp": start,
+            "matchCompleteTimestamp": start + 4 * 3600 * 1000, "dayNight": True, "year": 2025, "state": "Complete",
+            "team1": _team(match_id, 0, 59), "team2": _team(match_id, 1, 65),
+            "series": {"id": 9237, "name": details[5], "seriesType": "LEAGUE", "startDate": start - 60 * 86400000,
+                       "endDate": start, "tournament": True},
+            "umpire1": {"id": 1, "name": "Umpire One", "country": "IND"},
+            "umpire2": {"id": 2, "name": "Umpire Two", "country": "ENG"},
+            "referee": {"id": 3, "name": "Match Referee", "country": "AUS"},
+            "tossResults": {"tossWinnerId": 65, "tossWinnerName": details[2], "decision": "Bowling"},
+            "result": {"resultType": "win", "winningTeam": details[0], "winningteamId": 59, "winningMargin": 6,
+                       "winByRuns": True, "winByInnings": False},
+            "venue": {"id": 31, "name": "Narendra Modi Stadium", "city": "Ahmedabad", "country": "India",
+                      "timezone": "+05:30", "latitude": "23.091", "longitude": "72.597"},
+            "status": f"{details[0]} won by 6 runs",
+            "playersOfTheMatch": [{"id": 5901, "name": _squad(match_id, 0)[0], "teamName": details[1]}],
+            "shortStatus": f"{details[1]} won",
+            "matchImageId": 0,
+        },
+        "venueInfo": {
+            "established": 1982, "capacity": "132,000", "knownAs": "Motera", "ends": "Adani Pavilion End, GMDC End",
+            "city": "Ahmedabad", "country": "India", "timezone": "+05:30", "homeTeam": "Gujarat", "floodlights": True,
+            "imageUrl": "http://i.cricketcb.com/stats/img/venues/31.jpg",
+        },
+        "appIndex": _app_index("Match info", f"live-cricket-scores/{match_id}"),
+    }
+
+
+def _innings(match_id: int, innings_id: int, rng) -> dict:
+    details = _details(match_id)
+    batting = innings_id % 2 == 1
+    bat_team, bowl_team = (0, 1) if batting else (1, 0)
+    batters = {}
+    for n, name in enumerate(_squad(match_id, bat_team)):
+        runs = rng.randint(0, 90) if n < 7 else rng.randint(0, 20)
+        balls = max(1, int(runs / rng.uniform(0.9, 1.7)))
+        batters[f"bat_{n + 1}"] = {
+            "batId": (59 if batting else 65) * 100 + n, "batName": name, "batShortName": name.split()[-1],
+            "isCaptain": n == 0, "isKeeper": n == 4, "runs": runs, "balls": balls, "dots": balls // 3,
+            "fours": runs // 12, "sixes": runs // 25, "mins": balls * 2, "strikeRate": round(runs * 100 / balls, 2),
+            "outDesc": rng.choice(["c Keeper b Bowler", "b Bowler", "lbw b Bowler", "run out (Fielder)", "not out"]),
+            "bowlerId": 0, "fielderId1": 0, "fielderId2": 0, "fielderId3": 0, "ones": runs // 4, "twos": runs // 10,
+            "threes": 0, "fives": 0, "boundaries": runs // 12, "sixers": runs // 25, "wicketCode": "CAUGHT",
+            "isOverseas": False, "inMatchChange": "", "playingXIChange": "",
+        }
+    bowlers = {}
+    for n, name in enumerate(_squad(match_id, bowl_team)[5:11]):
+        overs = rng.randint(2, 4)
+        runs = overs * rng.randint(5, 12)
+        bowlers[f"bowl_{n + 1}"] = {
+            "bowlerId": (65 if batting else 59) * 100 + 5 + n, "bowlName": name, "bowlShortName": name.split()[-1],
+            "isCaptain": False, "isKeeper": False, "overs": overs, "maidens": 0, "runs": runs,
+            "wickets": rng.randint(0, 3), "economy": round(runs / overs, 2), "no_balls": rng.randint(0, 1),
+            "wides": rng.randint(0, 3), "dots": overs * 2, "balls": overs * 6, "runsPerBall": round(runs / overs / 6, 2),
+            "isOverseas": False, "inMatchChange": "", "playingXIChange": "",
+        }
+    total = sum(batter["runs"] for batter in batters.values())
+    return {
+        "matchId": match_id, "inningsId": innings_id, "timeScore": 1748882800000,
+        "batTeamDetails": {"batTeamId": 59 if batting else 65, "batTeamName": details[2 * bat_team],
+                           "batTeamShortName": details[1 + 2 * bat_team], "batsmenData": batters},
+        "bowlTeamDetails": {"bowlTeamId": 65 if batting else 59, "bowlTeamName": details[2 * bowl_team],
+                            "bowlTeamShortName": details[1 + 2 * bowl_team], "bowlersData": bowlers},
+        "scoreDetails": {"ballNbr": 0, "isDeclared": False, "isFollowOn": False, "overs": 20.0, "revisedOvers": 0,
+                         "runRate": round(total / 20, 2), "runs": total, "wickets": 7, "runsPerBall": round(total / 120, 2)},
+        "extrasData": {"noBalls": 2, "total": 11, "byes": 1, "penalty": 0, "wides": 6, "legByes": 2},
+        "ppData": {"pp_1": {"ppId": 1, "ppOversFrom": 0.1, "ppOversTo": 6.0, "ppType": "mandatory", "runsScored": total // 3}},
+        "wicketsData": {
+            f"wkt_{n}": {"batId": n, "batName": batter["batName"], "wktNbr": n, "wktOver": round(n * 2.7, 1),
+                         "wktRuns": n * 21, "ballNbr": n * 16}
+            for n, batter in enumerate(list(batters.values())[:7], start=1)
+        },
+    }
+
+
+def match_scorecard(match_id: int) -> dict:
+    rng = random.Random(f"scorecard:{match_id}")
+    innings = 4 if _details(match_id)[4] == "TEST" else 2
+    return {
+        "scoreCard": [_innings(match_id, innings_id, rng) for innings_id in range(1, innings + 1)],
+        "matchHeader": _match_header(match_id),
+        "isMatchComplete": True,
+        "status": _match_header(match_id)["status"],
+        "responseLastUpdated": 1748900000,
+    }
+
+
+def match_commentary(match_id: int) -> dict:
+    rng = random.Random(f"commentary:{match_id}")
+    details = _details(match_id)
+    overs = min(OVERS.get(details[4], 50), 50)
+    entries = []
+    for innings_id in (2, 1):
+        batters, bowlers = _squad(match_id, innings_id - 1), _squad(match_id, 2 - innings_id)[5:]
+        for over in range(overs - 1, -1, -1):
+            for ball in range(6, 0, -1):
+                event = rng.choices(["NONE", "FOUR", "SIX", "WICKET"], weights=[80, 10, 5, 5])[0]
+                bowler, batter = bowlers[over % len(bowlers)], batters[(over * 6 + ball) % 7]
+                text = {
+                    "NONE": f"{bowler} to {batter}, no run, good length outside off, defended back to the bowler",
+                    "FOUR": f"{bowler} to {batter}, FOUR, driven handsomely through extra cover, races away",
+                    "SIX": f"{bowler} to {batter}, SIX, picked up the length early and launched over long-on",
+                    "WICKET": f"{bowler} to {batter}, out, edged and taken at slip, a big breakthrough",
+                }[event]
+                entries.append({
+                    "commText": text, "timestamp": 1748882800000 + over * 240000 + ball * 40000,
+                    "ballNbr": over * 6 + ball, "overNumber": float(f"{over}.{ball}"), "inningsId": innings_id,
+                    "event": event, "batTeamName": details[2 * (innings_id - 1)], "commentaryFormats": {},
+                })
+    return {
+        "commentaryList": entries,
+        "matchHeader": _match_header(match_id),
+        "miniscore": {"inningsId": 2, "batsmanStriker": {"batName": _squad(match_id, 1)[0]}, "target": 191,
+                      "status": _match_header(match_id)["status"]},
+        "page": "commentary",
+        "enableNoContent": False,
+        "responseLastUpdated": 1748900000,
+    }
+
+
+GENERATORS = {
+    "match_scorecard": match_scorecard,
+    "match_commentary": match_commentary,
+    "match_info": match_info,
+    "player_batting": player_batting,
+    "player_bowling": player_bowling,
+    "player_info": player_info,
+    "player_career": player_career,
+    "player_search": player_search,
+}
+
+
+def _fixture_path(endpoint: str, resource_id) -> Path:
+    return FIXTURES_DIR / endpoint / f"{_slug(str(resource_id))}.json"
+
+
+def load_fixture(endpoint: str, resource_id) -> dict:
+    """The recorded response for an endpoint and ID if there is one, otherwise a synthetic payload."""
+    path = _fixture_path(endpoint, resource_id)
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    if endpoint == "player_search":
+        return player_search(str(resource_id))
+    return GENERATORS[endpoint](int(resource_id))
+
+
+@lru_cache(maxsize=None)
+def _routes() -> list:
+    # (endpoint, path regex, query parameter holding the ID) built from the client's own URL templates; imported
+    # on first request, so the client module reads CRICBUZZ_BASE_URL only after the stub is listening
+    import cricbuzz_client
+
+    routes = []
+    for endpoint, (template, _) in cricbuzz_client.ENDPOINTS.items():
+        path, _, query = template.partition("?")
+        parameter = query.split("=")[0] if query else None
+        pattern = re.escape(path).replace(re.escape("{id}"), "([^/]+)")
+        routes.append((endpoint, re.compile(pattern + "$"), parameter))
+    # Fixed paths such as /player/search must win over /player/{id}
+    return sorted(routes, key=lambda route: route[2] is None)
+
+
+class StubCricbuzzServer:
+    """
+    Threaded HTTP server answering Cricbuzz API paths with fixtures after `latency` seconds.
+
+    Example:
+        stub = StubCricbuzzServer(latency=0.05).start()
+        os.environ["CRICBUZZ_BASE_URL"] = stub.url  # before cricbuzz_client is imported
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0):
+        self.latency = latency
+        self.counts = Counter()
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._payloads = {}
+        self._thread = None
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the API the pooled clients normally talk to
+
+            def do_GET(self):
+                status, body, endpoint = stub.respond(self.path)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with stub._lock:
+                    stub.counts[endpoint] += 1
+                    stub.bytes_sent += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def respond(self, raw_path: str) -> tuple:
+        """Returns (status, JSON body, endpoint name) for a request path."""
+        url = urlsplit(raw_path)
+        for endpoint, pattern, parameter in _routes():
+            match = pattern.match(url.path)
+            if not match:
+                continue
+            if parameter:
+                resource_id = (parse_qs(url.query).get(parameter) or [""])[0]
+            else:
+                resource_id = unquote(match.group(1))
+                if not resource_id.isdigit():
+                    continue
+            key = (endpoint, resource_id)
+            # Payloads are built once per ID and kept, like the bytes of a recording
+            body = self._payloads.get(key)
+            if body is None:
+                body = self._payloads[key] = json.dumps(load_fixture(endpoint, resource_id)).encode("utf-8")
+            return 200, body, endpoint
+        return 404, json.dumps({"message": "Not found"}).encode("utf-8"), "unknown"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="cricbuzz-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def reset_counts(self) -> dict:
+        """Returns the requests answered per endpoint since the last reset, and starts counting again."""
+        with self._lock:
+            counts, self.counts = dict(self.counts), Counter()
+        return counts
+
+
+def record(player_ids: list, match_ids: list) -> list:
+    """Fetches every endpoint for the given players and matches from the live API and stores the responses."""
+    import cricbuzz_client
+
+    calls = [(endpoint, player_id) for player_id in player_ids for endpoint in cricbuzz_client.PLAYER_SECTIONS.values()]
+    calls += [(endpoint, match_id) for match_id in match_ids for endpoint in cricbuzz_client.MATCH_SECTIONS.values()]
+    written = []
+    for (endpoint, resource_id), payload in zip(calls, cricbuzz_client.fetch_many(calls)):
+        if "error" in payload:
+            print(f"{endpoint} {resource_id}: {payload['error']}")
+            continue
+        path = _fixture_path(endpoint, resource_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(payload, indent=1, ensure_ascii=False), encoding="utf-8")
+        written.append(path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="Serve the fixtures over HTTP.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency", type=float, default=0.05, help="Seconds before every response.")
+    recorder = commands.add_parser("record", help="Record live API responses as fixtures.")
+    recorder.add_argument("--players", type=int, nargs="*", default=[])
+    recorder.add_argument("--matches", type=int, nargs="*", default=[])
+    args = parser.parse_args()
+
+    if args.command == "record":
+        written = record(args.players, args.matches)
+        print(f"{len(written)} fixtures written to {FIXTURES_DIR}")
+        return 0 if written else 1
+
+    stub = StubCricbuzzServer(args.host, args.port, args.latency).start()
+    print(f"Serving Cricbuzz fixtures on {stub.url}; start the server with CRICBUZZ_BASE_URL={stub.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stub.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Compares markdown-to-DOCX conversion with the in-process renderer (`docx_writer`) against a pandoc subprocess:
+latency per report and peak memory.
+
+Run from the agents directory:
+
+    python -m benchmarks.docx_conversion [--reports 50] [--rows 20] [markdown files ...]
+
+Without markdown files, synthetic reports shaped like ours (headings, scorecard tables, lists, emphasis) are used.
+The pandoc side is skipped when pandoc is not installed.
+"""
+import argparse
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import docx_writer
+
+
+def synthetic_report(number: int, rows: int) -> str:
+    batting = "\n".join(
+        f"| Batter {i} | {10 + i * 3} | {8 + i * 2} | {i % 5} | {i % 3} | {120 + i * 1.7:.2f} |" for i in range(rows)
+    )
+    bowling = "\n".join(f"| Bowler {i} | 4 | 0 | {24 + i} | {i % 4} | {6 + i / 4:.2f} |" for i in range(rows // 2))
+    return f"""# Match Report {number}: RCB vs PBKS
+
+## Match Overview
+
+The final witnessed a **thrilling** encounter, decided in the *last over* by a `6-run` margin.
+Royal Challengers Bengaluru posted 190/9 and ~~almost~~ defended it.
+
+## Scorecard
+
+| Batter | Runs | Balls | 4s | 6s | SR |
+|:--|--:|--:|--:|--:|--:|
+{batting}
+
+| Bowler | O | M | R | W | Econ |
+|:--|--:|--:|--:|--:|--:|
+{bowling}
+
+## Key Moments
+
+1. **Powerplay:** a rapid start with 55 runs.
+   - Salt's cameo of 16 off 9.
+   - Kohli anchored the innings.
+2. **Death overs:** Krunal Pandya's 2/17 turned the game.
+
+> "The best final I have seen," said the captain.
+
+---
+
+## Conclusion
+
+A fitting end to the season.
+"""
+
+
+def convert_native(path, output_path):
+    with open(path, encoding="utf-8") as f:
+        docx_writer.markdown_to_docx(f.read(), output_path)
+
+
+def measure_native(paths, output_dir):
+    output_path = os.path.join(output_dir, "native.docx")
+    timings = []
+    for path in paths:
+        started = time.perf_counter()
+        convert_native(path, output_path)
+        timings.append(time.perf_counter() - started)
+    # Memory is traced in a separate pass, since tracing slows the conversion down several times
+    tracemalloc.start()
+    for path in paths:
+        convert_native(path, output_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return timings, peak
+
+
+def measure_pandoc(paths, output_dir):
+    timings = []
+    for path in paths:
+        started = time.perf_counter()
+        docx_writer.pandoc_to_docx(path, os.path.join(output_dir, "pandoc.docx"))
+        timings.append(time.perf_counter() - started)
+    # Peak resident memory of the largest pandoc child process (kilobytes on Linux)
+    return timings, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+
+
+def summarize(name, timings, peak_bytes, peak_kind):
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"{name:<8} total {sum(timings):7.2f}s  mean {statistics.mean(timings) * 1000:7.1f} ms  "
+        f"p50 {statistics.median(timings) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  "
+        f"peak {peak_kind} {peak_bytes / 1024 / 1024:6.1f} MB"
+    )
+    return statistics.mean(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Markdown reports to convert instead of synthetic ones.")
+    parser.add_argument("--reports", type=int, default=50, help="Number of synthetic reports.")
+    parser.add_argument("--rows", type=int, default=20, help="Batting rows per synthetic scorecard.")
+    parser.add_argument("--output-dir", help="Where converted files are written (default: a temporary directory).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="docx_bench_") as workdir:
+        paths = args.files
+        if not paths:
+            paths = []
+            for number in range(args.reports):
+                path = os.path.join(workdir, f"report_{number}.md")
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(synthetic_report(number, args.rows))
+                paths.append(path)
+
+        print(f"reports: {len(paths)}")
+        output_dir = args.output_dir or workdir
+        native_mean = summarize("native", *measure_native(paths, output_dir), "python heap")
+        try:
+            pandoc_mean = summarize("pandoc", *measure_pandoc(paths, output_dir), "child RSS")
+        except (OSError, RuntimeError) as e:
+            print(f"pandoc   skipped: {e}")
+            return 0
+        print(f"speedup: {pandoc_mean / native_mean:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
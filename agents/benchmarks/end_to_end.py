@@ -0,0 +1,223 @@
+"""
+Runs player, match, Top-N and narration requests against the API offline and reports latency percentiles,
+throughput under concurrent clients, calls per pipeline stage and peak memory.
+
+Run from the agents directory:
+
+    python -m benchmarks.end_to_end [--requests 8] [--clients 4] [--scenario player] [--llm-latency 0.2] [--json]
+
+Cricbuzz is replaced by a local stub server (`benchmarks.cricbuzz_stub`, serving recorded fixtures where they exist
+and synthetic ones otherwise), Tavily, Gemini and Groq by the stand-ins in `benchmarks.standins`, and edge-tts by a
+fake backend, each answering after the given latency. The real server, agents, teams, tools and caches run
+unchanged, in-process, on a temporary working directory, so nothing touches the network or the repository.
+
+Calls per stage are the trace spans (tracing.py) recorded during each scenario, divided by its requests; "stub
+requests" are the Cricbuzz requests that reached the stub, i.e. were not answered from the API cache.
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from concurrent.futures import wait
+
+AGENTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = ("player", "match", "top_n", "narration")
+
+PLAYER_QUERIES = ["Virat Kohli career report", "Jasprit Bumrah bowling report", "Joe Root batting report",
+                  "Pat Cummins career report"]
+MATCH_QUERIES = ["RCB vs PBKS IPL 2025 Final match report", "IND vs AUS Border-Gavaskar Trophy 5th Test match report"]
+TOP_N_QUERIES = ["Top 3 batters by runs", "Top 2 bowlers by wickets"]
+
+
+def offline_environment(args, workdir: str) -> dict:
+    """Environment the server modules read at import: stub endpoints, dummy keys, and caches in `workdir`."""
+    environment = {
+        "X-RAPID-API-KEY": "offline",
+        "X-RAPID-API-HOST": "offline",
+        "GOOGLE_API_KEY": "offline",
+        "GOOGLE_MODEL1": "scripted",
+        "GOOGLE_MODEL2": "scripted",
+        "TAVILY_API_KEY": "offline",
+        "GROQ_API_KEY": "offline",
+        "AGENT_WARMUP": "0",
+        "TRACE_LOG_PATH": os.path.join(workdir, "logs", "trace.jsonl"),
+        "CRICBUZZ_CACHE": "0" if args.no_api_cache else "1",
+    }
+    if args.workers:
+        environment["REPORT_WORKERS"] = str(args.workers)
+    return environment
+
+
+def request_for(scenario: str, number: int) -> tuple:
+    """Path and JSON body of the `number`th request of a scenario; every one asks for a new report."""
+    if scenario == "narration":
+        content = f"# Narration {number}\n\nBumrah took {number % 6} wickets as RCB defended 190 in the final over."
+        return "/generate-narration-audio", {"content": content}
+    queries = {"player": PLAYER_QUERIES, "match": MATCH_QUERIES, "top_n": TOP_N_QUERIES}[scenario]
+    # The run number keeps identical queries from being coalesced into one report job
+    query = f"{queries[number % len(queries)]} (run {number})"
+    return "/get_report", {"input": query, "bypass_cache": True}
+
+
+async def run_scenario(client, scenario: str, requests: int, clients: int) -> dict:
+    pending = asyncio.Queue()
+    for number in range(requests):
+        pending.put_nowait(number)
+    latencies, failures = [], []
+
+    async def worker():
+        while not pending.empty():
+            path, body = request_for(scenario, pending.get_nowait())
+            started = time.perf_counter()
+            response = await client.post(path, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                failures.append(f"{response.status_code} {response.text[:200]}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    ordered = sorted(latencies)
+    return {
+        "requests": requests,
+        "clients": clients,
+        "errors": len(failures),
+        "first_error": failures[0] if failures else None,
+        "p50_seconds": round(statistics.median(ordered), 4),
+        "p95_seconds": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        "throughput_per_second": round(requests / elapsed, 3),
+        "elapsed_seconds": round(elapsed, 3),
+    }
+
+
+def stage_calls(before: dict, after: dict, requests: int) -> dict:
+    """Spans recorded between two metric snapshots, per request, as {"kind name": calls}."""
+    calls = Counter()
+    for (name, labels), value in after.items():
+        if name.endswith("spans_total"):
+            span = dict(labels)
+            calls[f"{span['kind']} {span['name']}"] += value - before.get((name, labels), 0)
+    return {stage: round(count / requests, 2) for stage, count in sorted(calls.items()) if count}
+
+
+def tokens(before: dict, after: dict, requests: int) -> dict:
+    used = Counter()
+    for (name, labels), value in after.items():
+        if name.endswith("llm_tokens_total"):
+            used[dict(labels)["type"]] += value - before.get((name, labels), 0)
+    return {kind: round(count / requests) for kind, count in used.items()}
+
+
+async def benchmark(args, server, stub) -> list:
+    import httpx
+    from tracing import metrics
+
+    # The ASGI transport does not run startup events, so the warm-up is done here, before anything is timed
+    started = time.perf_counter()
+    wait(server.report_jobs.warm_up(server.get_worker_team))
+    errors = server.report_jobs.warmup_stats()["errors"]
+    if errors:
+        raise RuntimeError(f"Building the journalist teams failed: {errors}")
+    print(f"agents built in {time.perf_counter() - started:.2f}s")
+
+    results = []
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        for scenario in args.scenario or SCENARIOS:
+            stub.reset_counts()
+            before = metrics.snapshot()
+            if args.tracemalloc:
+                tracemalloc.start()
+            result = {"scenario": scenario, **await run_scenario(client, scenario, args.requests, args.clients)}
+            if args.tracemalloc:
+                result["python_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+                tracemalloc.stop()
+            after = metrics.snapshot()
+            result["calls_per_request"] = stage_calls(before, after, args.requests)
+            result["tokens_per_request"] = tokens(before, after, args.requests)
+            result["stub_requests"] = dict(stub.counts)
+            # ru_maxrss is in kilobytes on Linux, and only grows: this is the peak of the process so far
+            result["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+            results.append(result)
+    return results
+
+
+def print_result(result: dict):
+    print(f"\n{result['scenario']}: {result['requests']} requests, {result['clients']} clients, "
+          f"{result['errors']} errors")
+    if result["first_error"]:
+        print(f"  first error: {result['first_error']}")
+    print(f"  latency     p50 {result['p50_seconds'] * 1000:8.1f} ms  p95 {result['p95_seconds'] * 1000:8.1f} ms")
+    print(f"  throughput  {result['throughput_per_second']:.2f} requests/s ({result['elapsed_seconds']:.2f}s)")
+    memory = f"  peak RSS    {result['peak_rss_mb']:.1f} MB"
+    if "python_peak_mb" in result:
+        memory += f" (Python allocations {result['python_peak_mb']:.1f} MB)"
+    print(memory)
+    if result["tokens_per_request"]:
+        print("  tokens      " + "  ".join(f"{kind} {count}" for kind, count in result["tokens_per_request"].items()))
+    print("  calls per request:")
+    for stage, calls in result["calls_per_request"].items():
+        print(f"    {stage:<55} {calls:6.2f}")
+    if result["stub_requests"]:
+        print("  stub requests: " + ", ".join(f"{name} {count}" for name, count in sorted(result["stub_requests"].items())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=8, help="Requests per scenario.")
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent clients.")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Scenario to run (repeatable; all by default).")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per model call.")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="Seconds per Cricbuzz request.")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="Seconds per Tavily search.")
+    parser.add_argument("--tts-latency", type=float, default=0.2, help="Seconds per TTS chunk.")
+    parser.add_argument("--workers", type=int, help="Report worker threads (REPORT_WORKERS; the server default otherwise).")
+    parser.add_argument("--no-api-cache", action="store_true", help="Disable the Cricbuzz response cache.")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also measure peak Python allocations (slower).")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+    args = parser.parse_args()
+
+    # The server resolves ../cache, ../reports, ../logs and audio/ against the working directory
+    workdir = tempfile.mkdtemp(prefix="e2e_bench_")
+    os.makedirs(os.path.join(workdir, "agents"))
+    sys.path.insert(0, AGENTS_DIR)
+    os.chdir(os.path.join(workdir, "agents"))
+
+    from benchmarks.cricbuzz_stub import StubCricbuzzServer
+    from benchmarks import standins
+
+    stub = StubCricbuzzServer(latency=args.api_latency).start()
+    os.environ.update(offline_environment(args, workdir))
+    os.environ["CRICBUZZ_BASE_URL"] = stub.url
+    standins.install(model_latency=args.llm_latency, search_latency=args.search_latency)
+
+    import server  # noqa: E402  (the environment and stand-ins above must be in place before import)
+    import report_narration
+    report_narration.groq_client = standins.fake_groq_client(args.llm_latency)
+    report_narration.tts_backend = standins.fake_tts_backend(args.tts_latency)
+
+    try:
+        results = asyncio.run(benchmark(args, server, stub))
+    finally:
+        server.report_jobs.shutdown()
+        stub.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print_result(result)
+        print(f"\nreports, caches and traces in {workdir}")
+    sys.exit(1 if any(result["errors"] for result in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
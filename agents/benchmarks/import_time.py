@@ -0,0 +1,101 @@
+"""
+Measures how long a fresh interpreter takes to import the server (the cold-start cost before uvicorn can listen),
+which modules dominate it, and checks that no agent or team is built at import.
+
+Run from the agents directory:
+
+    python -m benchmarks.import_time [--runs 5] [--top 15] [--build] [--module server]
+
+Each run is a new Python process, so nothing is cached in memory between runs. `--build` also times building the
+journalist team afterwards (what the background warm-up does); that needs the API keys in ../.env.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+AGENTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+result = {{"import_seconds": time.perf_counter() - started}}
+import agent_registry
+result["built_at_import"] = agent_registry.registry.stats()["built"]
+if {build}:
+    started = time.perf_counter()
+    try:
+        agent_registry.get_agent("SportsJournalistTeam")
+        result["build_seconds"] = time.perf_counter() - started
+    except Exception as e:
+        result["build_error"] = f"{{type(e).__name__}}: {{e}}"
+print(json.dumps(result))
+"""
+
+
+def run_once(module: str, build: bool) -> tuple:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD.format(module=module, build=build)],
+        cwd=AGENTS_DIR, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1]), completed.stderr
+
+
+def slowest_imports(importtime_log: str, top: int) -> list:
+    # `-X importtime` lines: "import time: self [us] | cumulative | imported package", nested imports indented by
+    # two spaces per level; the imported module and its direct imports are listed
+    modules = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth > 1:
+            continue
+        modules.append((int(cumulative), name.strip()))
+    return sorted(modules, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to time.")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list.")
+    parser.add_argument("--build", action="store_true", help="Also time building the journalist team.")
+    parser.add_argument("--module", default="server", help="Module to import.")
+    args = parser.parse_args()
+
+    results = []
+    log = ""
+    for _ in range(args.runs):
+        result, log = run_once(args.module, args.build)
+        results.append(result)
+
+    timings = [result["import_seconds"] for result in results]
+    print(f"import {args.module}: runs {len(timings)}  p50 {statistics.median(timings) * 1000:7.1f} ms  "
+          f"min {min(timings) * 1000:7.1f} ms  max {max(timings) * 1000:7.1f} ms")
+    print("slowest imports (last run, cumulative):")
+    for cumulative, name in slowest_imports(log, args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    if args.build:
+        builds = [result["build_seconds"] for result in results if "build_seconds" in result]
+        if builds:
+            print(f"build team: p50 {statistics.median(builds) * 1000:7.1f} ms")
+        else:
+            print(f"build team: failed ({results[-1].get('build_error')})")
+
+    built = results[-1]["built_at_import"]
+    if built:
+        print(f"FAIL: agents built at import: {', '.join(built)}")
+        return 1
+    print("no agents built at import")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Checks that narrations do not serialize the server: runs several narrations at once against a stand-in LLM and TTS
+backend and measures how long the event loop stalls while they run.
+
+Run from the agents directory:
+
+    python -m benchmarks.narration_concurrency [--narrations 8] [--llm-latency 0.5] [--tts-latency 0.2]
+
+Nothing touches the network; audio and scripts go to a temporary directory. Exits with status 1 if the
+concurrent run is not clearly faster than the serial one, or if the event loop stalled for longer than
+--max-lag.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+_workdir = tempfile.mkdtemp(prefix="narration_bench_")
+os.environ["NARRATION_AUDIO_DIR"] = os.path.join(_workdir, "audio")
+os.environ["NARRATION_SCRIPT_CACHE_PATH"] = os.path.join(_workdir, "narration.sqlite3")
+
+import report_narration  # noqa: E402  (the environment above must be set before import)
+from benchmarks.standins import fake_groq_client, fake_tts_backend  # noqa: E402
+
+
+async def measure_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    # Longest delay between asking to wake up after `interval` and actually running
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def run(reports, concurrent: bool) -> tuple:
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(measure_lag(stop))
+    started = time.perf_counter()
+    if concurrent:
+        files = await asyncio.gather(*(report_narration.narrate_cricket_report(report) for report in reports))
+    else:
+        files = [await report_narration.narrate_cricket_report(report) for report in reports]
+    elapsed = time.perf_counter() - started
+    stop.set()
+    return elapsed, await monitor, files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--narrations", type=int, default=8)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--tts-latency", type=float, default=0.2)
+    parser.add_argument("--max-lag", type=float, default=0.1, help="Largest acceptable event-loop stall in seconds.")
+    args = parser.parse_args()
+
+    report_narration.groq_client = fake_groq_client(args.llm_latency)
+    report_narration.tts_backend = fake_tts_backend(args.tts_latency)
+
+    # Distinct reports per run, so neither run is served from the narration cache
+    serial_reports = [f"# Serial report {i}\n\nBumrah took {i} wickets." for i in range(args.narrations)]
+    concurrent_reports = [f"# Concurrent report {i}\n\nBumrah took {i} wickets." for i in range(args.narrations)]
+
+    serial, serial_lag, _ = asyncio.run(run(serial_reports, concurrent=False))
+    concurrent, concurrent_lag, files = asyncio.run(run(concurrent_reports, concurrent=True))
+    cached, cached_lag, _ = asyncio.run(run(concurrent_reports, concurrent=True))
+
+    print(f"narrations:          {args.narrations}")
+    print(f"serial:              {serial:.2f}s (max loop lag {serial_lag * 1000:.1f} ms)")
+    print(f"concurrent:          {concurrent:.2f}s (max loop lag {concurrent_lag * 1000:.1f} ms)")
+    print(f"concurrent, cached:  {cached:.2f}s (max loop lag {cached_lag * 1000:.1f} ms)")
+    print(f"speedup:             {serial / concurrent:.1f}x")
+    print(f"audio files:         {len(set(files))} in {os.environ['NARRATION_AUDIO_DIR']}")
+
+    failures = []
+    if concurrent * 2 > serial:
+        failures.append("concurrent narrations took more than half the serial time")
+    if max(concurrent_lag, cached_lag) > args.max_lag:
+        failures.append(f"the event loop stalled for more than {args.max_lag * 1000:.0f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
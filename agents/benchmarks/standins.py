@@ -0,0 +1,447 @@
+"""
+Offline stand-ins for the services the agents call: a scripted agno model in place of Gemini and Groq, a Tavily
+toolkit answering from the fixture catalog, and Groq completions and TTS for narrations.
+
+`install` puts them where the agent factories import their providers from, so the real agents, teams, tools and
+prompts run unchanged and only the network (and the model's judgement) is replaced.
+"""
+import asyncio
+import json
+import re
+import sys
+import time
+import uuid
+from dataclasses import dataclass
+from types import ModuleType, SimpleNamespace
+from typing import ClassVar, Optional
+
+from agno.models.base import Model
+from agno.models.response import ModelResponse
+from agno.tools import Toolkit
+
+from benchmarks.cricbuzz_stub import PLAYERS, BOWLERS, find_entities
+
+NARRATION_SCRIPT = (
+    "What a finish at the Wankhede! Bumrah steams in for the final over with twelve to defend. "
+    "Yorker, dot ball, the crowd roars. Another yorker, and the stumps go cartwheeling! "
+) * 6
+
+DELEGATE = "transfer_task_to_member"
+# Member roles the scripted team leaders delegate to, found by keywords in the member IDs agno derives from names
+ROLES = {
+    "id_finder": ("id-finding",),
+    "player_id": ("player-id-finder",),
+    "match_id": ("match-id-finder",),
+    "match_data": ("cricket-data-fetcher",),
+    "player_data": ("player-data-fetcher",),
+    "drafting": ("report-syndicate",),
+    "match_drafter": ("match-report",),
+    "player_drafter": ("comprehensive-player-report", "player-report"),
+}
+PROFILE_URL = re.compile(r"cricbuzz\.com/(?:profiles|live-cricket-scores)/(\d+)/")
+ID_REQUEST = re.compile(r"\bCricbuzz (?:player|match) IDs?\b")
+
+
+def _tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def _task(text: str) -> str:
+    # Team members get their task wrapped in <task> tags, followed by the team's shared context
+    match = re.search(r"<task>\s*(.*?)\s*</task>", text, re.DOTALL)
+    return match.group(1) if match else text
+
+
+def _member_result(text: str) -> str:
+    return re.sub(r"^Agent [^:\n]+: ", "", text.strip())
+
+
+def _ids(text: str) -> list:
+    match = re.search(r"\bIDs?\s+((?:\d+(?:,\s*|\s+and\s+)?)+)", text)
+    return [int(value) for value in re.findall(r"\d+", match.group(1))] if match else []
+
+
+def _top_n(text: str):
+    match = re.search(r"\btop\s+(\d+)\b", text, re.IGNORECASE)
+    return int(match.group(1)) if match else None
+
+
+def _stats_kind(text: str) -> str:
+    return "bowling" if re.search(r"bowl|wicket", text, re.IGNORECASE) else "batting"
+
+
+class Turn:
+    """What the model sees on one call: the task, its tools and the tool calls and results since the task."""
+
+    def __init__(self, messages, tools):
+        self.tools = {tool["function"]["name"] for tool in tools or [] if tool.get("type") == "function"}
+        self.system = next((m.get_content_string() for m in messages if m.role == "system"), "")
+        start = max((i for i, m in enumerate(messages) if m.role == "user"), default=0)
+        self.query = messages[start].get_content_string() if messages else ""
+        self.task = _task(self.query)
+        calls = {}
+        self.results = []
+        for message in messages[start + 1:]:
+            if message.role == "assistant":
+                for tool_call in message.tool_calls or []:
+                    function = tool_call.get("function", {})
+                    calls[tool_call.get("id")] = (function.get("name"), json.loads(function.get("arguments") or "{}"))
+            if message.role == "tool":
+                name, args = calls.get(message.tool_call_id, (message.tool_name, message.tool_args or {}))
+                self.results.append((name, args, message.get_content_string()))
+        self.calls = list(calls.values())
+        self.members = re.findall(r"- ID: (\S+)", self.system)
+
+    def called(self, name: str, /, **args) -> bool:
+        return any(call == name and all(arguments.get(k) == v for k, v in args.items()) for call, arguments in self.calls)
+
+    def outputs(self, name: str, /, **args) -> list:
+        return [(arguments, output) for call, arguments, output in self.results
+                if call == name and all(arguments.get(k) == v for k, v in args.items())]
+
+    def member(self, role: str):
+        return next((member for member in self.members if any(key in member for key in ROLES[role])), None)
+
+
+@dataclass
+class ScriptedModel(Model):
+    """
+    Deterministic agno model. Each call inspects the task and the tools on offer and either calls the tools the
+    instructions ask for (ID lookups, member delegations, Cricbuzz dossiers, rankings, payload reads, web search)
+    or, once their results are in, answers with text built from them. Token usage is estimated from the text.
+    """
+
+    id: str = "scripted"
+    name: str = "Scripted"
+    provider: str = "Scripted"
+    api_key: Optional[str] = None
+
+    # Seconds every model call takes, set by `install`
+    latency: ClassVar[float] = 0.0
+
+    def invoke(self, messages, tools=None, **kwargs) -> ModelResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.respond(messages, tools)
+
+    async def ainvoke(self, messages, tools=None, **kwargs) -> ModelResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.respond(messages, tools)
+
+    def invoke_stream(self, messages, tools=None, **kwargs):
+        yield from self._deltas(self.invoke(messages, tools))
+
+    async def ainvoke_stream(self, messages, tools=None, **kwargs):
+        for delta in self._deltas(await self.ainvoke(messages, tools)):
+            yield delta
+
+    def parse_provider_response(self, response, **kwargs) -> ModelResponse:
+        return response
+
+    def parse_provider_response_delta(self, response) -> ModelResponse:
+        return response
+
+    @staticmethod
+    def _deltas(response: ModelResponse):
+        content = response.content or ""
+        for start in range(0, len(content), 200):
+            yield ModelResponse(role="assistant", content=content[start:start + 200])
+        if response.tool_calls:
+            yield ModelResponse(role="assistant", tool_calls=response.tool_calls)
+        yield ModelResponse(role="assistant", response_usage=response.response_usage)
+
+    def respond(self, messages, tools) -> ModelResponse:
+        turn = Turn(messages, tools)
+        calls = next_calls(turn)
+        content = None if calls else answer(turn)
+        tool_calls = [
+            {"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+             "function": {"name": name, "arguments": json.dumps(arguments)}}
+            for name, arguments in calls or []
+        ]
+        prompt = sum(_tokens(message.get_content_string()) for message in messages)
+        output = _tokens(content or json.dumps(tool_calls))
+        return ModelResponse(
+            role="assistant", content=content, tool_calls=tool_calls or None,
+            response_usage={"input_tokens": prompt, "output_tokens": output, "total_tokens": prompt + output},
+        )
+
+
+def next_calls(turn: Turn):
+    """The tool calls the model makes next, or None when it is ready to answer."""
+    if DELEGATE in turn.tools:
+        return _coordinate(turn)
+    if turn.calls and not turn.tools & {"describe_payload", "read_payload"}:
+        return None  # one round of tool calls, then the answer
+    ids = _ids(turn.task)
+    if "get_match_dossier" in turn.tools and ids:
+        return [("get_match_dossier", {"matchID": ids[0]})]
+    if "rank_players" in turn.tools and len(ids) > 1:
+        kind = _stats_kind(turn.task)
+        return [("rank_players", {"playerIDs": ids, "kind": kind, "top_n": _top_n(turn.task) or len(ids)})]
+    if "get_player_dossier" in turn.tools and ids:
+        return [("get_player_dossier", {"playerID": ids[0]})]
+    if "web_search_using_tavily" in turn.tools and ID_REQUEST.search(turn.task):
+        return [("web_search_using_tavily", {"query": f"cricbuzz {entity.kind} {entity.name}"})
+                for entity in find_entities(turn.task)] or None
+    handle = re.search(r"\bpl_[0-9a-f]{10}\b", turn.task)
+    if handle and "read_payload" in turn.tools:
+        if not turn.called("describe_payload"):
+            return [("describe_payload", {"handle": handle.group(0)})]
+        if not turn.called("read_payload"):
+            return [("read_payload", {"handle": handle.group(0), "innings": 2, "from_over": 15, "to_over": 20})]
+    return None
+
+
+def _coordinate(turn: Turn):
+    # Team leaders: resolve IDs (index, then the ID finders), fetch the data, then hand it to the drafters
+    entities = find_entities(turn.task)
+    top_n = _top_n(turn.task)
+    if not entities and top_n and turn.member("player_data"):
+        entities = [entity for entity in PLAYERS if (entity.id in BOWLERS) == (_stats_kind(turn.task) == "bowling")]
+    if entities and "lookup_cricbuzz_id" in turn.tools and not turn.called("lookup_cricbuzz_id"):
+        return [("lookup_cricbuzz_id", {"name": entity.name, "kind": entity.kind}) for entity in entities]
+
+    known = _known_ids(turn, entities)
+    missing = [entity for entity in entities if entity.name not in known]
+    delegations = []
+    for entity in missing:
+        member = turn.member("id_finder") or turn.member(f"{entity.kind}_id")
+        if member and not turn.called(DELEGATE, member_id=member):
+            delegations.append((member, entity))
+    if delegations:
+        by_member = {}
+        for member, entity in delegations:
+            by_member.setdefault(member, []).append(entity)
+        return [
+            (DELEGATE, {"member_id": member, "expected_output": "ID: {id} per player or match",
+                        "task_description": f"Find the Cricbuzz {found[0].kind} IDs of: {', '.join(e.name for e in found)}"})
+            for member, found in by_member.items()
+        ]
+    if "remember_cricbuzz_id" in turn.tools and not turn.called("remember_cricbuzz_id"):
+        found = [(entity, known[entity.name]) for entity in entities if entity.name in known and not _indexed(turn, entity)]
+        if found:
+            return [("remember_cricbuzz_id", {"name": entity.name, "kind": entity.kind, "cricbuzz_id": cricbuzz_id})
+                    for entity, cricbuzz_id in found]
+
+    data = _data_requests(turn, entities, known, top_n)
+    if data:
+        return data
+    drafter = _drafter(turn, entities)
+    if drafter and not turn.called(DELEGATE, member_id=drafter):
+        gathered = "\n\n".join(
+            _member_result(output) for arguments, output in turn.outputs(DELEGATE)
+            if arguments.get("member_id") in (turn.member("match_data"), turn.member("player_data"))
+        ) or _data(turn)
+        return [(DELEGATE, {"member_id": drafter, "expected_output": "The full Markdown report",
+                            "task_description": f"Draft a publication-ready report for: {_title(turn)}\n\n{gathered}"})]
+    return None
+
+
+def _lookup_id(output: str):
+    # Dict results reach the model as JSON or as their Python repr
+    match = re.search(r"[\'\"]id[\'\"]:\s*(\d+)", output)
+    return int(match.group(1)) if match else None
+
+
+def _indexed(turn: Turn, entity) -> bool:
+    return any(_lookup_id(output) for _, output in turn.outputs("lookup_cricbuzz_id", name=entity.name))
+
+
+def _known_ids(turn: Turn, entities: list) -> dict:
+    known = {}
+    for arguments, output in turn.outputs("lookup_cricbuzz_id"):
+        if _lookup_id(output):
+            known[arguments.get("name")] = _lookup_id(output)
+    for arguments, output in turn.outputs(DELEGATE):
+        for entity in entities:
+            match = re.search(re.escape(entity.name) + r":\s*(\d+)", output)
+            if match:
+                known.setdefault(entity.name, int(match.group(1)))
+    return known
+
+
+def _data_requests(turn: Turn, entities: list, known: dict, top_n):
+    requests = []
+    matches = [known[e.name] for e in entities if e.kind == "match" and e.name in known]
+    players = [known[e.name] for e in entities if e.kind == "player" and e.name in known]
+    match_member, player_member = turn.member("match_data"), turn.member("player_data")
+    if matches and match_member and not turn.called(DELEGATE, member_id=match_member):
+        requests.append((DELEGATE, {"member_id": match_member, "expected_output": "The match dossier",
+                                    "task_description": f"Fetch the complete match dossier for match ID {matches[0]}."}))
+    elif players and player_member and not matches and not turn.called(DELEGATE, member_id=player_member):
+        if len(players) > 1:
+            kind = _stats_kind(turn.task)
+            task = f"Rank the players with IDs {', '.join(map(str, players))} by {kind}, top {top_n or len(players)}."
+        else:
+            task = f"Fetch the complete player dossier for player ID {players[0]}."
+        requests.append((DELEGATE, {"member_id": player_member, "expected_output": "The player data",
+                                    "task_description": task}))
+    return requests
+
+
+def _drafter(turn: Turn, entities: list):
+    if turn.member("drafting"):
+        return turn.member("drafting")
+    if any(entity.kind == "match" for entity in entities) or "match dossier" in turn.task.lower():
+        return turn.member("match_drafter")
+    return turn.member("player_drafter")
+
+
+def _data(turn: Turn) -> str:
+    # The task without its "Draft ... report for:" line
+    first, _, rest = turn.task.partition("\n\n")
+    return rest if first.startswith("Draft") and rest else turn.task
+
+
+def _title(turn: Turn) -> str:
+    match = re.search(r"report for: (.+)", turn.task)
+    return (match.group(1) if match else turn.task.splitlines()[0]).strip()
+
+
+def answer(turn: Turn) -> str:
+    """The final text of a run: IDs for the ID finders, tool output for the data fetchers, a report otherwise."""
+    drafted = [output for arguments, output in turn.outputs(DELEGATE)
+               if arguments.get("member_id") in (turn.member("drafting"), turn.member("match_drafter"), turn.member("player_drafter"))]
+    if drafted:
+        return _member_result(drafted[-1])
+
+    searches = turn.outputs("web_search_using_tavily")
+    id_team = turn.member("player_id") and not turn.member("player_data")
+    if (searches and ID_REQUEST.search(turn.task)) or id_team:
+        entities = find_entities(turn.task)
+        known = _known_ids(turn, entities)
+        for arguments, output in searches:
+            found = PROFILE_URL.search(output)
+            for entity in find_entities(arguments.get("query", "")):
+                if found:
+                    known.setdefault(entity.name, int(found.group(1)))
+        lines = [f"{entity.name}: {known[entity.name]}" for entity in entities if entity.name in known]
+        if len(entities) == 1 and lines:
+            lines.insert(0, f"ID: {known[entities[0].name]}")
+        return "\n".join(lines) or "The ID could not be found."
+
+    for name in ("get_match_dossier", "rank_players", "get_player_dossier"):
+        outputs = turn.outputs(name)
+        if outputs:
+            return outputs[-1][1]
+    return _report(turn)
+
+
+def _report(turn: Turn) -> str:
+    # A drafter's report: title, overview and the data it was given, with pipe-separated tables as Markdown tables
+    title = _title(turn)
+    lines = [f"# {title}", "", "## Overview", "",
+             f"This report covers {title}, drawing on the official scorecards and statistics supplied by the data desk.",
+             "", "## Statistics", ""]
+    table = []
+    for line in _data(turn).splitlines():
+        if "|" in line and not line.lstrip().startswith("|"):
+            cells = [cell.strip() for cell in line.strip().split("|")]
+            if not table:
+                table = [f"| {' | '.join(cells)} |", "|" + "---|" * len(cells)]
+            else:
+                table.append(f"| {' | '.join(cells)} |")
+            continue
+        if table:
+            lines.extend(table + [""])
+            table = []
+        if line.strip():
+            lines.append(line.strip())
+    lines.extend(table)
+    for _, output in turn.outputs("read_payload"):
+        lines.extend(["", "## Key Moments", "", output[:4000]])
+    lines.extend(["", "## Conclusion", "", f"{title} leaves plenty to reflect on for players and supporters alike."])
+    return "\n".join(lines)
+
+
+class FakeTavilyTools(Toolkit):
+    """Stand-in for `agno.tools.tavily.TavilyTools`: finds catalog players and matches named in the query."""
+
+    latency: ClassVar[float] = 0.0
+
+    def __init__(self, api_key: str = None, format: str = "json", **kwargs):
+        super().__init__(name="tavily_tools", tools=[self.web_search_using_tavily])
+
+    def web_search_using_tavily(self, query: str, max_results: int = 5) -> str:
+        """Use this function to search the web for a given query.
+
+        Args:
+            query (str): Query to search for.
+            max_results (int): Maximum number of results to return. Defaults to 5.
+
+        Returns:
+            str: JSON string of results related to the query.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        results = []
+        for entity in find_entities(query):
+            slug = re.sub(r"[^a-z0-9]+", "-", entity.name.lower()).strip("-")
+            path = "profiles" if entity.kind == "player" else "live-cricket-scores"
+            results.append({
+                "title": f"{entity.name} - Cricbuzz",
+                "url": f"https://www.cricbuzz.com/{path}/{entity.id}/{slug}",
+                "content": f"{entity.name}: profile, scores, statistics and latest news on Cricbuzz.com. " * 4,
+                "score": 0.92,
+            })
+        results.append({"title": "Cricket news", "url": "https://example.com/cricket",
+                        "content": "Latest cricket news, analysis and opinion. " * 8, "score": 0.41})
+        return json.dumps({"query": query, "answer": results[0]["title"], "results": results[:max_results]})
+
+
+class FakeGroqCompletions:
+    """Stand-in for `AsyncGroq().chat.completions`: answers after `latency` seconds, streamed or not, with usage."""
+
+    def __init__(self, latency: float, script: str = NARRATION_SCRIPT):
+        self.latency = latency
+        self.script = script
+
+    async def create(self, messages=(), stream=False, **kwargs):
+        await asyncio.sleep(self.latency)
+        usage = SimpleNamespace(
+            prompt_tokens=sum(_tokens(message.get("content", "")) for message in messages),
+            completion_tokens=_tokens(self.script),
+        )
+        if not stream:
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.script))], usage=usage)
+
+        async def chunks():
+            for word in self.script.split(" "):
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word + " "))], x_groq=None)
+            yield SimpleNamespace(choices=[], x_groq=SimpleNamespace(usage=usage))
+        return chunks()
+
+
+def fake_groq_client(latency: float):
+    return SimpleNamespace(chat=SimpleNamespace(completions=FakeGroqCompletions(latency)))
+
+
+def fake_tts_backend(latency: float):
+    """TTS stand-in returning bytes shaped like an MP3 frame after `latency` seconds per chunk."""
+    async def backend(text, voice, **prosody):
+        await asyncio.sleep(latency)
+        return b"\xff\xfb" + text.encode("utf-8")
+    return backend
+
+
+def install(model_latency: float = 0.0, search_latency: float = 0.0):
+    """
+    Makes the agent factories build their agents with `ScriptedModel` and `FakeTavilyTools`.
+
+    The factories import `Gemini`, `Groq` and `TavilyTools` when they run, so the stand-ins are registered as those
+    modules; call this before the first agent is built. Narration stand-ins are installed separately, on the
+    `report_narration` module (`groq_client` and `tts_backend`).
+    """
+    ScriptedModel.latency = model_latency
+    FakeTavilyTools.latency = search_latency
+    for module_name, attribute, value in (
+        ("agno.models.google", "Gemini", ScriptedModel),
+        ("agno.models.groq", "Groq", ScriptedModel),
+        ("agno.tools.tavily", "TavilyTools", FakeTavilyTools),
+    ):
+        module = ModuleType(module_name)
+        setattr(module, attribute, value)
+        sys.modules[module_name] = module
+
@@ -0,0 +1,175 @@
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+COMPACT_PAYLOADS = os.getenv("CRICBUZZ_COMPACT_PAYLOADS", "1") != "0"
+
+# Fields that only matter to the Cricbuzz apps and website, never to a report
+NOISE_KEYS = {
+    "appIndex", "seoTitle", "webURL", "seriesSpinner", "responseLastUpdated", "lastUpdated",
+    "timeStamp", "timestamp", "commentaryFormats", "image", "imageUrl", "appLinks", "ads",
+}
+NOISE_SUFFIXES = ("ImageId", "imageId", "ImageUrl")
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _encoding = None
+
+_stats_lock = threading.Lock()
+_stats = {"payloads": 0, "raw_tokens": 0, "compact_tokens": 0}
+
+
+def count_tokens(text: str) -> int:
+    """Counts tokens with tiktoken when it is installed, otherwise estimates ~4 characters per token."""
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def _is_noise(key) -> bool:
+    return key in NOISE_KEYS or (isinstance(key, str) and key.endswith(NOISE_SUFFIXES))
+
+
+def _is_empty(value) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _is_scalar(value) -> bool:
+    return not isinstance(value, (dict, list))
+
+
+def _strip(value):
+    if isinstance(value, dict):
+        stripped = {key: _strip(item) for key, item in value.items() if not _is_noise(key)}
+        return {key: item for key, item in stripped.items() if not _is_empty(item)}
+    if isinstance(value, list):
+        return [item for item in (_strip(item) for item in value) if not _is_empty(item)]
+    return value
+
+
+def _cell(value) -> str:
+    if isinstance(value, bool):
+        return "Y" if value else "N"
+    if _is_scalar(value):
+        return str(value).replace("|", "/").replace("\n", " ")
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).replace("|", "/")
+
+
+def _stats_table(headers: list, rows: list) -> list:
+    # Cricbuzz stats tables: {"headers": [...], "values": [{"values": [...]}, ...]}
+    lines = ["|".join(_cell(header) for header in headers)]
+    for row in rows:
+        cells = row.get("values", []) if isinstance(row, dict) else row
+        lines.append("|".join(_cell(cell) for cell in cells))
+    return lines
+
+
+def _records_table(records: list) -> list:
+    columns = list(dict.fromkeys(key for record in records for key in record))
+    lines = ["|".join(columns)]
+    for record in records:
+        lines.append("|".join(_cell(record.get(column, "")) for column in columns))
+    return lines
+
+
+def _is_records(items: list) -> bool:
+    # A list of mostly flat dicts (scorecard batters, commentary balls); the odd nested cell is inlined as JSON
+    if len(items) < 2 or not all(isinstance(item, dict) for item in items):
+        return False
+    cells = [value for item in items for value in item.values()]
+    nested = sum(1 for value in cells if not _is_scalar(value))
+    return nested * 4 <= len(cells)
+
+
+def _encode(value, indent: str = "") -> list:
+    if _is_scalar(value):
+        return [indent + _cell(value)]
+
+    if isinstance(value, list):
+        if _is_records(value):
+            return [indent + line for line in _records_table(value)]
+        if all(_is_scalar(item) for item in value):
+            return [indent + ", ".join(_cell(item) for item in value)]
+        lines = []
+        for item in value:
+            lines.extend(_encode(item, indent + "  "))
+            lines.append(indent + "-")
+        return lines[:-1]
+
+    if "headers" in value and isinstance(value.get("values"), list):
+        lines = [indent + line for line in _stats_table(value["headers"], value["values"])]
+        rest = {key: item for key, item in value.items() if key not in ("headers", "values")}
+        return lines + (_encode(rest, indent) if rest else [])
+
+    # Keyed collections such as {"bat_1": {...}, "bat_2": {...}} are tables too
+    children = list(value.values())
+    if _is_records(children):
+        return [indent + line for line in _records_table(children)]
+
+    lines = []
+    for key, item in value.items():
+        if _is_scalar(item) or (isinstance(item, list) and all(_is_scalar(element) for element in item)):
+            lines.extend(f"{indent}{key}: {line.strip()}" for line in _encode(item))
+        else:
+            lines.append(f"{indent}{key}:")
+            lines.extend(_encode(item, indent + "  "))
+    return lines
+
+
+def compact(payload) -> str:
+    """
+    Turns a Cricbuzz JSON payload into compact, model-friendly text.
+
+    App/SEO metadata, image IDs, spinners and empty fields are dropped. Stats tables
+    (`headers`/`values`), scorecard player lists and other repeated records become pipe-separated columns with
+    one header line, and remaining nesting is expressed with indentation instead of JSON punctuation.
+
+    Args:
+        payload (dict | list): Decoded Cricbuzz JSON.
+
+    Returns:
+        str: The compact text form.
+    """
+    return "\n".join(_encode(_strip(payload)))
+
+
+def for_model(payload, label: str = "payload"):
+    """
+    Prepares a Cricbuzz payload for an LLM: the compact text form, or the payload unchanged when compaction is
+    disabled with CRICBUZZ_COMPACT_PAYLOADS=0. Error payloads are passed through untouched.
+
+    Token savings are logged and accumulated in `compaction_stats()`.
+
+    Args:
+        payload (dict | list): Decoded Cricbuzz JSON.
+        label (str): Name used in the log line, e.g. "player_batting:1413".
+
+    Returns:
+        str | dict | list: The compact text, or the original payload.
+    """
+    if not COMPACT_PAYLOADS or (isinstance(payload, dict) and set(payload) == {"error"}):
+        return payload
+    text = compact(payload)
+    raw_tokens = count_tokens(json.dumps(payload, indent=2, ensure_ascii=False))
+    compact_tokens = count_tokens(text)
+    with _stats_lock:
+        _stats["payloads"] += 1
+        _stats["raw_tokens"] += raw_tokens
+        _stats["compact_tokens"] += compact_tokens
+    saved = 100 * (raw_tokens - compact_tokens) / raw_tokens if raw_tokens else 0.0
+    logger.info("Compacted %s: %d -> %d tokens (%.1f%% saved)", label, raw_tokens, compact_tokens, saved)
+    return text
+
+
+def compaction_stats() -> dict:
+    """Returns the number of compacted payloads and their token counts before and after compaction."""
+    with _stats_lock:
+        stats = dict(_stats)
+    raw = stats["raw_tokens"]
+    stats["saved_ratio"] = round((raw - stats["compact_tokens"]) / raw, 4) if raw else 0.0
+    return stats
@@ -0,0 +1,454 @@
+import os
+import json
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+import weakref
+from urllib.parse import quote, urlsplit
+import requests
+import httpx
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from agent_registry import load_env
+from response_cache import CachePolicy, SQLiteTTLCache
+from id_index import index_payload
+from rate_limiter import get_rate_limiter, parse_retry_after, priority_scope, RateLimitError, BATCH
+from tracing import span
+
+# Load environment variables
+load_env()
+
+x_rapidapi_key = os.getenv("X-RAPID-API-KEY")
+x_rapidapi_host = os.getenv("X-RAPID-API-HOST")
+
+BASE_URL = os.getenv("CRICBUZZ_BASE_URL", "https://cricbuzz-cricket.p.rapidapi.com").rstrip("/")
+API_HOST = urlsplit(BASE_URL).netloc
+# 429 responses retried after waiting out their Retry-After, before the request is reported as failed
+RATE_LIMIT_RETRIES = int(os.getenv("CRICBUZZ_RATE_LIMIT_RETRIES", "3"))
+
+# Endpoint name -> (path template, (connect timeout, read timeout) in seconds)
+ENDPOINTS = {
+    "match_scorecard": ("/mcenter/v1/{id}/scard", (3.05, 15)),
+    "match_commentary": ("/mcenter/v1/{id}/comm", (3.05, 20)),
+    "match_info": ("/mcenter/v1/{id}", (3.05, 10)),
+    "player_batting": ("/stats/v1/player/{id}/batting", (3.05, 10)),
+    "player_bowling": ("/stats/v1/player/{id}/bowling", (3.05, 10)),
+    "player_info": ("/stats/v1/player/{id}", (3.05, 10)),
+    "player_career": ("/stats/v1/player/{id}/career", (3.05, 10)),
+    "player_search": ("/stats/v1/player/search?plrN={id}", (3.05, 10)),
+}
+
+# Dossier section -> endpoint, for players and matches
+PLAYER_SECTIONS = {
+    "info": "player_info",
+    "career": "player_career",
+    "batting": "player_batting",
+    "bowling": "player_bowling",
+}
+MATCH_SECTIONS = {
+    "info": "match_info",
+    "scorecard": "match_scorecard",
+    "commentary": "match_commentary",
+}
+
+# Connection pool sizing, shared by every toolkit in the process
+POOL_CONNECTIONS = int(os.getenv("CRICBUZZ_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("CRICBUZZ_POOL_MAXSIZE", "32"))
+KEEPALIVE_EXPIRY = float(os.getenv("CRICBUZZ_KEEPALIVE_EXPIRY", "30"))
+BULK_CONCURRENCY = int(os.getenv("CRICBUZZ_BULK_CONCURRENCY", "6"))
+
+# Per-endpoint freshness: profiles change rarely, stats after every match, live commentary every ball
+CACHE_POLICIES = {
+    "match_scorecard": CachePolicy(ttl=30, stale_ttl=300),
+    "match_commentary": CachePolicy(ttl=10, stale_ttl=60),
+    "match_info": CachePolicy(ttl=60, stale_ttl=600),
+    "player_batting": CachePolicy(ttl=6 * 3600, stale_ttl=24 * 3600),
+    "player_bowling": CachePolicy(ttl=6 * 3600, stale_ttl=24 * 3600),
+    "player_info": CachePolicy(ttl=7 * 86400, stale_ttl=30 * 86400),
+    "player_career": CachePolicy(ttl=86400, stale_ttl=7 * 86400),
+    "player_search": CachePolicy(ttl=7 * 86400, stale_ttl=30 * 86400),
+}
+# Data for a completed match no longer changes, whatever the endpoint
+FINISHED_MATCH_POLICY = CachePolicy(ttl=7 * 86400, stale_ttl=30 * 86400)
+
+CACHE_ENABLED = os.getenv("CRICBUZZ_CACHE", "1") != "0"
+CACHE_PATH = os.getenv("CRICBUZZ_CACHE_PATH", "../cache/cricbuzz.sqlite3")
+CACHE_MAX_BYTES = int(os.getenv("CRICBUZZ_CACHE_MAX_MB", "256")) * 1024 * 1024
+
+_cache = None
+_cache_lock = threading.Lock()
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+_session = None
+_session_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _headers() -> dict:
+    return {
+        "x-rapidapi-key": x_rapidapi_key,
+        "x-rapidapi-host": x_rapidapi_host,
+        "Connection": "keep-alive",
+    }
+
+
+def _build_url(endpoint: str, resource_id) -> tuple:
+    if endpoint not in ENDPOINTS:
+        raise ValueError(f"Unknown Cricbuzz endpoint: {endpoint}")
+    path, timeout = ENDPOINTS[endpoint]
+    return BASE_URL + path.format(id=quote(str(resource_id))), timeout
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide pooled `requests.Session` used for Cricbuzz calls.
+
+    The session keeps TCP/TLS connections alive between calls and retries failed connection
+    attempts (never read timeouts) with a short backoff.
+
+    Returns:
+        requests.Session: The shared session, created on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2, allowed_methods=["GET"])
+                adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update(_headers())
+                _session = session
+    return _session
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the pooled `httpx.AsyncClient` bound to the running event loop.
+
+    httpx clients cannot be shared across event loops, so one client is kept per loop.
+
+    Returns:
+        httpx.AsyncClient: The shared async client for the current loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers=_headers(),
+            limits=httpx.Limits(
+                max_connections=POOL_MAXSIZE,
+                max_keepalive_connections=POOL_MAXSIZE,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=2),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def get_cache():
+    """
+    Returns the shared on-disk response cache, or None when caching is disabled with CRICBUZZ_CACHE=0.
+
+    Returns:
+        SQLiteTTLCache | None: The cache, opened on first use.
+    """
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SQLiteTTLCache(CACHE_PATH, max_bytes=CACHE_MAX_BYTES)
+    return _cache
+
+
+def rate_limit_stats() -> dict:
+    """Returns the counters and per-host state of the shared rate limiter."""
+    limiter = get_rate_limiter()
+    return limiter.stats() if limiter is not None else {"enabled": False}
+
+
+def cache_stats() -> dict:
+    """Returns hit/miss counters and size of the Cricbuzz response cache."""
+    cache = get_cache()
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
+def _cache_key(endpoint: str, resource_id) -> str:
+    return f"{endpoint}:{resource_id}"
+
+
+def _is_finished_match(payload: dict) -> bool:
+    if payload.get("isMatchComplete") is True:
+        return True
+    for section in ("matchHeader", "matchInfo"):
+        details = payload.get(section)
+        if isinstance(details, dict) and (details.get("complete") is True or details.get("state") == "Complete"):
+            return True
+    return False
+
+
+def _cache_lookup(endpoint: str, resource_id):
+    cache = get_cache()
+    if cache is None:
+        return None
+    value, state = cache.get(_cache_key(endpoint, resource_id))
+    if state is None:
+        return None
+    if state == "stale":
+        _revalidate_in_background(endpoint, resource_id)
+    return json.loads(value)
+
+
+def _cache_store(endpoint: str, resource_id, payload: dict):
+    cache = get_cache()
+    if cache is None or not isinstance(payload, dict) or "error" in payload:
+        return
+    policy = CACHE_POLICIES[endpoint]
+    if endpoint.startswith("match_") and _is_finished_match(payload):
+        policy = FINISHED_MATCH_POLICY
+    cache.set(_cache_key(endpoint, resource_id), json.dumps(payload, separators=(",", ":")), policy)
+
+
+def _record(endpoint: str, resource_id, payload: dict):
+    # Caches a fresh response and indexes the names in it; both write to SQLite
+    _cache_store(endpoint, resource_id, payload)
+    index_payload(endpoint, resource_id, payload)
+
+
+def _revalidate_in_background(endpoint: str, resource_id):
+    key = _cache_key(endpoint, resource_id)
+    with _revalidating_lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+
+    def refresh():
+        try:
+            # Background refreshes never take request slots reserved for interactive calls
+            with priority_scope(BATCH):
+                _cache_store(endpoint, resource_id, _fetch_network(endpoint, resource_id))
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
+
+    threading.Thread(target=refresh, name=f"cricbuzz-revalidate-{key}", daemon=True).start()
+
+
+def _throttled(response_status: int, headers, attempt: int) -> bool:
+    # Records quota headers, and on a 429 blocks the host for its Retry-After; True means "send again"
+    limiter = get_rate_limiter()
+    if limiter is None:
+        return False
+    limiter.sync_quota(API_HOST, headers.get("x-ratelimit-requests-remaining"))
+    if response_status != 429 or attempt >= RATE_LIMIT_RETRIES:
+        return False
+    limiter.block(API_HOST, parse_retry_after(headers.get("Retry-After")))
+    return True
+
+
+def _fetch_network(endpoint: str, resource_id) -> dict:
+    with span("http", f"cricbuzz.{endpoint}", resource_id=resource_id) as trace:
+        payload = _fetch_network_attempts(endpoint, resource_id, trace)
+        if "error" in payload:
+            trace.status = "error"
+            trace.set(error=payload["error"])
+        return payload
+
+
+def _fetch_network_attempts(endpoint: str, resource_id, trace) -> dict:
+    url, timeout = _build_url(endpoint, resource_id)
+    limiter = get_rate_limiter()
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        try:
+            if limiter is not None:
+                trace.set(rate_limit_wait_ms=round(limiter.acquire(API_HOST) * 1000, 2))
+            response = get_session().get(url, timeout=timeout)
+            trace.set(status_code=response.status_code, attempts=attempt + 1)
+            if _throttled(response.status_code, response.headers, attempt):
+                continue
+            response.raise_for_status()
+            return response.json()
+        except RateLimitError as e:
+            return {"error": f"API request failed: {str(e)}"}
+        except requests.RequestException as e:
+            return {"error": f"API request failed: {str(e)}"}
+        except ValueError as e:
+            return {"error": f"API returned invalid JSON: {str(e)}"}
+
+
+async def _afetch_network(endpoint: str, resource_id) -> dict:
+    with span("http", f"cricbuzz.{endpoint}", resource_id=resource_id) as trace:
+        payload = await _afetch_network_attempts(endpoint, resource_id, trace)
+        if "error" in payload:
+            trace.status = "error"
+            trace.set(error=payload["error"])
+        return payload
+
+
+async def _afetch_network_attempts(endpoint: str, resource_id, trace) -> dict:
+    url, (connect_timeout, read_timeout) = _build_url(endpoint, resource_id)
+    timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+    limiter = get_rate_limiter()
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        try:
+            if limiter is not None:
+                trace.set(rate_limit_wait_ms=round(await limiter.aacquire(API_HOST) * 1000, 2))
+            response = await get_async_client().get(url, timeout=timeout)
+            trace.set(status_code=response.status_code, attempts=attempt + 1)
+            if await asyncio.to_thread(_throttled, response.status_code, response.headers, attempt):
+                continue
+            response.raise_for_status()
+            return response.json()
+        except RateLimitError as e:
+            return {"error": f"API request failed: {str(e)}"}
+        except httpx.HTTPError as e:
+            return {"error": f"API request failed: {str(e)}"}
+        except ValueError as e:
+            return {"error": f"API returned invalid JSON: {str(e)}"}
+
+
+def fetch(endpoint: str, resource_id: int, use_cache: bool = True) -> dict:
+    """
+    Fetches a Cricbuzz endpoint over the shared keep-alive session, going through the response cache.
+
+    Fresh cache entries are returned without a network call. Stale entries are returned immediately
+    and refreshed in the background. Error responses are never cached.
+
+    Args:
+        endpoint (str): One of the keys of `ENDPOINTS` (e.g. "player_batting").
+        resource_id (int): Match ID or player ID substituted into the endpoint path.
+        use_cache (bool): Set to False to bypass the cache lookup (the fresh response is still stored).
+
+    Returns:
+        dict: The decoded JSON response, or {"error": ...} if the request failed or timed out.
+    """
+    if use_cache:
+        cached = _cache_lookup(endpoint, resource_id)
+        if cached is not None:
+            return cached
+    payload = _fetch_network(endpoint, resource_id)
+    _record(endpoint, resource_id, payload)
+    return payload
+
+
+async def afetch(endpoint: str, resource_id: int, use_cache: bool = True) -> dict:
+    """
+    Async variant of `fetch` using the pooled `httpx.AsyncClient` of the running loop. The cache and ID index are
+    read and written in worker threads, never on the loop.
+
+    Args:
+        endpoint (str): One of the keys of `ENDPOINTS` (e.g. "match_scorecard").
+        resource_id (int): Match ID or player ID substituted into the endpoint path.
+        use_cache (bool): Set to False to bypass the cache lookup (the fresh response is still stored).
+
+    Returns:
+        dict: The decoded JSON response, or {"error": ...} if the request failed or timed out.
+    """
+    if use_cache:
+        cached = await asyncio.to_thread(_cache_lookup, endpoint, resource_id)
+        if cached is not None:
+            return cached
+    payload = await _afetch_network(endpoint, resource_id)
+    await asyncio.to_thread(_record, endpoint, resource_id, payload)
+    return payload
+
+
+def fetch_many(calls: list, max_concurrency: int = 8) -> list:
+    """
+    Fetches several Cricbuzz endpoints concurrently over the shared session.
+
+    Args:
+        calls (list): (endpoint, resource_id) pairs.
+        max_concurrency (int): Maximum number of requests in flight at once.
+
+    Returns:
+        list: One payload (or {"error": ...} dict) per call, in the same order as `calls`.
+    """
+    if not calls:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(len(calls), max_concurrency))) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, fetch, endpoint, resource_id)
+            for endpoint, resource_id in calls
+        ]
+        return [future.result() for future in futures]
+
+
+async def afetch_many(calls: list, max_concurrency: int = 8) -> list:
+    """
+    Async variant of `fetch_many`.
+
+    Args:
+        calls (list): (endpoint, resource_id) pairs.
+        max_concurrency (int): Maximum number of requests in flight at once.
+
+    Returns:
+        list: One payload (or {"error": ...} dict) per call, in the same order as `calls`.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def bounded(endpoint, resource_id):
+        async with semaphore:
+            return await afetch(endpoint, resource_id)
+
+    return await asyncio.gather(*(bounded(endpoint, resource_id) for endpoint, resource_id in calls))
+
+
+def fetch_players_bulk(player_ids: list, sections: list, max_concurrency: int = BULK_CONCURRENCY) -> list:
+    """
+    Fetches the requested sections for many players with bounded concurrency.
+
+    Repeated player IDs are fetched once. A failing endpoint does not fail the batch: its section holds the
+    {"error": ...} payload and the section name is listed under "errors" for that player.
+
+    Args:
+        player_ids (list): Cricbuzz player IDs, possibly with duplicates.
+        sections (list): Keys of `PLAYER_SECTIONS` to fetch for every player (e.g. ["batting", "bowling"]).
+        max_concurrency (int): Maximum number of requests in flight at once.
+
+    Returns:
+        list: One {"playerID", <section>..., "errors"} dict per unique player, in first-seen order.
+
+    Raises:
+        ValueError: If a section name is unknown.
+    """
+    unknown = [section for section in sections if section not in PLAYER_SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown player sections: {', '.join(unknown)}. Expected any of {', '.join(PLAYER_SECTIONS)}.")
+    sections = list(dict.fromkeys(sections))
+    unique_ids = list(dict.fromkeys(player_ids))
+    calls = [(PLAYER_SECTIONS[section], player_id) for player_id in unique_ids for section in sections]
+    payloads = iter(fetch_many(calls, max_concurrency=max_concurrency))
+
+    results = []
+    for player_id in unique_ids:
+        result = {"playerID": player_id, "errors": []}
+        for section in sections:
+            payload = next(payloads)
+            result[section] = payload
+            if isinstance(payload, dict) and "error" in payload:
+                result["errors"].append(section)
+        results.append(result)
+    return results
+
+
+def close():
+    """Closes the shared sync session, if one was created."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+async def aclose():
+    """Closes the async client bound to the running event loop, if one was created."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,338 @@
+import logging
+import os
+import re
+import threading
+from io import BytesIO
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.enum.table import WD_TABLE_ALIGNMENT
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.opc.constants import RELATIONSHIP_TYPE
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.shared import Pt, RGBColor
+from markdown_it import MarkdownIt
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# "native" renders in-process and falls back to pandoc for unsupported markdown; "pandoc" always uses pandoc
+DOCX_RENDERER = os.getenv("DOCX_RENDERER", "native")
+
+# Deepest list level with its own Word list style ("List Bullet 3", "List Number 3"); deeper items share it
+MAX_LIST_LEVEL = 3
+
+CODE_STYLE = "Source Code"
+CODE_FONT = "Consolas"
+LINK_COLOR = RGBColor(0x05, 0x63, 0xC1)
+
+_parser = MarkdownIt("commonmark").enable(["table", "strikethrough"])
+_LINE_BREAK_TAG = re.compile(r"^<br\s*/?>$", re.IGNORECASE)
+_ALIGNMENTS = {"left": WD_ALIGN_PARAGRAPH.LEFT, "center": WD_ALIGN_PARAGRAPH.CENTER, "right": WD_ALIGN_PARAGRAPH.RIGHT}
+
+_counters = {"native": 0, "pandoc": 0, "fallbacks": 0}
+_counters_lock = threading.Lock()
+
+
+class UnsupportedMarkdown(ValueError):
+    """Raised for markdown the native renderer does not handle (raw HTML, images); pandoc is used instead."""
+
+
+def _count(name: str):
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def docx_stats() -> dict:
+    """Returns how many reports were converted natively, with pandoc, and by falling back to pandoc."""
+    with _counters_lock:
+        return {"renderer": DOCX_RENDERER, **_counters}
+
+
+class _Renderer:
+    # Walks the flat markdown-it token stream and appends the matching Word elements to the document
+
+    def __init__(self, document):
+        self.document = document
+        self.lists = []
+        self.quote_depth = 0
+        self._style_ids = {}
+
+    def add_paragraph(self, style: str = None):
+        # python-docx resolves style names by scanning every style on each call; the IDs are looked up once instead
+        paragraph = self.document.add_paragraph()
+        if style is not None:
+            if style not in self._style_ids:
+                self._style_ids[style] = self.document.styles[style].style_id
+            paragraph._p.style = self._style_ids[style]
+        return paragraph
+
+    def render(self, tokens):
+        index = 0
+        while index < len(tokens):
+            token = tokens[index]
+            kind = token.type
+            if kind == "heading_open":
+                heading = self.add_paragraph(f"Heading {min(int(token.tag[1:]), 9)}")
+                self.add_inline(heading, tokens[index + 1].children)
+                index += 2
+            elif kind == "paragraph_open":
+                self.add_inline(self.new_paragraph(), tokens[index + 1].children)
+                index += 2
+            elif kind in ("bullet_list_open", "ordered_list_open"):
+                self.open_list(token)
+            elif kind in ("bullet_list_close", "ordered_list_close"):
+                self.lists.pop()
+            elif kind == "list_item_open":
+                self.lists[-1]["item_started"] = False
+            elif kind == "blockquote_open":
+                self.quote_depth += 1
+            elif kind == "blockquote_close":
+                self.quote_depth -= 1
+            elif kind in ("fence", "code_block"):
+                self.add_code(token.content)
+            elif kind == "hr":
+                self.add_rule()
+            elif kind == "table_open":
+                index = self.add_table(tokens, index)
+            elif kind == "html_block":
+                raise UnsupportedMarkdown("raw HTML block")
+            index += 1
+
+    def open_list(self, token):
+        ordered = token.type == "ordered_list_open"
+        level = min(len(self.lists) + 1, MAX_LIST_LEVEL)
+        style = ("List Number" if ordered else "List Bullet") + (f" {level}" if level > 1 else "")
+        num_id = None
+        if ordered:
+            # Every ordered list restarts its numbering at its own start value
+            num_id = self.restart_numbering(style, int(token.attrGet("start") or 1))
+        self.lists.append({"style": style, "num_id": num_id, "level": level, "item_started": False})
+
+    def restart_numbering(self, style: str, start: int):
+        numbering = self.document.part.numbering_part.element
+        style_num_id = self.document.styles[style].element.pPr.numPr.numId.val
+        abstract_id = numbering.num_having_numId(style_num_id).abstractNumId.val
+        num = numbering.add_num(abstract_id)
+        num.add_lvlOverride(ilvl=0).add_startOverride(start)
+        return num.numId
+
+    def new_paragraph(self):
+        if self.lists:
+            current = self.lists[-1]
+            if not current["item_started"]:
+                current["item_started"] = True
+                paragraph = self.add_paragraph(current["style"])
+                if current["num_id"] is not None:
+                    paragraph._p.get_or_add_pPr().get_or_add_numPr().get_or_add_numId().val = current["num_id"]
+                return paragraph
+            level = current["level"]
+            return self.add_paragraph("List Continue" + (f" {level}" if level > 1 else ""))
+        if self.quote_depth:
+            return self.add_paragraph("Quote")
+        return self.add_paragraph()
+
+    def add_inline(self, paragraph, children, bold: bool = False):
+        bold, italic, strike = int(bold), 0, 0
+        link = None
+        for child in children or []:
+            kind = child.type
+            if kind in ("text", "code_inline"):
+                run = paragraph.add_run(child.content)
+                # Only set formatting that is on: each property adds run properties to the XML
+                if bold:
+                    run.bold = True
+                if italic:
+                    run.italic = True
+                if strike:
+                    run.font.strike = True
+                if kind == "code_inline":
+                    run.font.name = CODE_FONT
+                if link is not None:
+                    run.font.color.rgb = LINK_COLOR
+                    run.font.underline = True
+                    link.append(run._r)
+            elif kind == "softbreak":
+                paragraph.add_run(" ")
+            elif kind == "hardbreak":
+                paragraph.add_run().add_break()
+            elif kind == "strong_open":
+                bold += 1
+            elif kind == "strong_close":
+                bold -= 1
+            elif kind == "em_open":
+                italic += 1
+            elif kind == "em_close":
+                italic -= 1
+            elif kind == "s_open":
+                strike += 1
+            elif kind == "s_close":
+                strike -= 1
+            elif kind == "link_open":
+                link = self.new_hyperlink(paragraph, child.attrGet("href") or "")
+            elif kind == "link_close":
+                link = None
+            elif kind == "html_inline" and _LINE_BREAK_TAG.match(child.content.strip()):
+                paragraph.add_run().add_break()
+            elif kind == "html_inline":
+                raise UnsupportedMarkdown(f"inline HTML {child.content!r}")
+            elif kind == "image":
+                raise UnsupportedMarkdown("image")
+
+    def new_hyperlink(self, paragraph, href: str):
+        hyperlink = OxmlElement("w:hyperlink")
+        if href.startswith("#"):
+            hyperlink.set(qn("w:anchor"), href[1:])
+        else:
+            hyperlink.set(qn("r:id"), paragraph.part.relate_to(href, RELATIONSHIP_TYPE.HYPERLINK, is_external=True))
+        paragraph._p.append(hyperlink)
+        return hyperlink
+
+    def add_code(self, code: str):
+        styles = self.document.styles
+        if CODE_STYLE not in [style.name for style in styles]:
+            style = styles.add_style(CODE_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+            style.base_style = styles["No Spacing"]
+            style.font.name = CODE_FONT
+            style.font.size = Pt(9)
+        paragraph = self.add_paragraph(CODE_STYLE)
+        lines = code.rstrip("\n").split("\n")
+        for number, line in enumerate(lines):
+            run = paragraph.add_run(line)
+            if number < len(lines) - 1:
+                run.add_break()
+
+    def add_rule(self):
+        paragraph = self.add_paragraph()
+        borders = OxmlElement("w:pBdr")
+        bottom = OxmlElement("w:bottom")
+        for name, value in (("w:val", "single"), ("w:sz", "6"), ("w:space", "1"), ("w:color", "auto")):
+            bottom.set(qn(name), value)
+        borders.append(bottom)
+        paragraph._p.get_or_add_pPr().append(borders)
+
+    def add_table(self, tokens, index) -> int:
+        # Collects the rows up to table_close, then builds the table; returns the index of table_close
+        rows = []
+        while tokens[index].type != "table_close":
+            token = tokens[index]
+            if token.type == "tr_open":
+                rows.append([])
+            elif token.type in ("th_open", "td_open"):
+                style = token.attrGet("style") or ""
+                align = style.split(":", 1)[1] if style.startswith("text-align:") else None
+                rows[-1].append((tokens[index + 1].children, align, token.type == "th_open"))
+            index += 1
+
+        columns = max(len(row) for row in rows)
+        table = self.document.add_table(rows=len(rows), cols=columns)
+        table.style = "Table Grid"
+        table.alignment = WD_TABLE_ALIGNMENT.CENTER
+        # `Table._cells` lays out the whole grid in one pass; `row.cells` would redo it for every row
+        grid = table._cells
+        for row_number, cells in enumerate(rows):
+            for column, (children, align, header) in enumerate(cells):
+                paragraph = grid[row_number * columns + column].paragraphs[0]
+                if align in _ALIGNMENTS:
+                    paragraph.alignment = _ALIGNMENTS[align]
+                self.add_inline(paragraph, children, bold=header)
+        return index
+
+
+def render_docx(markdown: str):
+    """
+    Renders markdown to a python-docx `Document` in-process.
+
+    Covers what the reports use: headings, paragraphs, bold/italic/strikethrough, inline code and code blocks,
+    links, nested bullet and numbered lists, block quotes, horizontal rules and pipe tables.
+
+    Raises:
+        UnsupportedMarkdown: For raw HTML (other than <br>) and images.
+    """
+    document = Document()
+    _Renderer(document).render(_parser.parse(markdown))
+    return document
+
+
+def markdown_to_docx(markdown: str, output_path=None):
+    """
+    Renders markdown to DOCX with the native renderer.
+
+    Args:
+        markdown (str): The markdown content.
+        output_path (str | Path, optional): Where to save the DOCX file. If omitted, the file's bytes are returned.
+
+    Returns:
+        bytes | None: The DOCX file when no `output_path` is given.
+    """
+    document = render_docx(markdown)
+    if output_path is not None:
+        document.save(str(output_path))
+        return None
+    buffer = BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def pandoc_to_docx(md_file_path, output_path):
+    """
+    Converts a Markdown file to a DOCX file using Pandoc.
+
+    Raises:
+        RuntimeError: If Pandoc conversion fails or Pandoc is not installed.
+        OSError: If file operations encounter permission or path issues.
+    """
+    import pypandoc
+
+    try:
+        pypandoc.convert_file(str(md_file_path), "docx", outputfile=str(output_path))
+    except RuntimeError as e:
+        raise RuntimeError(f"Pandoc conversion failed: {str(e)}")
+    except OSError as e:
+        raise OSError(f"File operation failed: {str(e)}")
+
+
+def convert_markdown_file(md_file_path, output_path) -> str:
+    """
+    Converts a Markdown file to DOCX, in-process when possible.
+
+    The native renderer is used unless DOCX_RENDERER=pandoc; markdown it does not support is converted with
+    pandoc instead.
+
+    Args:
+        md_file_path (str | Path): Path to the input Markdown file.
+        output_path (str | Path): Path where the DOCX file will be saved.
+
+    Returns:
+        str: The renderer that produced the file, "native" or "pandoc".
+
+    Raises:
+        RuntimeError: If the pandoc conversion fails.
+        OSError: If file operations encounter permission or path issues.
+    """
+    with span("conversion", "docx") as trace:
+        if DOCX_RENDERER != "pandoc":
+            with open(md_file_path, "r", encoding="utf-8") as f:
+                markdown = f.read()
+            try:
+                markdown_to_docx(markdown, output_path)
+                _count("native")
+                trace.set(renderer="native")
+                return "native"
+            except UnsupportedMarkdown as e:
+                logger.warning("Native DOCX renderer does not support %s; converting %s with pandoc", e, md_file_path)
+                _count("fallbacks")
+                trace.set(fallback=str(e))
+        trace.set(renderer="pandoc")
+        pandoc_to_docx(md_file_path, output_path)
+        _count("pandoc")
+        return "pandoc"
+
+
+if __name__ == "__main__":
+    # Re-exports markdown reports: python docx_writer.py ../reports/*.md
+    import sys
+
+    for path in sys.argv[1:]:
+        docx_path = os.path.splitext(path)[0] + ".docx"
+        print(f"{convert_markdown_file(path, docx_path)}: {docx_path}")
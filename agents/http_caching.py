@@ -0,0 +1,211 @@
+import gzip
+import os
+import threading
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from urllib.parse import quote
+from starlette.responses import FileResponse, Response
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; responses fall back to gzip without it
+    brotli = None
+
+# Cache-Control for files whose URL changes whenever their content does (content-addressed narrations)
+IMMUTABLE = "public, max-age=31536000, immutable"
+# Cache-Control for files that may be kept but must be revalidated (answered with 304 when unchanged)
+REVALIDATE = "private, no-cache"
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+# Bodies smaller than this are sent as they are; compression would not pay for its headers
+MIN_COMPRESS_BYTES = 1024
+# Text files up to this size are compressed in memory; larger ones are streamed (with Range support) as they are
+MAX_COMPRESS_BYTES = 8 * 1024 * 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+# Compressed bodies kept per (ETag, encoding), so repeat downloads of the same file are not compressed again
+COMPRESSED_CACHE_ENTRIES = 64
+
+_compressed = OrderedDict()
+# Guards the compressed bodies and the counters; responses are built on the event loop and in worker threads
+_compressed_lock = threading.Lock()
+_counters = {"not_modified": 0, "compressed": 0, "compressed_bytes_in": 0, "compressed_bytes_out": 0}
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request_headers, etag: str = None, last_modified: str = None) -> bool:
+    """
+    Evaluates a conditional GET: True when the client's copy (If-None-Match, else If-Modified-Since) is current.
+    If-None-Match uses weak comparison, so a compressed representation's weak ETag matches too.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        tags = [_strip_weak(tag) for tag in if_none_match.split(",")]
+        return "*" in tags or _strip_weak(etag) in tags
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def not_modified(headers) -> Response:
+    """A 304 response carrying the validators and caching headers of the full response."""
+    with _compressed_lock:
+        _counters["not_modified"] += 1
+    kept = ("etag", "last-modified", "cache-control", "vary", "expires")
+    return Response(status_code=304, headers={k: v for k, v in headers.items() if k.lower() in kept})
+
+
+def choose_encoding(accept_encoding: str):
+    """Picks "br" or "gzip" from an Accept-Encoding header (honouring q=0), or None for identity."""
+    accepted = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        if name:
+            accepted[name.strip().lower()] = quality
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", accepted.get("*", 0)) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _compress_cached(body: bytes, encoding: str, etag: str = None) -> bytes:
+    if etag is None:
+        return compress(body, encoding)
+    key = (etag, encoding)
+    with _compressed_lock:
+        if key in _compressed:
+            _compressed.move_to_end(key)
+            return _compressed[key]
+    encoded = compress(body, encoding)
+    with _compressed_lock:
+        _compressed[key] = encoded
+        while len(_compressed) > COMPRESSED_CACHE_ENTRIES:
+            _compressed.popitem(last=False)
+    return encoded
+
+
+def is_compressible(media_type: str) -> bool:
+    return (media_type or "").startswith(COMPRESSIBLE_TYPES)
+
+
+def content_disposition(disposition: str, filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+
+def encoded_response(request, body: bytes, media_type: str, status_code: int = 200, headers: dict = None,
+                     etag: str = None, cache_control: str = None) -> Response:
+    """
+    Builds a response for an in-memory body: answers 304 when the client's copy matches `etag`, and compresses
+    text bodies with brotli or gzip when the client accepts it (the ETag of a compressed body is marked weak).
+
+    Args:
+        request (Request): The incoming request (for conditional and Accept-Encoding headers).
+        body (bytes): The response body.
+        media_type (str): Content type of the body.
+        status_code (int): Status of a full response.
+        headers (dict, optional): Extra headers.
+        etag (str, optional): Strong ETag (quoted) of the uncompressed body.
+        cache_control (str, optional): Cache-Control header value.
+    """
+    headers = dict(headers or {})
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if etag:
+        headers["ETag"] = etag
+    compressible = is_compressible(media_type)
+    if compressible:
+        headers["Vary"] = "Accept-Encoding"
+    if etag and status_code == 200 and is_not_modified(request.headers, etag):
+        return not_modified(headers)
+
+    encoding = choose_encoding(request.headers.get("accept-encoding")) if compressible else None
+    if encoding and len(body) >= MIN_COMPRESS_BYTES:
+        encoded = _compress_cached(body, encoding, etag)
+        with _compressed_lock:
+            _counters["compressed"] += 1
+            _counters["compressed_bytes_in"] += len(body)
+            _counters["compressed_bytes_out"] += len(encoded)
+        body = encoded
+        headers["Content-Encoding"] = encoding
+        if etag:
+            headers["ETag"] = "W/" + etag
+    return Response(content=body, status_code=status_code, media_type=media_type, headers=headers)
+
+
+def file_response(request, path, media_type: str, filename: str = None, etag: str = None,
+                  cache_control: str = REVALIDATE, disposition: str = "attachment") -> Response:
+    """
+    Serves a file with validators (ETag, Last-Modified), Cache-Control and 304 answers to conditional GETs.
+
+    Text files are compressed for clients that accept it. Other files (DOCX, MP3) are streamed with byte-range
+    support (206 Partial Content, If-Range), so audio players can seek without downloading the whole file.
+
+    Args:
+        request (Request): The incoming request.
+        path (str | Path): The file.
+        media_type (str): Content type of the file.
+        filename (str, optional): Download name for Content-Disposition.
+        etag (str, optional): Strong ETag (quoted), e.g. from a content hash; defaults to one derived from the
+            file's modification time and size.
+        cache_control (str): Cache-Control header value, e.g. `IMMUTABLE` or `REVALIDATE`.
+        disposition (str): "attachment" or "inline".
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    stat_result = os.stat(path)
+    headers = {"Cache-Control": cache_control}
+    if etag:
+        headers["ETag"] = etag
+    if is_compressible(media_type):
+        headers["Vary"] = "Accept-Encoding"
+    response = FileResponse(
+        path, media_type=media_type, filename=filename, stat_result=stat_result,
+        content_disposition_type=disposition, headers=headers,
+    )
+    if is_not_modified(request.headers, response.headers["etag"], response.headers["last-modified"]):
+        return not_modified(response.headers)
+
+    if (is_compressible(media_type) and MIN_COMPRESS_BYTES <= stat_result.st_size <= MAX_COMPRESS_BYTES
+            and choose_encoding(request.headers.get("accept-encoding"))):
+        with open(path, "rb") as f:
+            body = f.read()
+        headers = {"Last-Modified": response.headers["last-modified"]}
+        if filename:
+            headers["Content-Disposition"] = content_disposition(disposition, filename)
+        return encoded_response(
+            request, body, media_type, headers=headers, etag=response.headers["etag"], cache_control=cache_control,
+        )
+    return response
+
+
+def http_caching_stats() -> dict:
+    """Returns 304 and compression counters."""
+    with _compressed_lock:
+        return dict(_counters)
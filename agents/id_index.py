@@ -0,0 +1,256 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from query_utils import canonical_query
+
+ID_INDEX_PATH = os.getenv("CRICBUZZ_ID_INDEX_PATH", "../cache/ids.sqlite3")
+
+PLAYER = "player"
+MATCH = "match"
+KINDS = (PLAYER, MATCH)
+
+# Minimum trigram (Dice) similarity for a fuzzy match to be accepted
+MIN_SCORE = {PLAYER: 0.8, MATCH: 0.75}
+
+# Words that tell otherwise alike matches apart: years, numbers and ordinals ("2025", "4th", "t20") and stages.
+# A fuzzy match description must agree on all of them ("ipl 2024 final" must not find the 2025 final).
+MATCH_MARKERS = re.compile(r"\b\w*\d\w*\b|semi|quarter|final|qualifier|eliminator|playoff")
+
+
+def normalize_name(text: str) -> str:
+    """Lowercases, strips accents and punctuation, and collapses whitespace ("M.S. Dhoni" -> "m s dhoni")."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(char for char in text if not unicodedata.combining(char)).lower()
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split())
+
+
+def _normalize(kind: str, text: str) -> str:
+    return canonical_query(text) if kind == MATCH else normalize_name(text)
+
+
+def _markers(text: str) -> frozenset:
+    return frozenset(MATCH_MARKERS.findall(text))
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CricbuzzIDIndex:
+    """
+    Local, persistent index from player names and match descriptions to Cricbuzz IDs.
+
+    Entries live in SQLite and are mirrored in memory, with an exact-key map and a trigram index for fuzzy
+    lookups, so a lookup costs microseconds. Match keys are stored in canonical query form (aliases expanded),
+    so "RCB vs PBKS IPL 2025 final" finds "Royal Challengers Bengaluru vs Punjab Kings Indian Premier League 2025 Final".
+    A fuzzy match lookup only accepts a description with the same years, numbers and stage (`MATCH_MARKERS`).
+
+    Args:
+        path (str | Path): Location of the SQLite database file.
+    """
+
+    def __init__(self, path=ID_INDEX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS names (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                cricbuzz_id INTEGER NOT NULL,
+                label TEXT NOT NULL,
+                source TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            )
+            """
+        )
+        self.counters = {"hits": 0, "fuzzy_hits": 0, "misses": 0, "added": 0}
+        self._load()
+
+    def _load(self):
+        self._exact = {}
+        self._entries = []
+        self._postings = {kind: defaultdict(set) for kind in KINDS}
+        for kind, key, cricbuzz_id, label in self._conn.execute("SELECT kind, key, cricbuzz_id, label FROM names"):
+            self._remember(kind, key, cricbuzz_id, label)
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _remember(self, kind, key, cricbuzz_id, label):
+        trigrams = _trigrams(key)
+        existing = self._exact.get((kind, key))
+        if existing is not None:
+            self._entries[existing] = (kind, key, cricbuzz_id, label, len(trigrams))
+            return
+        self._entries.append((kind, key, cricbuzz_id, label, len(trigrams)))
+        position = len(self._entries) - 1
+        self._exact[(kind, key)] = position
+        for trigram in trigrams:
+            self._postings[kind][trigram].add(position)
+
+    def _reload_if_changed(self) -> bool:
+        # data_version changes when another connection (e.g. another uvicorn worker) wrote to the database
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return False
+        self._load()
+        return True
+
+    def add(self, kind: str, name: str, cricbuzz_id: int, aliases=(), label: str = None, source: str = "lookup"):
+        """
+        Records the Cricbuzz ID of a player or match under a name and optional aliases.
+
+        Args:
+            kind (str): "player" or "match".
+            name (str): Player name or match description.
+            cricbuzz_id (int): The Cricbuzz ID.
+            aliases (iterable, optional): Additional names resolving to the same ID (nicknames, short names).
+            label (str, optional): Display name returned by lookups. Defaults to `name`.
+            source (str): Where the mapping came from, e.g. "cricbuzz", "search" or "team".
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown ID kind: {kind}. Expected one of {', '.join(KINDS)}.")
+        label = label or name
+        keys = {_normalize(kind, text) for text in (name, *aliases) if text}
+        keys.discard("")
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO names VALUES (?, ?, ?, ?, ?, ?)",
+                [(kind, key, int(cricbuzz_id), label, source, now) for key in keys],
+            )
+            # Our own write bumps no data_version for this connection, so mirror it directly
+            for key in keys:
+                self._remember(kind, key, int(cricbuzz_id), label)
+            self.counters["added"] += len(keys)
+
+    def lookup(self, kind: str, text: str, min_score: float = None):
+        """
+        Finds the Cricbuzz ID for a player name or match description.
+
+        Args:
+            kind (str): "player" or "match".
+            text (str): The name or description to resolve.
+            min_score (float, optional): Minimum similarity in [0, 1] for a fuzzy match. Defaults per kind.
+
+        Returns:
+            dict | None: {"id", "name", "score"} for the best match, or None if nothing is similar enough.
+        """
+        key = _normalize(kind, text)
+        if not key:
+            return None
+        min_score = MIN_SCORE[kind] if min_score is None else min_score
+        with self._lock:
+            result = self._lookup(kind, key, min_score)
+            if result is None and self._reload_if_changed():
+                result = self._lookup(kind, key, min_score)
+            if result is None:
+                self.counters["misses"] += 1
+            elif result["score"] == 1.0:
+                self.counters["hits"] += 1
+            else:
+                self.counters["fuzzy_hits"] += 1
+            return result
+
+    def _lookup(self, kind, key, min_score):
+        position = self._exact.get((kind, key))
+        if position is not None:
+            _, _, cricbuzz_id, label, _ = self._entries[position]
+            return {"id": cricbuzz_id, "name": label, "score": 1.0}
+
+        query_trigrams = _trigrams(key)
+        overlap = defaultdict(int)
+        postings = self._postings[kind]
+        for trigram in query_trigrams:
+            for position in postings.get(trigram, ()):
+                overlap[position] += 1
+
+        markers = _markers(key) if kind == MATCH else None
+        best, best_score = None, 0.0
+        for position, shared in overlap.items():
+            score = 2 * shared / (len(query_trigrams) + self._entries[position][4])
+            if score > best_score and (markers is None or _markers(self._entries[position][1]) == markers):
+                best, best_score = position, score
+        if best is None or best_score < min_score:
+            return None
+        _, _, cricbuzz_id, label, _ = self._entries[best]
+        return {"id": cricbuzz_id, "name": label, "score": round(best_score, 3)}
+
+    def stats(self) -> dict:
+        """Returns lookup counters and the number of indexed names per kind."""
+        with self._lock:
+            sizes = {kind: 0 for kind in KINDS}
+            for kind, *_ in self._entries:
+                sizes[kind] += 1
+            return {**self.counters, "players": sizes[PLAYER], "matches": sizes[MATCH]}
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_id_index() -> CricbuzzIDIndex:
+    """Returns the process-wide ID index, opened on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CricbuzzIDIndex()
+    return _index
+
+
+def _match_label(info: dict):
+    team1 = (info.get("team1") or {}).get("name") or (info.get("team1") or {}).get("teamName")
+    team2 = (info.get("team2") or {}).get("name") or (info.get("team2") or {}).get("teamName")
+    if not team1 or not team2:
+        return None, ()
+    series = (info.get("series") or {}).get("name") or info.get("seriesName") or ""
+    description = info.get("matchDescription") or info.get("matchDesc") or ""
+    label = " ".join(part for part in (f"{team1} vs {team2}", series, description) if part)
+
+    aliases = []
+    short1 = (info.get("team1") or {}).get("shortName")
+    short2 = (info.get("team2") or {}).get("shortName")
+    if short1 and short2:
+        aliases.append(" ".join(part for part in (f"{short1} vs {short2}", series, description) if part))
+    start = info.get("matchStartTimestamp") or info.get("startDate")
+    if start:
+        date = datetime.fromtimestamp(int(start) / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+        aliases.append(f"{team1} vs {team2} {date}")
+    return label, aliases
+
+
+def index_payload(endpoint: str, resource_id: int, payload: dict):
+    """
+    Records the names found in a successful Cricbuzz response, so later lookups of the same player or match
+    are answered locally.
+
+    Args:
+        endpoint (str): The `cricbuzz_client.ENDPOINTS` key the payload came from.
+        resource_id (int): The player or match ID the payload was fetched for.
+        payload (dict): The decoded JSON response.
+    """
+    if not isinstance(payload, dict) or "error" in payload:
+        return
+    if endpoint == "player_search":
+        for player in payload.get("player") or []:
+            if player.get("id") and player.get("name"):
+                get_id_index().add(PLAYER, player["name"], int(player["id"]), source="search")
+    elif endpoint == "player_info" and payload.get("name"):
+        aliases = [payload["nickName"]] if payload.get("nickName") else []
+        get_id_index().add(PLAYER, payload["name"], resource_id, aliases=aliases, source="cricbuzz")
+    elif endpoint == "match_info":
+        info = payload.get("matchInfo") if isinstance(payload.get("matchInfo"), dict) else payload
+        label, aliases = _match_label(info)
+        if label:
+            get_id_index().add(MATCH, label, resource_id, aliases=aliases, source="cricbuzz")
@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from response_cache import CachePolicy, SQLiteTTLCache
+
+AUDIO_DIR = os.getenv("NARRATION_AUDIO_DIR", "audio")
+AUDIO_MAX_BYTES = int(os.getenv("NARRATION_AUDIO_MAX_MB", "512")) * 1024 * 1024
+SCRIPT_CACHE_PATH = os.getenv("NARRATION_SCRIPT_CACHE_PATH", "../cache/narration.sqlite3")
+SCRIPT_CACHE_MAX_BYTES = int(os.getenv("NARRATION_SCRIPT_CACHE_MAX_MB", "16")) * 1024 * 1024
+
+# A script only changes with the report and the model, so it is kept for a long time
+SCRIPT_POLICY = CachePolicy(ttl=30 * 86400)
+
+AUDIO_PREFIX = "narration_"
+
+
+def _digest(parts: dict) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def script_key(markdown: str, model: str) -> str:
+    """Identity of a narration script: the report content and the LLM that writes the script."""
+    return _digest({"markdown": markdown, "model": model})
+
+
+def narration_key(markdown: str, voice: str, rate: str, pitch: str, volume: str, model: str) -> str:
+    """Identity of a narration's audio: the script identity plus the voice and prosody it is spoken with."""
+    return _digest({
+        "markdown": markdown, "model": model, "voice": voice, "rate": rate, "pitch": pitch, "volume": volume,
+    })
+
+
+def audio_filename(key: str) -> str:
+    """Name of the MP3 file holding the narration with the given `narration_key`."""
+    return f"{AUDIO_PREFIX}{key}.mp3"
+
+
+class NarrationCache:
+    """
+    Two-tier, content-addressed cache of narrations.
+
+    Scripts (the LLM tier) are kept in SQLite under `script_key`, so changing only the voice or prosody reuses the
+    script. Audio files live in `audio_dir` named after `narration_key`; repeat requests return the existing file.
+    The audio directory is held under `max_bytes` by evicting the least recently used narrations (a hit refreshes
+    the file's modification time).
+
+    Args:
+        audio_dir (str | Path): Directory holding the narration MP3 files.
+        max_bytes (int): Disk quota for the narration files in `audio_dir`.
+        script_cache_path (str | Path): Location of the SQLite database for scripts.
+    """
+
+    def __init__(self, audio_dir=AUDIO_DIR, max_bytes: int = AUDIO_MAX_BYTES, script_cache_path=SCRIPT_CACHE_PATH):
+        self.audio_dir = Path(audio_dir)
+        self.audio_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.scripts = SQLiteTTLCache(script_cache_path, max_bytes=SCRIPT_CACHE_MAX_BYTES)
+        self._lock = threading.Lock()
+        self.counters = {"audio_hits": 0, "audio_misses": 0, "audio_evictions": 0, "script_hits": 0, "script_misses": 0}
+
+    def get_script(self, markdown: str, model: str):
+        """Returns the cached narration script for a report, or None."""
+        value, state = self.scripts.get("script:" + script_key(markdown, model))
+        self._count("script_hits" if state else "script_misses")
+        return value
+
+    def put_script(self, markdown: str, model: str, script: str):
+        """Stores the narration script written for a report."""
+        if script:
+            self.scripts.set("script:" + script_key(markdown, model), script, SCRIPT_POLICY)
+
+    def audio_path(self, key: str) -> Path:
+        return self.audio_dir / audio_filename(key)
+
+    def get_audio(self, key: str):
+        """
+        Looks up the narration audio for a `narration_key`.
+
+        Returns:
+            str | None: The file name inside `audio_dir`, or None if it is not cached.
+        """
+        path = self.audio_path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self._count("audio_misses")
+            return None
+        self._count("audio_hits")
+        return path.name
+
+    def put_audio(self, key: str, audio: bytes) -> str:
+        """
+        Stores narration audio under its key and enforces the disk quota.
+
+        The file is written under a temporary name and renamed into place, so readers never see a partial file.
+
+        Returns:
+            str: The file name inside `audio_dir`.
+        """
+        path = self.audio_path(key)
+        temporary = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        temporary.write_bytes(audio)
+        os.replace(temporary, path)
+        self.evict(keep=path.name)
+        return path.name
+
+    def _audio_files(self) -> list:
+        files = []
+        for path in self.audio_dir.glob(f"{AUDIO_PREFIX}*.mp3"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def evict(self, keep: str = None):
+        """Deletes least recently used narration files until the directory is within its quota."""
+        with self._lock:
+            files = sorted(self._audio_files())
+            total = sum(size for _, size, _ in files)
+            for _, size, path in files:
+                if total <= self.max_bytes:
+                    break
+                if path.name == keep:
+                    continue
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.counters["audio_evictions"] += 1
+
+    def _count(self, name: str):
+        # Lookups run on the event loop and in worker threads alike
+        with self._lock:
+            self.counters[name] += 1
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and the size of both tiers."""
+        files = self._audio_files()
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            **counters,
+            "audio_files": len(files),
+            "audio_bytes": sum(size for _, size, _ in files),
+            "audio_max_bytes": self.max_bytes,
+            "scripts": self.scripts.stats(),
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_narration_cache() -> NarrationCache:
+    """Returns the process-wide narration cache, opened on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = NarrationCache()
+    return _cache
@@ -0,0 +1,252 @@
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict, defaultdict
+from compaction import compact
+from run_context import get_run_id, on_run_end
+
+# Tool outputs longer than this (in characters) are stored and replaced by a handle
+HANDLE_MIN_CHARS = int(os.getenv("PAYLOAD_HANDLE_MIN_CHARS", "12000"))
+# Default and hard upper limit for the size of one slice
+DEFAULT_SLICE_CHARS = 8000
+MAX_SLICE_CHARS = 40000
+# Handles kept for code running outside a report job (CLI runs), oldest dropped first
+MAX_LOCAL_HANDLES = 32
+
+LOCAL_RUN = "local"
+
+# Commentary "event" values counted in handle summaries
+SUMMARY_EVENTS = {"WICKET": "wickets", "FOUR": "fours", "SIX": "sixes"}
+
+
+def _over(entry: dict):
+    try:
+        return float(entry["overNumber"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _innings(entry: dict):
+    try:
+        return int(entry["inningsId"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _ball_lists(value, path=""):
+    # Yields (path, list) for every list of dicts in the payload carrying innings or over numbers
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _ball_lists(item, f"{path}.{key}" if path else key)
+    elif isinstance(value, list):
+        if value and all(isinstance(item, dict) for item in value) and any(
+            "inningsId" in item or "overNumber" in item for item in value
+        ):
+            yield path, value
+        else:
+            for item in value:
+                yield from _ball_lists(item, path)
+
+
+def summarize(payload) -> str:
+    """
+    Describes a stored payload in a few lines: per innings, the over range, number of entries and counts of
+    wickets, fours and sixes, plus the match status when present. Other payloads list their top-level sections.
+    """
+    lines = []
+    if isinstance(payload, dict):
+        status = (payload.get("matchHeader") or {}).get("status") or payload.get("status")
+        if isinstance(status, str) and status:
+            lines.append(f"status: {status}")
+
+    innings = defaultdict(lambda: {"entries": 0, "overs": [], "events": defaultdict(int)})
+    for _, entries in _ball_lists(payload):
+        for entry in entries:
+            stats = innings[_innings(entry)]
+            stats["entries"] += 1
+            over = _over(entry)
+            if over is not None:
+                stats["overs"].append(over)
+            event = str(entry.get("event") or "").upper()
+            for name, plural in SUMMARY_EVENTS.items():
+                if name in event:
+                    stats["events"][plural] += 1
+
+    for innings_id in sorted(innings, key=lambda key: (key is None, key or 0)):
+        stats = innings[innings_id]
+        parts = [f"innings {innings_id}" if innings_id is not None else "no innings"]
+        if stats["overs"]:
+            parts.append(f"overs {min(stats['overs'])}-{max(stats['overs'])}")
+        parts.append(f"{stats['entries']} entries")
+        parts.extend(f"{count} {name}" for name, count in sorted(stats["events"].items()))
+        lines.append(", ".join(parts))
+
+    if not innings and isinstance(payload, dict):
+        lines.append("sections: " + ", ".join(
+            f"{key} ({len(json.dumps(value, ensure_ascii=False))} chars)" for key, value in payload.items()
+        ))
+    return "\n".join(lines)
+
+
+def _filter(value, innings, from_over, to_over):
+    if isinstance(value, dict):
+        return {key: _filter(item, innings, from_over, to_over) for key, item in value.items()}
+    if not isinstance(value, list):
+        return value
+    if value and all(isinstance(item, dict) for item in value) and any(
+        "inningsId" in item or "overNumber" in item for item in value
+    ):
+        kept = []
+        for entry in value:
+            if innings is not None and _innings(entry) != innings:
+                continue
+            if from_over is not None or to_over is not None:
+                over = _over(entry)
+                if over is None:
+                    continue
+                if from_over is not None and int(over) < from_over:
+                    continue
+                if to_over is not None and int(over) > to_over:
+                    continue
+            kept.append(entry)
+        return kept
+    return [_filter(item, innings, from_over, to_over) for item in value]
+
+
+class PayloadStore:
+    """
+    Per-run store for large tool outputs, so team members pass a short handle instead of the full payload.
+
+    Payloads are kept per report run (see `run_context`) and released when the run ends. Handles only resolve
+    inside the run that created them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs = defaultdict(OrderedDict)
+        self._usage = defaultdict(lambda: defaultdict(int))
+        self.counters = {"stored": 0, "slices": 0, "stored_chars": 0, "served_chars": 0}
+
+    def put(self, payload, label: str) -> dict:
+        """
+        Stores a payload for the current run.
+
+        Args:
+            payload (dict | list): Decoded JSON to store.
+            label (str): What the payload is, e.g. "match_commentary:12345".
+
+        Returns:
+            dict: {"handle", "label", "chars", "summary"}.
+        """
+        entry = {
+            "handle": "pl_" + uuid.uuid4().hex[:10],
+            "label": label,
+            "chars": len(compact(payload)),
+            "summary": summarize(payload),
+            "payload": payload,
+        }
+        run_id = get_run_id() or LOCAL_RUN
+        with self._lock:
+            handles = self._runs[run_id]
+            handles[entry["handle"]] = entry
+            if run_id == LOCAL_RUN:
+                while len(handles) > MAX_LOCAL_HANDLES:
+                    handles.popitem(last=False)
+            self.counters["stored"] += 1
+            self.counters["stored_chars"] += entry["chars"]
+        return {key: entry[key] for key in ("handle", "label", "chars", "summary")}
+
+    def get(self, handle: str):
+        """Returns the stored entry for a handle of the current run, or None if it is unknown or released."""
+        with self._lock:
+            return self._runs.get(get_run_id() or LOCAL_RUN, {}).get(handle)
+
+    def get_slice(self, handle: str, innings: int = None, from_over: int = None, to_over: int = None,
+                  max_chars: int = DEFAULT_SLICE_CHARS):
+        """
+        Returns part of a stored payload in compact text form.
+
+        Args:
+            handle (str): Handle returned by `put`.
+            innings (int, optional): Keep only entries of this innings.
+            from_over (int, optional): Keep only balls from this over on (19.2 counts as over 19).
+            to_over (int, optional): Keep only balls up to and including this over.
+            max_chars (int): Maximum length of the returned text; longer slices are cut off with a note.
+
+        Returns:
+            str | None: The slice, or None if the handle is unknown.
+        """
+        entry = self.get(handle)
+        if entry is None:
+            return None
+        payload = entry["payload"]
+        if innings is not None or from_over is not None or to_over is not None:
+            payload = _filter(payload, innings, from_over, to_over)
+        text = compact(payload)
+        max_chars = max(0, min(max_chars, MAX_SLICE_CHARS))
+        if len(text) > max_chars:
+            cut = text.rfind("\n", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            text = f"{text[:cut]}\n[truncated: {len(text) - cut} more characters; request a narrower slice]"
+        with self._lock:
+            self.counters["slices"] += 1
+            self.counters["served_chars"] += len(text)
+        return text
+
+    def remaining_budget(self, member: str, budget: int) -> int:
+        """Returns how many characters of slices `member` may still read in the current run."""
+        with self._lock:
+            used = self._usage.get(get_run_id() or LOCAL_RUN, {}).get(member, 0)
+        return max(0, budget - used)
+
+    def charge(self, member: str, chars: int):
+        """Records that `member` read `chars` characters of slices in the current run."""
+        with self._lock:
+            self._usage[get_run_id() or LOCAL_RUN][member] += chars
+
+    def release_run(self, run_id: str):
+        """Drops every payload stored by a run, and its members' budget usage."""
+        with self._lock:
+            self._runs.pop(run_id, None)
+            self._usage.pop(run_id, None)
+
+    def stats(self) -> dict:
+        """Returns store/slice counters and the number of runs and handles currently held."""
+        with self._lock:
+            return {
+                **self.counters,
+                "runs": len(self._runs),
+                "handles": sum(len(handles) for handles in self._runs.values()),
+            }
+
+
+payload_store = PayloadStore()
+on_run_end(payload_store.release_run)
+
+
+def describe_handle(reference: dict) -> str:
+    """Formats the text a tool returns in place of a stored payload."""
+    return (
+        f"[payload handle {reference['handle']}: {reference['label']}, {reference['chars']} characters]\n"
+        f"{reference['summary']}\n"
+        f"Pass this handle on unchanged; read parts of it with read_payload(handle, innings, from_over, to_over)."
+    )
+
+
+def offload_if_large(payload, text, label: str):
+    """
+    Returns the model-facing form of a tool output: `text` itself when it is small, otherwise a handle to the
+    payload stored for the current run, with a short summary.
+
+    Args:
+        payload (dict | list): The decoded JSON the text was produced from.
+        text (str | dict | list): What the tool would return otherwise (compact text, or raw JSON).
+        label (str): What the payload is, e.g. "match_commentary:12345".
+    """
+    if isinstance(payload, dict) and "error" in payload:
+        return text
+    size = len(text) if isinstance(text, str) else len(json.dumps(text, ensure_ascii=False))
+    if size < HANDLE_MIN_CHARS:
+        return text
+    return describe_handle(payload_store.put(payload, label))
@@ -0,0 +1,88 @@
+import re
+import unicodedata
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalizes a report query so that trivially different phrasings of the same request compare equal.
+
+    Applies Unicode NFKC normalization, lowercases, collapses whitespace and strips surrounding punctuation.
+
+    Args:
+        query (str): The raw user query.
+
+    Returns:
+        str: The normalized query.
+
+    Example:
+        >>> normalize_query("  Give me a report on   IPL 2025 Final!! ")
+        'give me a report on ipl 2025 final'
+    """
+    text = unicodedata.normalize("NFKC", query).lower()
+    text = re.sub(r"\s+", " ", text)
+    return text.strip(" .,!?;:'\"")
+
+
+# Abbreviations and spelling variants -> canonical wording
+QUERY_ALIASES = {
+    "rcb": "royal challengers bengaluru",
+    "royal challengers bangalore": "royal challengers bengaluru",
+    "pbks": "punjab kings",
+    "kxip": "punjab kings",
+    "kings xi punjab": "punjab kings",
+    "csk": "chennai super kings",
+    "mi": "mumbai indians",
+    "kkr": "kolkata knight riders",
+    "srh": "sunrisers hyderabad",
+    "dc": "delhi capitals",
+    "rr": "rajasthan royals",
+    "lsg": "lucknow super giants",
+    "gt": "gujarat titans",
+    "ipl": "indian premier league",
+    "wc": "world cup",
+    "ind": "india",
+    "aus": "australia",
+    "eng": "england",
+    "pak": "pakistan",
+    "nz": "new zealand",
+    "sa": "south africa",
+    "sl": "sri lanka",
+    "wi": "west indies",
+    "versus": "vs",
+    "v": "vs",
+    "finals": "final",
+    "stats": "statistics",
+    "batsmen": "batters",
+    "batsman": "batter",
+    "t20is": "t20i",
+    "odis": "odi",
+    "tests": "test",
+}
+
+# Request phrasing that does not change what report is produced
+QUERY_FILLER_WORDS = {
+    "please", "give", "me", "generate", "create", "write", "make", "show", "get", "prepare",
+    "a", "an", "the", "on", "of", "about", "for", "report", "detailed", "full", "complete",
+}
+
+_ALIAS_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(alias) for alias in sorted(QUERY_ALIASES, key=len, reverse=True)) + r")\b"
+)
+
+
+def canonical_query(query: str) -> str:
+    """
+    Reduces a report query to a canonical key: normalized, with known aliases expanded and filler words removed.
+
+    Used to recognise repeated requests for the same report, e.g. "Give me a report on RCB vs PBKS IPL 2025 finals"
+    and "rcb v pbks ipl 2025 final report" map to the same key.
+
+    Args:
+        query (str): The raw user query.
+
+    Returns:
+        str: The canonical key.
+    """
+    text = re.sub(r"[^\w\s]", " ", normalize_query(query))
+    text = _ALIAS_PATTERN.sub(lambda match: QUERY_ALIASES[match.group(1)], text)
+    return " ".join(word for word in text.split() if word not in QUERY_FILLER_WORDS)
@@ -0,0 +1,292 @@
+import asyncio
+import contextvars
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+RATE_LIMIT_ENABLED = os.getenv("CRICBUZZ_RATE_LIMIT", "1") != "0"
+RATE_LIMIT_PATH = os.getenv("CRICBUZZ_RATE_LIMIT_PATH", "../cache/ratelimit.sqlite3")
+# Sustained requests per second per host, and the burst allowed on top of it
+RATE_PER_SECOND = float(os.getenv("CRICBUZZ_RATE_PER_SECOND", "5"))
+BURST = float(os.getenv("CRICBUZZ_RATE_BURST", "10"))
+# Requests per UTC day per host (the RapidAPI plan quota); 0 means unlimited
+DAILY_QUOTA = int(os.getenv("CRICBUZZ_DAILY_QUOTA", "0"))
+# Longest a request queues for a token before giving up
+MAX_WAIT_SECONDS = float(os.getenv("CRICBUZZ_RATE_MAX_WAIT", "60"))
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+# Share of the bucket and of the daily quota that batch work may not touch, kept for interactive requests
+BATCH_BUCKET_RESERVE = 0.3
+BATCH_QUOTA_RESERVE = 0.1
+
+# Wait after a 429 without a usable Retry-After header
+DEFAULT_RETRY_AFTER = 2.0
+
+current_priority = contextvars.ContextVar("current_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority_scope(priority: str):
+    """Runs the `with` block (and threads started from it with a copied context) at the given priority."""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority: {priority}. Expected one of {', '.join(PRIORITIES)}.")
+    token = current_priority.set(priority)
+    try:
+        yield priority
+    finally:
+        current_priority.reset(token)
+
+
+class RateLimitError(Exception):
+    """Raised when a request cannot be sent: the daily quota is used up, or no token came free in time."""
+
+
+def parse_retry_after(value) -> float:
+    """Parses a Retry-After header (seconds or an HTTP date) into seconds to wait."""
+    if not value:
+        return DEFAULT_RETRY_AFTER
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+
+class RateLimiter:
+    """
+    Per-host token bucket and daily quota ledger shared by every thread and process using the same database file.
+
+    Each request takes one token; tokens refill at `rate` per second up to `burst`. Batch requests leave a reserve
+    of the bucket and of the daily quota to interactive ones. After a 429 the host is blocked until its
+    Retry-After has passed, and every caller queues instead of failing.
+
+    State lives in SQLite and is updated in short `BEGIN IMMEDIATE` transactions, so several uvicorn workers
+    share one budget.
+
+    Args:
+        path (str | Path): Location of the SQLite database file.
+        rate (float): Tokens added per second.
+        burst (float): Bucket capacity.
+        daily_quota (int): Requests allowed per UTC day, 0 for unlimited.
+        max_wait (float): Longest `acquire` waits before raising `RateLimitError`.
+    """
+
+    def __init__(self, path=RATE_LIMIT_PATH, rate: float = RATE_PER_SECOND, burst: float = BURST,
+                 daily_quota: int = DAILY_QUOTA, max_wait: float = MAX_WAIT_SECONDS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.rate = rate
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS buckets (
+                host TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                blocked_until REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS quota (
+                host TEXT NOT NULL,
+                day TEXT NOT NULL,
+                used INTEGER NOT NULL,
+                PRIMARY KEY (host, day)
+            )
+            """
+        )
+        self.counters = {"granted": 0, "waited": 0, "wait_seconds": 0.0, "throttled": 0, "rejected": 0}
+
+    def _try_acquire(self, host: str, priority: str) -> float:
+        # Takes a token and returns 0, or returns how long to wait before trying again
+        now = time.time()
+        day = _today()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated_at, blocked_until FROM buckets WHERE host = ?", (host,)
+                ).fetchone()
+                tokens, updated_at, blocked_until = row if row else (self.burst, now, 0.0)
+                tokens = min(self.burst, tokens + max(0.0, now - updated_at) * self.rate)
+
+                if self.daily_quota:
+                    used = self._conn.execute(
+                        "SELECT used FROM quota WHERE host = ? AND day = ?", (host, day)
+                    ).fetchone()
+                    used = used[0] if used else 0
+                    limit = self.daily_quota * (1 - BATCH_QUOTA_RESERVE) if priority == BATCH else self.daily_quota
+                    if used >= limit:
+                        self.counters["rejected"] += 1
+                        raise RateLimitError(f"Daily request quota for {host} is used up ({used}/{self.daily_quota}).")
+
+                floor = self.burst * BATCH_BUCKET_RESERVE if priority == BATCH else 0.0
+                if blocked_until > now:
+                    wait = blocked_until - now
+                elif tokens - 1 >= floor:
+                    tokens -= 1
+                    wait = 0.0
+                    self._conn.execute(
+                        "INSERT INTO quota VALUES (?, ?, 1) ON CONFLICT (host, day) DO UPDATE SET used = used + 1",
+                        (host, day),
+                    )
+                else:
+                    wait = (floor + 1 - tokens) / self.rate
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)", (host, tokens, now, blocked_until)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            if wait == 0.0:
+                self.counters["granted"] += 1
+        return wait
+
+    def acquire(self, host: str, priority: str = None) -> float:
+        """
+        Waits until a request to `host` may be sent, and takes a token for it.
+
+        Args:
+            host (str): Host the request goes to.
+            priority (str, optional): "interactive" or "batch". Defaults to the current `priority_scope`.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            RateLimitError: If the daily quota is used up or no token came free within `max_wait`.
+        """
+        priority = priority or current_priority.get()
+        started = time.monotonic()
+        while True:
+            wait = self._try_acquire(host, priority)
+            waited = time.monotonic() - started
+            if wait == 0.0:
+                self._record_wait(waited)
+                return waited
+            if waited + wait > self.max_wait:
+                self.counters["rejected"] += 1
+                raise RateLimitError(f"Rate limit for {host}: no request slot within {self.max_wait:.0f} seconds.")
+            # Jitter spreads out callers that were woken by the same refill
+            time.sleep(wait + random.uniform(0, 0.05))
+
+    async def aacquire(self, host: str, priority: str = None) -> float:
+        """Async variant of `acquire`: waits without blocking the event loop."""
+        priority = priority or current_priority.get()
+        started = time.monotonic()
+        while True:
+            wait = await asyncio.to_thread(self._try_acquire, host, priority)
+            waited = time.monotonic() - started
+            if wait == 0.0:
+                self._record_wait(waited)
+                return waited
+            if waited + wait > self.max_wait:
+                self.counters["rejected"] += 1
+                raise RateLimitError(f"Rate limit for {host}: no request slot within {self.max_wait:.0f} seconds.")
+            await asyncio.sleep(wait + random.uniform(0, 0.05))
+
+    def _record_wait(self, waited: float):
+        if waited > 0.001:
+            with self._lock:
+                self.counters["waited"] += 1
+                self.counters["wait_seconds"] += waited
+
+    def block(self, host: str, seconds: float):
+        """
+        Stops all requests to `host` for `seconds`, e.g. after a 429 with Retry-After, and empties its bucket.
+        """
+        now = time.time()
+        with self._lock:
+            self.counters["throttled"] += 1
+            self._conn.execute(
+                """
+                INSERT INTO buckets VALUES (?, 0, ?, ?)
+                ON CONFLICT (host) DO UPDATE SET tokens = 0, updated_at = excluded.updated_at,
+                    blocked_until = MAX(blocked_until, excluded.blocked_until)
+                """,
+                (host, now, now + seconds),
+            )
+
+    def sync_quota(self, host: str, remaining):
+        """
+        Aligns today's ledger with the quota the API reports as remaining (e.g. RapidAPI's
+        x-ratelimit-requests-remaining header), so other clients of the same key are accounted for.
+        """
+        if not self.daily_quota or remaining is None:
+            return
+        try:
+            used = self.daily_quota - int(remaining)
+        except ValueError:
+            return
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO quota VALUES (?, ?, ?)
+                ON CONFLICT (host, day) DO UPDATE SET used = MAX(used, excluded.used)
+                """,
+                (host, _today(), used),
+            )
+
+    def stats(self) -> dict:
+        """Returns counters plus, per host, the tokens left, block state and requests used today."""
+        now = time.time()
+        with self._lock:
+            buckets = self._conn.execute("SELECT host, tokens, updated_at, blocked_until FROM buckets").fetchall()
+            used = dict(self._conn.execute("SELECT host, used FROM quota WHERE day = ?", (_today(),)).fetchall())
+            counters = dict(self.counters)
+        counters["wait_seconds"] = round(counters["wait_seconds"], 3)
+        return {
+            **counters,
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "daily_quota": self.daily_quota or None,
+            "hosts": {
+                host: {
+                    "tokens": round(min(self.burst, tokens + max(0.0, now - updated_at) * self.rate), 2),
+                    "blocked_for": round(max(0.0, blocked_until - now), 2),
+                    "used_today": used.get(host, 0),
+                }
+                for host, tokens, updated_at, blocked_until in buckets
+            },
+        }
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Returns the process-wide rate limiter, or None when disabled with CRICBUZZ_RATE_LIMIT=0."""
+    global _limiter
+    if not RATE_LIMIT_ENABLED:
+        return None
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
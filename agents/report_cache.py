@@ -0,0 +1,93 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from response_cache import CachePolicy, SQLiteTTLCache
+from query_utils import canonical_query
+
+REPORT_CACHE_ENABLED = os.getenv("REPORT_CACHE", "1") != "0"
+REPORT_CACHE_PATH = os.getenv("REPORT_CACHE_PATH", "../cache/reports.sqlite3")
+REPORT_CACHE_TTL = float(os.getenv("REPORT_CACHE_TTL_HOURS", "12")) * 3600
+REPORT_CACHE_MAX_BYTES = int(os.getenv("REPORT_CACHE_MAX_MB", "64")) * 1024 * 1024
+
+
+class ReportCache:
+    """
+    Cache of finished reports keyed by the canonical form of the query (see `query_utils.canonical_query`).
+
+    Reports are served from the cache within a freshness window and evicted least-recently-used first once the
+    size cap is reached.
+
+    Args:
+        path (str | Path): Location of the SQLite database file.
+        ttl_seconds (float): Freshness window; older reports are regenerated.
+        max_bytes (int): Size cap for the stored reports.
+    """
+
+    def __init__(self, path=REPORT_CACHE_PATH, ttl_seconds: float = REPORT_CACHE_TTL, max_bytes: int = REPORT_CACHE_MAX_BYTES):
+        self.policy = CachePolicy(ttl=ttl_seconds)
+        self._store = SQLiteTTLCache(path, max_bytes=max_bytes)
+
+    @staticmethod
+    def key(query: str) -> str:
+        return "report:" + canonical_query(query)
+
+    def get(self, query: str):
+        """
+        Looks up a fresh report for a query.
+
+        Args:
+            query (str): The raw user query.
+
+        Returns:
+            dict | None: {"query", "markdown", "html", "created_at", "report_id"}, or None on a miss.
+        """
+        value, state = self._store.get(self.key(query))
+        return json.loads(value) if state == "fresh" else None
+
+    async def aget(self, query: str):
+        """Async variant of `get`: the SQLite lookup runs in a worker thread."""
+        return await asyncio.to_thread(self.get, query)
+
+    def put(self, query: str, markdown_content: str, html: str, report_id: str = None):
+        """
+        Stores a finished report.
+
+        Args:
+            query (str): The raw user query the report was generated for.
+            markdown_content (str): The generated markdown.
+            html (str): The rendered HTML page.
+            report_id (str, optional): ID of the report's stored files (see `artifact_store`).
+        """
+        if not markdown_content:
+            return
+        entry = {
+            "query": query, "markdown": markdown_content, "html": html, "created_at": time.time(),
+            "report_id": report_id,
+        }
+        self._store.set(self.key(query), json.dumps(entry), self.policy)
+
+    def invalidate(self, query: str):
+        """Drops the cached report for a query, if any."""
+        self._store.delete(self.key(query))
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and size of the report cache."""
+        return self._store.stats()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_report_cache():
+    """Returns the process-wide report cache, opened on first use, or None if REPORT_CACHE=0."""
+    global _cache
+    if not REPORT_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ReportCache()
+    return _cache
@@ -0,0 +1,335 @@
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from run_context import run_scope
+from rate_limiter import priority_scope, INTERACTIVE
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class ReportJob:
+    """
+    A single report generation request tracked by `ReportJobQueue`.
+
+    Attributes:
+        id (str): Job ID returned to the client.
+        query (str): The user's report query.
+        status (str): One of "queued", "running", "succeeded", "failed" or "cancelled".
+        result (str | None): The generated markdown once the job succeeded.
+        error (str | None): The failure message once the job failed.
+        key (str | None): Coalescing key; identical in-flight submissions share this job.
+        priority (str): Rate-limiter priority of the job's API calls, "interactive" or "batch".
+        report_id (str): ID under which the report's files are stored (see `artifact_store`): the job's own ID,
+            or that of the job which originally generated a report served from the cache.
+    """
+
+    def __init__(self, query: str, key: str = None, priority: str = INTERACTIVE):
+        self.id = uuid.uuid4().hex
+        self.query = query
+        self.key = key
+        self.priority = priority
+        self.report_id = self.id
+        self.events = []
+        self._listeners = []
+        self._events_lock = threading.Lock()
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.cancel_requested = False
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+
+    @property
+    def queue_seconds(self):
+        if self.started_at is None:
+            return None
+        return round(self.started_at - self.submitted_at, 3)
+
+    @property
+    def run_seconds(self):
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return round(self.finished_at - self.started_at, 3)
+
+    def subscribe(self, listener):
+        """
+        Registers a progress listener `listener(event, data)`. Events emitted so far are replayed to it first,
+        so a request joining an in-flight job sees the whole stream.
+        """
+        with self._events_lock:
+            for event, data in self.events:
+                listener(event, data)
+            if self.status not in FINISHED_STATES:
+                self._listeners.append(listener)
+
+    def emit(self, event: str, data):
+        """
+        Records a progress event and forwards it to every listener. Every job reports its progress, listened to
+        or not, so a streaming request can join a job started by a plain one; the recorded events are replayed to it.
+        """
+        with self._events_lock:
+            self.events.append((event, data))
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(event, data)
+
+    def release_events(self):
+        """Drops the recorded events and listeners."""
+        with self._events_lock:
+            self.events = []
+            self._listeners = []
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "query": self.query,
+            "status": self.status,
+            "priority": self.priority,
+            "report_id": self.report_id,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queue_seconds": self.queue_seconds,
+            "run_seconds": self.run_seconds,
+        }
+
+
+class ReportJobQueue:
+    """
+    Runs report generation on a bounded pool of worker threads so the event loop never blocks on an agent run.
+
+    Args:
+        runner (callable): Function taking the query string and an `emit(event, data)` progress callback, and
+                           returning the generated markdown.
+        max_workers (int): Number of reports generated concurrently. Further jobs wait in the queue.
+        max_finished (int): Number of finished jobs kept for status and result lookups.
+    """
+
+    def __init__(self, runner, max_workers: int = 2, max_finished: int = 200):
+        self.runner = runner
+        self.max_workers = max_workers
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._active = {}
+        self._totals = {SUCCEEDED: 0, FAILED: 0, CANCELLED: 0}
+        self.coalesced = 0
+        self._run_seconds_total = 0.0
+        self._queue_seconds_total = 0.0
+        self._warmup = []
+        self._warmup_barrier = None
+
+    def submit(self, query: str, key: str = None, listener=None, priority: str = INTERACTIVE) -> ReportJob:
+        """
+        Queues a report generation and returns immediately.
+
+        If a job with the same `key` is still queued or running, no new job is started: the caller joins the
+        in-flight job and waits on its result. Cancelling a shared job cancels it for every caller.
+
+        Args:
+            query (str): The user's report query.
+            key (str, optional): Coalescing key, e.g. the normalized query. None disables coalescing.
+            listener (callable, optional): Progress listener `listener(event, data)`, also subscribed when joining
+                                           an in-flight job.
+            priority (str): "interactive" for requests someone is waiting on, "batch" for background work. Joining
+                            a queued batch job with an interactive request raises its priority.
+
+        Returns:
+            ReportJob: The queued job, or the in-flight job it was coalesced with.
+        """
+        with self._lock:
+            job = self._active.get(key) if key is not None else None
+            if job is not None:
+                self.coalesced += 1
+                if priority == INTERACTIVE:
+                    job.priority = INTERACTIVE
+            else:
+                job = ReportJob(query, key=key, priority=priority)
+                self._jobs[job.id] = job
+                if key is not None:
+                    self._active[key] = job
+                self._prune()
+                job.future = self._executor.submit(self._run, job)
+        if listener is not None:
+            job.subscribe(listener)
+        return job
+
+    def add_finished(self, query: str, result: str, report_id: str = None) -> ReportJob:
+        """
+        Records a job that is already complete, e.g. a report served from the report cache.
+
+        Args:
+            query (str): The user's report query.
+            result (str): The report markdown.
+            report_id (str, optional): ID of the report's stored files, if they belong to an earlier job.
+
+        Returns:
+            ReportJob: The succeeded job.
+        """
+        job = ReportJob(query)
+        job.report_id = report_id or job.id
+        job.started_at = job.submitted_at
+        job.result = result
+        job.future = Future()
+        job.future.set_result(None)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._finish(job, SUCCEEDED)
+        return job
+
+    def get(self, job_id: str):
+        """Returns the job with the given ID, or None if it is unknown or was pruned."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str):
+        """
+        Cancels a job. A queued job never starts; a running job is left to finish but its result is discarded.
+
+        Args:
+            job_id (str): ID of the job to cancel.
+
+        Returns:
+            ReportJob | None: The job, or None if it is unknown.
+        """
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED_STATES:
+            return job
+        job.cancel_requested = True
+        if job.future.cancel():
+            self._finish(job, CANCELLED)
+        return job
+
+    async def wait(self, job: ReportJob) -> ReportJob:
+        """
+        Waits for a job to finish without blocking the running event loop.
+
+        The job itself is shielded: if the waiting request goes away, the job keeps running.
+        """
+        try:
+            await asyncio.shield(asyncio.wrap_future(job.future))
+        except asyncio.CancelledError:
+            if not job.future.cancelled():
+                raise
+        return job
+
+    def warm_up(self, prepare) -> list:
+        """
+        Runs `prepare()` once on every worker thread (e.g. to build the thread's own agents) ahead of the first job,
+        without waiting for it. Jobs submitted meanwhile queue behind the warm-up.
+
+        Returns:
+            list[Future]: One future per worker thread.
+        """
+        # Each call holds its thread until every worker has taken one, so no thread runs `prepare` twice
+        barrier = threading.Barrier(self.max_workers)
+
+        def run():
+            barrier.wait()
+            return prepare()
+
+        with self._lock:
+            self._warmup_barrier = barrier
+            self._warmup = [self._executor.submit(run) for _ in range(self.max_workers)]
+            return list(self._warmup)
+
+    def warmup_stats(self) -> dict:
+        """Returns the state of the worker warm-up ("not started", "running" or "done") and its errors."""
+        with self._lock:
+            futures = list(self._warmup)
+        if not futures:
+            return {"warmup": "not started", "errors": []}
+        if not all(future.done() for future in futures):
+            return {"warmup": "running", "errors": []}
+        errors = [future.exception() for future in futures if not future.cancelled() and future.exception()]
+        return {"warmup": "done", "errors": [f"{type(e).__name__}: {e}" for e in errors]}
+
+    def _run(self, job: ReportJob):
+        if job.cancel_requested:
+            self._finish(job, CANCELLED)
+            return
+        job.started_at = time.time()
+        job.status = RUNNING
+        try:
+            # Per-run state (e.g. stored payloads) is keyed by the job ID and released when the run ends
+            with run_scope(job.id), priority_scope(job.priority):
+                result = self.runner(job.query, job.emit)
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, CANCELLED if job.cancel_requested else FAILED)
+            return
+        if job.cancel_requested:
+            self._finish(job, CANCELLED)
+            return
+        job.result = result
+        self._finish(job, SUCCEEDED)
+
+    def _finish(self, job: ReportJob, status: str):
+        job.finished_at = time.time()
+        job.status = status
+        # Listeners of a finished job read its result; the recorded events are no longer needed
+        job.release_events()
+        with self._lock:
+            if self._active.get(job.key) is job:
+                del self._active[job.key]
+            self._totals[status] += 1
+            if status != CANCELLED and job.run_seconds is not None:
+                self._run_seconds_total += job.run_seconds
+                self._queue_seconds_total += job.queue_seconds
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def stats(self) -> dict:
+        """
+        Returns queue depth, worker usage and aggregate timings.
+
+        Returns:
+            dict: "queue_depth", "running", "workers", per-status totals, the number of coalesced submissions and
+                  average queue/run seconds.
+        """
+        with self._lock:
+            jobs = list(self._jobs.values())
+            totals = dict(self._totals)
+            timed = totals[SUCCEEDED] + totals[FAILED]
+            run_seconds_total = self._run_seconds_total
+            queue_seconds_total = self._queue_seconds_total
+        return {
+            "queue_depth": sum(1 for job in jobs if job.status == QUEUED),
+            "running": sum(1 for job in jobs if job.status == RUNNING),
+            "workers": self.max_workers,
+            **totals,
+            "coalesced": self.coalesced,
+            "avg_queue_seconds": round(queue_seconds_total / timed, 3) if timed else None,
+            "avg_run_seconds": round(run_seconds_total / timed, 3) if timed else None,
+        }
+
+    def shutdown(self):
+        """Stops accepting jobs and cancels those still queued, so their callers see why they never ran."""
+        with self._lock:
+            queued = [job for job in self._jobs.values() if job.status == QUEUED]
+        for job in queued:
+            job.error = "Report generation was cancelled because the server is shutting down."
+            job.cancel_requested = True
+            if job.future.cancel():
+                self._finish(job, CANCELLED)
+        if self._warmup_barrier is not None:
+            # Releases warm-up calls still waiting for workers that will never take theirs
+            self._warmup_barrier.abort()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,10 +1,39 @@
 import os
 import markdown2
-from groq import Groq
-from dotenv import load_dotenv
-from datetime import datetime
+from agent_registry import load_env
 import asyncio
-import edge_tts
+import re
+import time
+from narration_cache import get_narration_cache, narration_key
+from tracing import span, record_span, record_tokens
+
+# Load environment variables once, at import
+load_env()
+
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+# Voice and prosody of the narration (an Indian English voice, e.g. en-IN-NeerjaNeural)
+NARRATION_VOICE = "en-IN-NeerjaNeural"
+TTS_RATE = "+15%"
+TTS_PITCH = "-8Hz"
+TTS_VOLUME = "+20%"
+
+# Narration is synthesized in chunks of at most this many characters, cut at paragraph or sentence boundaries
+TTS_CHUNK_CHARS = int(os.getenv("NARRATION_TTS_CHUNK_CHARS", "600"))
+# Chunks synthesized at the same time, and attempts per chunk before the narration fails
+TTS_CONCURRENCY = int(os.getenv("NARRATION_TTS_CONCURRENCY", "4"))
+TTS_ATTEMPTS = int(os.getenv("NARRATION_TTS_ATTEMPTS", "3"))
+
+# LLM writing the narration script
+NARRATION_MODEL = "llama3-70b-8192"
+# When streaming, the first chunk is kept short so playback starts as early as possible
+FIRST_STREAM_CHUNK_CHARS = 160
+
+# Async Groq client shared by every narration, created on first use. Replace it (e.g. with a local stand-in
+# exposing the same `chat.completions.create`) to run narration without network access.
+groq_client = None
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])[\"')\]]*\s+")
 
 def read_markdown_file(filepath):
     """
@@ -33,20 +62,288 @@ def read_markdown_file(filepath):
         raise IOError(f"Error reading file {filepath}: {e}")
 
 
-async def generate_edge_tts(text, voice, output_file, rate="+15%"):
-    communicate = edge_tts.Communicate(text, voice, rate=rate,pitch="-8Hz", volume="+20%")
-    await communicate.save(output_file)
+def split_narration(text, max_chars=TTS_CHUNK_CHARS):
+    """
+    Splits narration text into chunks for synthesis, at paragraph boundaries first and sentence boundaries next.
 
-async def narrate_cricket_report(markdown_report):
-    load_dotenv()
-    GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-    if not GROQ_API_KEY:
-        raise ValueError("GROQ_API_KEY not found in environment variables")
+    Consecutive sentences are packed into one chunk while it stays under `max_chars`. A single sentence longer
+    than that is cut at the last comma or space before the limit.
+
+    Args:
+        text (str): The narration.
+        max_chars (int): Maximum chunk length.
+
+    Returns:
+        list: The chunks, in reading order.
+    """
+    chunks = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        current = ""
+        for sentence in _SENTENCE_END.split(paragraph.strip()):
+            sentence = " ".join(sentence.split())
+            while len(sentence) > max_chars:
+                cut = max(sentence.rfind(", ", 0, max_chars), sentence.rfind(" ", 0, max_chars))
+                cut = cut if cut > 0 else max_chars
+                head, sentence = sentence[:cut + 1].strip(), sentence[cut + 1:].strip()
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(head)
+            if not sentence:
+                continue
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+async def edge_tts_backend(text, voice, rate=TTS_RATE, pitch=TTS_PITCH, volume=TTS_VOLUME):
+    """Synthesizes one chunk with Microsoft Edge TTS and returns the MP3 bytes."""
+    import edge_tts  # imported on first narration, not at server startup
+
+    communicate = edge_tts.Communicate(text, voice, rate=rate, pitch=pitch, volume=volume)
+    audio = bytearray()
+    async for message in communicate.stream():
+        if message["type"] == "audio":
+            audio.extend(message["data"])
+    if not audio:
+        raise RuntimeError("Edge TTS returned no audio.")
+    return bytes(audio)
+
+
+# Backend used when none is passed: async callable (text, voice, rate, pitch, volume) -> MP3 bytes.
+# Replace it (e.g. with a local stand-in) to run narration without network access.
+tts_backend = edge_tts_backend
+
+
+def _strip_id3(audio):
+    # Drops a leading ID3v2 tag so only MPEG frames end up in the middle of the stitched file
+    if audio[:3] != b"ID3" or len(audio) < 10:
+        return audio
+    size = (audio[6] << 21) | (audio[7] << 14) | (audio[8] << 7) | audio[9]
+    return audio[10 + size:]
+
+
+async def _synthesize_chunk(chunk, voice, backend, semaphore, attempts):
+    async with semaphore:
+        with span("tts", voice, chars=len(chunk)) as trace:
+            for attempt in range(1, attempts + 1):
+                trace.set(attempts=attempt)
+                try:
+                    return await backend(chunk, voice, rate=TTS_RATE, pitch=TTS_PITCH, volume=TTS_VOLUME)
+                except Exception:
+                    if attempt == attempts:
+                        raise
+                    await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+
+
+async def synthesize_chunks(chunks, voice=NARRATION_VOICE, backend=None, concurrency=TTS_CONCURRENCY, attempts=TTS_ATTEMPTS):
+    """
+    Synthesizes text chunks concurrently and returns their audio in chunk order.
+
+    At most `concurrency` chunks are synthesized at once. A failing chunk is retried on its own, with backoff,
+    up to `attempts` times; only then does the whole narration fail.
+
+    Args:
+        chunks (list): Text chunks, e.g. from `split_narration`.
+        voice (str): TTS voice name.
+        backend (callable, optional): TTS backend. Defaults to the module-level `tts_backend`.
+        concurrency (int): Maximum number of chunks in flight.
+        attempts (int): Attempts per chunk.
+
+    Returns:
+        list: MP3 bytes per chunk.
+    """
+    backend = backend or tts_backend
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    return await asyncio.gather(*(_synthesize_chunk(chunk, voice, backend, semaphore, attempts) for chunk in chunks))
+
+
+def stitch_mp3(segments):
+    """Joins MP3 segments into one stream, keeping only the first segment's ID3 tag."""
+    return b"".join(segment if i == 0 else _strip_id3(segment) for i, segment in enumerate(segments))
+
+
+class SentenceCutter:
+    """
+    Cuts streamed text into TTS chunks at sentence boundaries as it arrives.
+
+    The first chunk is released once it holds `first_chars` characters of complete sentences, later ones at half
+    of `max_chars`, so synthesis of the opening can start while the LLM is still writing the rest.
+    """
+
+    def __init__(self, first_chars=FIRST_STREAM_CHUNK_CHARS, max_chars=TTS_CHUNK_CHARS):
+        self.max_chars = max_chars
+        self._target = first_chars
+        self._buffer = ""
 
-    client = Groq(api_key=GROQ_API_KEY)
+    def feed(self, text):
+        """Adds streamed text and returns the chunks completed by it."""
+        self._buffer += text
+        chunks = []
+        while True:
+            ends = [match.end() for match in _SENTENCE_END.finditer(self._buffer)]
+            fitting = [end for end in ends if end <= self.max_chars]
+            if fitting and fitting[-1] >= self._target:
+                cut = fitting[-1]
+            elif len(self._buffer) > self.max_chars:
+                # A run-on sentence: cut at the last sentence end or space that fits
+                cut = fitting[-1] if fitting else (self._buffer.rfind(" ", 0, self.max_chars) + 1 or self.max_chars)
+            else:
+                return chunks
+            chunk = " ".join(self._buffer[:cut].split())
+            self._buffer = self._buffer[cut:]
+            self._target = self.max_chars // 2
+            if chunk:
+                chunks.append(chunk)
+
+    def flush(self):
+        """Returns whatever text is left once the stream has ended."""
+        chunks = split_narration(self._buffer, self.max_chars) if self._buffer.strip() else []
+        self._buffer = ""
+        return chunks
+
+
+def get_groq_client():
+    """Returns the shared `AsyncGroq` client, so every narration reuses its connection pool."""
+    global groq_client
+    if groq_client is None:
+        if not GROQ_API_KEY:
+            raise ValueError("GROQ_API_KEY not found in environment variables")
+        from groq import AsyncGroq  # imported on first narration, not at server startup
+
+        groq_client = AsyncGroq(api_key=GROQ_API_KEY)
+    return groq_client
+
+
+def narration_key_for(markdown_report, voice=NARRATION_VOICE):
+    """Cache key of the narration of a report with the current voice, prosody and model."""
+    return narration_key(markdown_report, voice, TTS_RATE, TTS_PITCH, TTS_VOLUME, NARRATION_MODEL)
+
+
+async def cached_narration_script(markdown_report):
+    """
+    Yields the narration script for a report: at once from the script cache, otherwise streamed from the LLM
+    and stored in the cache when complete.
+    """
+    cache = get_narration_cache()
+    script = await asyncio.to_thread(cache.get_script, markdown_report, NARRATION_MODEL)
+    if script is not None:
+        yield script
+        return
+    parts = []
+    async for text in stream_narration_script(markdown_report):
+        parts.append(text)
+        yield text
+    await asyncio.to_thread(cache.put_script, markdown_report, NARRATION_MODEL, "".join(parts).strip())
+
+
+async def stream_narration_script(markdown_report):
+    """Streams the narration script for a markdown report from Groq, yielding text as it is generated."""
+    # Timed by hand rather than with `span`: a span's context would leak into the consumer between yields
+    started = time.perf_counter()
+    usage = None
+    stream = await get_groq_client().chat.completions.create(
+        model=NARRATION_MODEL,
+        messages=[{"role": "user", "content": build_narration_prompt(markdown_report)}],
+        temperature=0.8,
+        stream=True,
+    )
+    async for chunk in stream:
+        # Groq reports token usage on the last chunk
+        usage = getattr(getattr(chunk, "x_groq", None), "usage", None) or usage
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            yield delta
+    input_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    output_tokens = getattr(usage, "completion_tokens", 0) or 0
+    record_span(
+        "llm", NARRATION_MODEL, time.perf_counter() - started, agent="narration_script",
+        input_tokens=input_tokens, output_tokens=output_tokens,
+    )
+    record_tokens(NARRATION_MODEL, input_tokens, output_tokens)
+
+
+async def narrate_streaming(markdown_report, voice=NARRATION_VOICE, backend=None, concurrency=TTS_CONCURRENCY,
+                            attempts=TTS_ATTEMPTS, script=None):
+    """
+    Streams the narration of a markdown report as MP3 segments, pipelining the LLM and TTS.
+
+    The script is streamed from the LLM and cut into sentences as it arrives. Each chunk is handed to TTS right
+    away, up to `concurrency` at a time. Segments are yielded in script order as soon as the next one is ready,
+    so the first audio is available while the rest of the script is still being written. Concatenated, the
+    segments form one playable MP3.
+
+    Args:
+        markdown_report (str): The report to narrate.
+        voice (str): TTS voice name.
+        backend (callable, optional): TTS backend. Defaults to the module-level `tts_backend`.
+        concurrency (int): Maximum number of chunks synthesized at once.
+        attempts (int): Attempts per chunk.
+        script (async iterable, optional): Source of script text. Defaults to `cached_narration_script`.
+
+    Yields:
+        bytes: MP3 segments, in order.
+    """
+    backend = backend or tts_backend
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    # Bounded, so the LLM cannot run arbitrarily far ahead of the listener
+    pending = asyncio.Queue(maxsize=max(1, concurrency))
+    script = script if script is not None else cached_narration_script(markdown_report)
+
+    # Every synthesis task started, queued or not, so none outlives the stream
+    started = []
+
+    def synthesize(chunk):
+        task = asyncio.create_task(_synthesize_chunk(chunk, voice, backend, semaphore, attempts))
+        started.append(task)
+        return task
+
+    async def produce():
+        cutter = SentenceCutter()
+        try:
+            async for text in script:
+                for chunk in cutter.feed(text):
+                    await pending.put(synthesize(chunk))
+            for chunk in cutter.flush():
+                await pending.put(synthesize(chunk))
+        except asyncio.CancelledError:
+            # The consumer is gone; waiting to queue the end marker could block forever
+            raise
+        except BaseException:
+            await pending.put(None)
+            raise
+        await pending.put(None)
+
+    producer = asyncio.create_task(produce())
+    first = True
+    try:
+        while True:
+            task = await pending.get()
+            if task is None:
+                break
+            audio = await task
+            yield audio if first else _strip_id3(audio)
+            first = False
+        # Surfaces an LLM error that ended the script early
+        await producer
+    finally:
+        producer.cancel()
+        for task in started:
+            task.cancel()
+        # Waits for the cancelled work to unwind, so no task is left pending when the stream ends
+        await asyncio.gather(producer, *started, return_exceptions=True)
+
+
+def build_narration_prompt(markdown_report):
+    """Builds the LLM prompt turning a markdown report into a spoken narration script."""
     plain_text = markdown2.markdown(markdown_report).replace("\n", " ")
 
-    prompt = f"""
+    return f"""
 You are a master of high-octane, emotionally-charged narrative speech tailored for cricket reports—whether it’s a thrilling match recap, an electrifying player performance, or a blend of both. Your mission is to transform the given markdown content into an exhilarating spoken story that brings the spirit of the game roaring to life.
 
 **Input:** A markdown content containing a cricket match report or player performance summary.
@@ -75,23 +372,49 @@ Here is the markdown content to convert into your electric narration speech:
 
 {plain_text}
 """
-    response = client.chat.completions.create(
-        model="llama3-70b-8192",
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0.8
-    )
-    narration = response.choices[0].message.content.strip()
-    # print it if needed
 
-    # Choose an Indian voice (e.g. en-IN-NeerjaNeural)
-    voice = "en-IN-NeerjaNeural"
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    audio_filename = f"cricket_narration_{timestamp}.mp3"
 
-    await generate_edge_tts(narration, voice, audio_filename)
-    return audio_filename
+async def narrate_cricket_report(markdown_report):
+    """
+    Narrates a markdown report and returns the name of the MP3 file in the narration audio directory.
+
+    Narrations are content-addressed: the same report with the same voice, prosody and model returns the
+    existing file, and a cached script is reused when only the audio is missing.
+
+    Nothing here blocks the event loop: the LLM call is async and cache and file I/O run in worker threads.
+    """
+    cache = get_narration_cache()
+    key = narration_key_for(markdown_report)
+    cached_audio = await asyncio.to_thread(cache.get_audio, key)
+    if cached_audio is not None:
+        return cached_audio
+
+    narration = await asyncio.to_thread(cache.get_script, markdown_report, NARRATION_MODEL)
+    if narration is None:
+        narration = await write_narration_script(markdown_report)
+        await asyncio.to_thread(cache.put_script, markdown_report, NARRATION_MODEL, narration)
+
+    segments = await synthesize_chunks(split_narration(narration), NARRATION_VOICE)
+    return await asyncio.to_thread(cache.put_audio, key, stitch_mp3(segments))
+
+
+async def write_narration_script(markdown_report):
+    """Has the LLM write the narration script for a markdown report."""
+    prompt = build_narration_prompt(markdown_report)
+    with span("llm", NARRATION_MODEL, agent="narration_script") as trace:
+        response = await get_groq_client().chat.completions.create(
+            model=NARRATION_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.8
+        )
+        usage = getattr(response, "usage", None)
+        input_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        output_tokens = getattr(usage, "completion_tokens", 0) or 0
+        trace.set(input_tokens=input_tokens, output_tokens=output_tokens)
+    record_tokens(NARRATION_MODEL, input_tokens, output_tokens)
+    return response.choices[0].message.content.strip()
 
 if __name__ == "__main__":
     markdown_content = read_markdown_file("../reports/Jasprit_Bumrah_Bowling_Report.md")
-    audio_file = narrate_cricket_report(markdown_content)
+    audio_file = asyncio.run(narrate_cricket_report(markdown_content))
     print(audio_file)
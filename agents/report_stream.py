@@ -0,0 +1,84 @@
+import json
+import re
+
+# Journalist team member (by name) -> report pipeline stage
+MEMBER_STAGES = {
+    "Cricbuzz ID Finding Team": "id_resolution",
+    "Cricket Data Fetcher": "data_fetch",
+    "Cricket Player Data Fetcher": "data_fetch",
+    "Cricket Web Research Specialist": "data_fetch",
+    "Elite Cricket Report Syndicate": "drafting",
+    "Cricket Report Archivist": "saving",
+}
+
+# Team tool used in coordinate mode to hand a task to a member
+DELEGATION_TOOLS = ("transfer_task_to_member", "forward_task_to_member")
+
+# Streamed event names: agno 1.x (the pinned 1.5.9) uses the plain run event names for teams too, newer versions
+# prefix them with "Team"
+TOOL_STARTED_EVENTS = ("ToolCallStarted", "TeamToolCallStarted")
+# Events carrying a piece of the leader's response
+CONTENT_EVENTS = ("RunResponse", "TeamRunResponseContent", "TeamRunResponse")
+COMPLETED_EVENTS = ("RunCompleted", "TeamRunCompleted")
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+_STAGES_BY_SLUG = {_slug(name): stage for name, stage in MEMBER_STAGES.items()}
+
+
+def stage_for_member(member_id: str):
+    """
+    Maps a member ID (as passed to the delegation tool) or member name to its pipeline stage.
+
+    Args:
+        member_id (str): Member ID or display name.
+
+    Returns:
+        str | None: "id_resolution", "data_fetch", "drafting" or "saving", or None for an unknown member.
+    """
+    return _STAGES_BY_SLUG.get(_slug(member_id or ""))
+
+
+def format_sse(event: str, data) -> str:
+    """Formats one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def run_team_streaming(team, query: str, emit) -> str:
+    """
+    Runs a team with streaming enabled and reports its progress as it happens.
+
+    `emit(event, data)` is called with ("stage", {"stage", "member"}) whenever the leader delegates to a member,
+    and with ("chunk", {"markdown"}) for every piece of the leader's response.
+
+    Args:
+        team (Team): The agno team to run.
+        query (str): The user's query.
+        emit (callable): Callback receiving (event name, JSON-serializable data).
+
+    Returns:
+        str: The complete markdown response of the team.
+    """
+    chunks = []
+    final_content = None
+    started = set()
+    for event in team.run(message=query, stream=True, stream_intermediate_steps=True):
+        name = getattr(event, "event", "")
+        if name in TOOL_STARTED_EVENTS:
+            # agno 1.x lists all tool calls of the run so far in `tools`; newer versions send the started one as `tool`
+            tools = [event.tool] if getattr(event, "tool", None) else getattr(event, "tools", None) or []
+            for tool in tools:
+                call_id = getattr(tool, "tool_call_id", None) or id(tool)
+                if getattr(tool, "tool_name", None) in DELEGATION_TOOLS and call_id not in started:
+                    started.add(call_id)
+                    member = (getattr(tool, "tool_args", None) or {}).get("member_id", "")
+                    emit("stage", {"stage": stage_for_member(member) or "delegation", "member": member})
+        elif name in CONTENT_EVENTS and isinstance(getattr(event, "content", None), str):
+            chunks.append(event.content)
+            emit("chunk", {"markdown": event.content})
+        elif name in COMPLETED_EVENTS and isinstance(getattr(event, "content", None), str):
+            final_content = event.content
+    return final_content or "".join(chunks)
@@ -0,0 +1,184 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+# Hits only mark an entry as recently used in memory; the marks are written in one batch once this many have
+# gathered, once the oldest is this many seconds old, or before evicting
+TOUCH_BATCH_SIZE = 64
+TOUCH_FLUSH_SECONDS = 30
+
+
+class CachePolicy(NamedTuple):
+    """Freshness policy for a cache entry: served as fresh for `ttl` seconds, then as stale for `stale_ttl` more."""
+    ttl: float
+    stale_ttl: float = 0
+
+
+class SQLiteTTLCache:
+    """
+    A persistent key/value cache backed by SQLite, with per-entry TTLs, a stale-while-revalidate window
+    and LRU eviction under a total size cap.
+
+    The database runs in WAL mode so several processes (e.g. uvicorn workers) can share one cache file.
+    The stored size is tracked in memory and re-read from the table only when it passes the cap, since other
+    processes add and evict entries too.
+
+    Args:
+        path (str | Path): Location of the SQLite database file. Parent directories are created if missing.
+        max_bytes (int): Size cap for the stored values. Least recently used entries are evicted beyond it.
+    """
+
+    def __init__(self, path, max_bytes: int = 256 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                fresh_until REAL NOT NULL,
+                stale_until REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+        self.counters = {"hits": 0, "stale_hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        # Keys hit since the last flush, with the time of their latest hit
+        self._touched = {}
+        self._touched_since = None
+
+    def get(self, key: str) -> tuple:
+        """
+        Looks up a key.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            tuple: (value, state) where state is "fresh" or "stale", or (None, None) on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, fresh_until, stale_until FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.counters["misses"] += 1
+                return None, None
+            value, fresh_until, stale_until = row
+            if now >= stale_until:
+                self._delete(key)
+                self.counters["misses"] += 1
+                return None, None
+            self._touch(key, now)
+            if now < fresh_until:
+                self.counters["hits"] += 1
+                return value, "fresh"
+            self.counters["stale_hits"] += 1
+            return value, "stale"
+
+    def set(self, key: str, value: str, policy: CachePolicy):
+        """
+        Stores a value under a key and evicts least recently used entries if the size cap is exceeded.
+
+        Args:
+            key (str): Cache key.
+            value (str): Serialized value to store.
+            policy (CachePolicy): Freshness policy for this entry.
+        """
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            replaced = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, value, size, now, now + policy.ttl, now + policy.ttl + policy.stale_ttl, now),
+            )
+            self._touched.pop(key, None)
+            self._bytes += size - (replaced[0] if replaced else 0)
+            self.counters["sets"] += 1
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _touch(self, key: str, now: float):
+        self._touched[key] = now
+        if self._touched_since is None:
+            self._touched_since = now
+        if len(self._touched) >= TOUCH_BATCH_SIZE or now - self._touched_since >= TOUCH_FLUSH_SECONDS:
+            self._flush_touched()
+
+    def _flush_touched(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE entries SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()],
+            )
+        self._touched = {}
+        self._touched_since = None
+
+    def _evict(self):
+        # Other processes sharing the file may have evicted already; start from the table's actual size
+        self._flush_touched()
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if self._bytes <= self.max_bytes:
+            return
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY last_access"):
+            victims.append((key,))
+            self._bytes -= size
+            if self._bytes <= self.max_bytes:
+                break
+        self._conn.executemany("DELETE FROM entries WHERE key = ?", victims)
+        self.counters["evictions"] += len(victims)
+
+    def _delete(self, key: str):
+        removed = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        if removed:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._bytes -= removed[0]
+        self._touched.pop(key, None)
+
+    def delete(self, key: str):
+        """Removes a key from the cache, if present."""
+        with self._lock:
+            self._delete(key)
+
+    def clear(self):
+        """Removes every entry from the cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._bytes = 0
+            self._touched = {}
+            self._touched_since = None
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss counters for this process along with the current entry count and size.
+
+        Returns:
+            dict: Counters plus "entries", "bytes", "max_bytes" and "hit_ratio".
+        """
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["stale_hits"] + counters["misses"]
+        counters.update(
+            entries=entries,
+            bytes=total,
+            max_bytes=self.max_bytes,
+            hit_ratio=round((counters["hits"] + counters["stale_hits"]) / lookups, 4) if lookups else 0.0,
+        )
+        return counters
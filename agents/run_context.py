@@ -0,0 +1,33 @@
+import contextvars
+from contextlib import contextmanager
+
+# ID of the report run the current code works for (the report job ID); None outside a job, e.g. in CLI runs
+current_run_id = contextvars.ContextVar("current_run_id", default=None)
+
+_run_end_hooks = []
+
+
+def get_run_id():
+    """Returns the ID of the current report run, or None outside of one."""
+    return current_run_id.get()
+
+
+def on_run_end(hook):
+    """Registers `hook(run_id)`, called when a `run_scope` exits, to release per-run state."""
+    _run_end_hooks.append(hook)
+    return hook
+
+
+@contextmanager
+def run_scope(run_id: str):
+    """
+    Marks the code inside the `with` block, and every thread started from it with a copied context,
+    as working for the report run `run_id`.
+    """
+    token = current_run_id.set(run_id)
+    try:
+        yield run_id
+    finally:
+        current_run_id.reset(token)
+        for hook in _run_end_hooks:
+            hook(run_id)
@@ -1,21 +1,43 @@
-from fastapi import FastAPI
 from fastapi.responses import HTMLResponse
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import markdown
-from SportsJournalist import SportsJournalistTeam as agent
-from Getting_IDs import Getting_ID_Team as id_agent
-from GetPlayerStats import cricket_player_agent as player_agent
-from ReportSavingAgent import get_file_path
+import SportsJournalist  # registers the journalist team; it is built on first use or by the warm-up
+from agent_registry import registry, build_agent, AGENT_WARMUP
+from tracing import span, request_scope, record_span, trace_run_response, observe_http_request, render_metrics
+from ReportSavingAgent import persist_report, report_directory, REPORT_SAVE_MODE, DIRECT
+from artifact_store import get_artifact_store, KINDS, MEDIA_TYPES
+from http_caching import encoded_response, file_response, http_caching_stats, IMMUTABLE, REVALIDATE
+from run_context import get_run_id
+from pathlib import Path
+from docx_writer import docx_stats
 import json
-import ast
-from fastapi import FastAPI, Query, HTTPException
-from fastapi.responses import FileResponse
+import logging
+from fastapi import FastAPI, Query, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 import os
-from report_narration import narrate_cricket_report
-import shutil
-from fastapi.staticfiles import StaticFiles
+from report_narration import narrate_cricket_report, narrate_streaming, narration_key_for
+from narration_cache import get_narration_cache, audio_filename, AUDIO_DIR, AUDIO_PREFIX
+import threading
+from report_jobs import ReportJobQueue, SUCCEEDED, FAILED, CANCELLED
+from report_stream import run_team_streaming, format_sse
+from query_utils import canonical_query
+from report_cache import get_report_cache
+from singleflight import SingleFlight
+import hashlib
+import time
+import uuid
+import asyncio
+import cricbuzz_client
+from id_index import get_id_index, normalize_name, PLAYER
+import re
+from compaction import compaction_stats
+from payload_store import payload_store
+from rate_limiter import BATCH
+from typing import Literal
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
@@ -26,11 +48,49 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["Content-Disposition", "X-Report-ID", "X-Report-Cache", "X-Request-ID"],
 )
 
+# Client-supplied request IDs are kept only if they are short and plain, since they end up in the trace log
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """
+    Gives every request an ID (the client's X-Request-ID, or a new one) that its trace spans are tied to, returns
+    it in the X-Request-ID header, and records the request's duration by route.
+    """
+    request_id = request.headers.get("x-request-id")
+    if not request_id or not REQUEST_ID_PATTERN.match(request_id):
+        request_id = None
+    with request_scope(request_id) as request_id:
+        started = time.perf_counter()
+        response = None
+        try:
+            response = await call_next(request)
+            return response
+        finally:
+            duration = time.perf_counter() - started
+            status = response.status_code if response is not None else 500
+            route = getattr(request.scope.get("route"), "path", "unmatched")
+            observe_http_request(request.method, route, status, duration)
+            report_id = response.headers.get("X-Report-ID") if response is not None else None
+            # The report ID links the request to the spans of the job that generated its report
+            record_span(
+                "request", f"{request.method} {route}", duration, "ok" if status < 500 else "error",
+                status_code=status, **({"report_id": report_id} if report_id else {}),
+            )
+            if response is not None:
+                response.headers["X-Request-ID"] = request_id
+
 # Define a Pydantic model to handle the JSON input
 class ReportRequest(BaseModel):
     input: str
+    bypass_cache: bool = False  # Regenerate even if a fresh cached report exists
+
+class ReportJobRequest(ReportRequest):
+    # Queued jobs are background work by default: their API calls yield to interactive requests
+    priority: Literal["interactive", "batch"] = BATCH
 
 # Basic CSS for formatting the HTML preview
 HTML_CSS = """
@@ -49,91 +109,531 @@ HTML_CSS = """
 </style>
 """
 
-@app.post("/get_report", response_class=HTMLResponse)
-async def get_report(request: ReportRequest):
+JOURNALIST_TEAM = "SportsJournalistTeam"
+
+# agno teams keep per-run state on the instance, so every report worker thread builds and keeps its own team
+_worker_state = threading.local()
+
+def get_worker_team():
+    """Returns the journalist team owned by the current worker thread, building it on the thread's first report."""
+    team = getattr(_worker_state, "team", None)
+    if team is None:
+        team = _worker_state.team = build_agent(JOURNALIST_TEAM)
+    return team
+
+def generate_report_markdown(query: str, emit=None) -> str:
+    """
+    Runs the journalist team on a query and returns the generated markdown (runs on a job worker thread).
+
+    When `emit` is given (report jobs always pass one) the team is streamed and its stages and partial markdown are
+    reported through it.
+    """
+    team = get_worker_team()
+    with span("team", JOURNALIST_TEAM, query=query):
+        if emit is None:
+            markdown_content = team.run(message=query).content
+        else:
+            markdown_content = run_team_streaming(team, query, emit)
+    # LLM calls of the leader and every member, with their token counts
+    trace_run_response(getattr(team, "run_response", None))
+    if not markdown_content:
+        return markdown_content
+    # Files are stored under the job's ID, so each report is downloaded by its own ID
+    report_id = get_run_id()
+    if REPORT_SAVE_MODE == DIRECT:
+        save_report(markdown_content, query, emit)
+    html = render_report_html(markdown_content)
+    if report_id:
+        save_report_html(report_id, html)
+    report_cache = get_report_cache()
+    if report_cache is not None:
+        report_cache.put(query, markdown_content, html, report_id)
+    return markdown_content
+
+def save_report(markdown_content: str, query: str, emit=None):
+    """Saves the finished report as .md/.docx without an LLM; a failed save is logged and does not fail the report."""
+    if emit is not None:
+        emit("stage", {"stage": "saving", "member": "persist_report"})
     try:
-        # Assuming agent.run returns a markdown string
-        markdown_content = agent.run(message=request.input).content
-        if not markdown_content:
-            return HTMLResponse(
-                content="<h1>Error</h1><p>No report generated. Please check your input or try again.</p>",
-                status_code=400
-            )
-        
-        # Convert markdown to HTML
+        saved = persist_report(markdown_content, query)
+        logger.info("Saved report to %s", saved["markdown_path"])
+    except (ValueError, OSError, RuntimeError):
+        logger.exception("Saving report failed")
+
+def save_report_html(report_id: str, html: str):
+    """Stores the rendered HTML page next to the report's markdown and records it as a report artifact."""
+    store = get_artifact_store()
+    markdown_file = store.get(report_id, "md")
+    path = Path(markdown_file["path"]).with_suffix(".html") if markdown_file else report_directory(report_id) / "report.html"
+    try:
+        store.write(report_id, "html", path, html.encode("utf-8"))
+    except OSError:
+        logger.exception("Saving report HTML failed for %s", report_id)
+
+def render_report_html(markdown_content: str) -> str:
+    """Converts a markdown report into the styled HTML page returned to the UI."""
+    with span("conversion", "html"):
         html_content = markdown.markdown(markdown_content, extensions=['extra', 'tables'])
-        
-        # Combine HTML with CSS
-        full_html = f"<html><head>{HTML_CSS}</head><body>{html_content}</body></html>"
-        
-        # Return HTML response
-        return HTMLResponse(content=full_html)
+    return f"<html><head>{HTML_CSS}</head><body>{html_content}</body></html>"
+
+async def cached_report(request: ReportRequest):
+    """
+    Returns the cached report entry for a request, unless caching is off or bypassed. Finished reports are served
+    again for repeated queries within the freshness window.
+    """
+    if request.bypass_cache:
+        return None
+    report_cache = await asyncio.to_thread(get_report_cache)
+    if report_cache is None:
+        return None
+    return await report_cache.aget(request.input)
+
+# Bounded pool of report generation workers
+report_jobs = ReportJobQueue(
+    generate_report_markdown,
+    max_workers=int(os.getenv("REPORT_WORKERS", "2")),
+)
+
+def html_response(request: Request, html: str, headers: dict = None, etag: str = None) -> Response:
+    """Returns a report page, compressed for clients that accept gzip or brotli."""
+    return encoded_response(
+        request, html.encode("utf-8"), "text/html; charset=utf-8", headers=headers, etag=etag,
+        cache_control=REVALIDATE if etag else "no-store",
+    )
+
+def report_job_response(request: Request, job, etag: str = None) -> Response:
+    """Builds the HTML response for a finished report job."""
+    if job.status == SUCCEEDED and job.result:
+        return html_response(request, render_report_html(job.result), headers={"X-Report-ID": job.report_id}, etag=etag)
+    if job.status == SUCCEEDED:
+        return HTMLResponse(
+            content="<h1>Error</h1><p>No report generated. Please check your input or try again.</p>",
+            status_code=400
+        )
+    if job.status == CANCELLED:
+        return HTMLResponse(content="<h1>Error</h1><p>Report generation was cancelled.</p>", status_code=409)
+    return HTMLResponse(content=f"<h1>Error</h1><p>{job.error}</p>", status_code=500)
+
+@app.post("/get_report", response_class=HTMLResponse)
+async def get_report(request: Request, body: ReportRequest):
+    try:
+        cached = await cached_report(body)
+        if cached:
+            headers = {"X-Report-Cache": "hit"}
+            if cached.get("report_id"):
+                headers["X-Report-ID"] = cached["report_id"]
+            return html_response(request, cached["html"], headers=headers)
+
+        # Generate on a worker thread so the event loop keeps serving other requests
+        job = report_jobs.submit(body.input, key=canonical_query(body.input))
+        await report_jobs.wait(job)
+        return report_job_response(request, job)
     except Exception as e:
         return HTMLResponse(
             content=f"<h1>Error</h1><p>{str(e)}</p>",
             status_code=500
         )
-    
-    
-@app.get("/download-docx")
-def download_docx():
-    filepath = get_file_path()
-    filename = os.path.basename(filepath)
-    return FileResponse(
-        path=filepath,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        filename=filename,
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+
+@app.post("/get_report/stream")
+async def stream_report(request: ReportRequest):
+    """
+    Streams report generation as server-sent events:
+    `job` (job details), `stage` (pipeline stage changes), `chunk` (partial markdown),
+    then `done` (final markdown and HTML) or `error`.
+    """
+    cached = await cached_report(request)
+    if cached:
+        job = report_jobs.add_finished(request.input, cached["markdown"], report_id=cached.get("report_id"))
+
+        async def cached_stream():
+            yield format_sse("job", job.to_dict())
+            yield format_sse("stage", {"stage": "cached", "member": None})
+            yield format_sse("done", {
+                "job_id": job.id,
+                "report_id": job.report_id,
+                "markdown": cached["markdown"],
+                "html": cached["html"],
+            })
+
+        return StreamingResponse(cached_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+
+    def emit(event, data):
+        try:
+            loop.call_soon_threadsafe(events.put_nowait, (event, data))
+        except RuntimeError:
+            pass  # Event loop already closed, nobody is listening any more
+
+    job = report_jobs.submit(request.input, key=canonical_query(request.input), listener=emit)
+    # Runs after the last emit of the worker thread, so it always arrives last
+    job.future.add_done_callback(lambda _: loop.call_soon_threadsafe(events.put_nowait, None))
+
+    async def event_stream():
+        yield format_sse("job", job.to_dict())
+        yield format_sse("stage", {"stage": "queued", "member": None})
+        while True:
+            try:
+                item = await asyncio.wait_for(events.get(), timeout=15)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if item is None:
+                break
+            yield format_sse(*item)
+
+        if job.status == SUCCEEDED and job.result:
+            yield format_sse("stage", {"stage": "rendering", "member": None})
+            yield format_sse("done", {
+                "job_id": job.id,
+                "report_id": job.report_id,
+                "markdown": job.result,
+                "html": render_report_html(job.result),
+            })
+        elif job.status == SUCCEEDED:
+            yield format_sse("error", {"job_id": job.id, "error": "No report generated. Please check your input or try again."})
+        else:
+            yield format_sse("error", {"job_id": job.id, "error": job.error or f"Report generation {job.status}."})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
+@app.post("/reports/jobs", status_code=202)
+async def submit_report_job(request: ReportJobRequest):
+    cached = await cached_report(request)
+    if cached:
+        job = report_jobs.add_finished(request.input, cached["markdown"], report_id=cached.get("report_id"))
+    else:
+        job = report_jobs.submit(request.input, key=canonical_query(request.input), priority=request.priority)
+    return {
+        **job.to_dict(),
+        "status_url": f"/reports/jobs/{job.id}",
+        "result_url": f"/reports/jobs/{job.id}/result",
+        "report_url": f"/reports/{job.report_id}",
+    }
+
+@app.get("/reports/jobs")
+async def report_jobs_stats():
+    return report_jobs.stats()
+
+@app.get("/reports/jobs/{job_id}")
+async def report_job_status(job_id: str):
+    job = report_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found.")
+    return job.to_dict()
+
+@app.get("/reports/jobs/{job_id}/result", response_class=HTMLResponse)
+async def report_job_result(request: Request, job_id: str):
+    job = report_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found.")
+    if job.status not in (SUCCEEDED, FAILED, CANCELLED):
+        raise HTTPException(status_code=409, detail=f"Report job is still {job.status}.")
+    # A finished job's page never changes, so repeat requests are answered with 304
+    return report_job_response(request, job, etag=f'"{job.id}"')
+
+@app.delete("/reports/jobs/{job_id}")
+async def cancel_report_job(job_id: str):
+    job = report_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found.")
+    return job.to_dict()
+
+# Registered after the /reports/jobs routes, which take precedence over these
+@app.get("/reports/{report_id}")
+def report_artifacts(report_id: str):
+    """Lists the stored files of a report with their hashes, sizes and download URLs."""
+    artifacts = get_artifact_store().list(report_id)
+    if not artifacts:
+        raise HTTPException(status_code=404, detail="Report not found.")
+    return {
+        "report_id": report_id,
+        "artifacts": {
+            kind: {
+                "filename": os.path.basename(artifact["path"]),
+                "sha256": artifact["sha256"],
+                "size": artifact["size"],
+                "created_at": artifact["created_at"],
+                "url": f"/reports/{report_id}/{kind}",
+            }
+            for kind, artifact in artifacts.items()
+        },
+    }
+
+@app.get("/reports/{report_id}/{kind}")
+def report_artifact(request: Request, report_id: str, kind: str):
+    """Serves one stored file of a report: md, docx, html or audio."""
+    return artifact_response(request, report_id, kind)
+
+def artifact_response(request: Request, report_id: str, kind: str) -> Response:
+    """
+    Serves a report file with its content hash as ETag (304 for a current copy), compressed when it is text,
+    and with byte ranges for audio seeking.
+    """
+    if kind not in KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown report file type. Expected one of {', '.join(KINDS)}.")
+    artifact = get_artifact_store().get(report_id, kind)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail=f"No {kind} file found for this report.")
+    try:
+        response = file_response(
+            request, artifact["path"], MEDIA_TYPES[kind],
+            filename=os.path.basename(artifact["path"]),
+            etag=f'"{artifact["sha256"]}"',
+            disposition="attachment" if kind in ("md", "docx") else "inline",
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"No {kind} file found for this report.")
+    response.headers["X-Report-ID"] = report_id
+    return response
+
+@app.get("/stats")
+def stats():
+    # A plain def: FastAPI runs it in a worker thread, since the cache stats query their SQLite stores
+    report_cache = get_report_cache()
+    return {
+        "report_jobs": report_jobs.stats(),
+        "cricbuzz_cache": cricbuzz_client.cache_stats(),
+        "cricbuzz_rate_limit": cricbuzz_client.rate_limit_stats(),
+        "report_cache": report_cache.stats() if report_cache is not None else {"enabled": False},
+        "id_index": get_id_index().stats(),
+        "narration_singleflight": narration_flights.stats(),
+        "compaction": compaction_stats(),
+        "payload_store": payload_store.stats(),
+        "narration_cache": get_narration_cache().stats(),
+        "docx": docx_stats(),
+        "artifacts": get_artifact_store().stats(),
+        "http_caching": http_caching_stats(),
+        "agents": registry.stats(),
+    }
+
+@app.on_event("startup")
+def start_agent_warmup():
+    # Every report worker builds its own journalist team (see `get_worker_team`) in the background, so startup
+    # itself does not wait for it and the first reports do not pay for it
+    if AGENT_WARMUP:
+        report_jobs.warm_up(get_worker_team)
+
+@app.get("/metrics")
+def metrics():
+    """Span, token and request metrics of this process in the Prometheus text format."""
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/health")
+def health():
+    """Liveness: the process is up and serving requests."""
+    return {"status": "ok"}
+
+@app.get("/ready")
+def ready():
+    """
+    Readiness: 200 once every report worker has built its team, 503 while the warm-up runs or if an agent could
+    not be built.
+    """
+    agents = {**registry.stats(), "workers": report_jobs.warmup_stats()}
+    if agents["workers"]["warmup"] == "running" or agents["warmup"] == "running":
+        return JSONResponse({"status": "starting", "agents": agents}, status_code=503)
+    if agents["workers"]["errors"] or not registry.ready():
+        return JSONResponse({"status": "error", "agents": agents}, status_code=503)
+    return {"status": "ready", "agents": agents}
+
+@app.on_event("shutdown")
+def shutdown_report_jobs():
+    report_jobs.shutdown()
+
+# Words around the player name in stats queries, e.g. "Virat Kohli batting stats"
+STATS_QUERY_FILLER = re.compile(r"\b(batting|bowling|statistics|stats|career|of|for|player|cricketer)\b", re.IGNORECASE)
+
+async def resolve_player(name: str):
+    """
+    Resolves a player name to a Cricbuzz player without any LLM: the local ID index first,
+    then the Cricbuzz player search endpoint (whose results are indexed for next time).
+
+    Returns:
+        dict | None: {"id", "name"} of the player, or None if no player matches.
+    """
+    name = " ".join(STATS_QUERY_FILLER.sub(" ", name).split())
+    if not name:
+        return None
+    # Opening the index and a lookup (which may reload it from SQLite) run in worker threads
+    id_index = await asyncio.to_thread(get_id_index)
+    known = await asyncio.to_thread(id_index.lookup, PLAYER, name)
+    if known:
+        return known
+
+    results = await cricbuzz_client.afetch("player_search", normalize_name(name))
+    if "error" in results:
+        raise HTTPException(status_code=502, detail=results["error"])
+    players = [player for player in results.get("player") or [] if player.get("id")]
+    if not players:
+        return None
+    wanted = normalize_name(name)
+    best = next((player for player in players if normalize_name(player.get("name", "")) == wanted), players[0])
+    return {"id": int(best["id"]), "name": best.get("name")}
+
+def json_with_etag(request: Request, payload: dict, max_age: int) -> Response:
+    """
+    Returns a JSON response with a content ETag, answering 304 when the client already has this version, and
+    compressed for clients that accept it.
+    """
+    body = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    return encoded_response(request, body, "application/json", etag=etag, cache_control=f"private, max-age={max_age}")
+
+async def player_stats_response(request: Request, query: str, section: str) -> Response:
+    """Serves the raw Cricbuzz batting or bowling table ({headers, values, seriesSpinner}) for a player name."""
+    if not query or not query.strip():
+        raise HTTPException(status_code=400, detail="Please provide a player name.")
+    player = await resolve_player(query)
+    if player is None:
+        return JSONResponse({"error": f"No Cricbuzz player found for '{query}'."}, status_code=404)
+
+    payload = await cricbuzz_client.afetch(cricbuzz_client.PLAYER_SECTIONS[section], player["id"])
+    if "error" in payload:
+        return JSONResponse(payload, status_code=502)
+    return json_with_etag(request, payload, max_age=3600)
+
+@app.post("/get_batting")
+async def get_batting(request: Request, body: ReportRequest):
+    return await player_stats_response(request, body.input, "batting")
+
+@app.get("/get_batting")
+async def get_batting_by_query(request: Request, input: str = Query(...)):
+    return await player_stats_response(request, input, "batting")
+
+@app.post("/get_bowling")
+async def get_bowling(request: Request, body: ReportRequest):
+    return await player_stats_response(request, body.input, "bowling")
+
+@app.get("/get_bowling")
+async def get_bowling_by_query(request: Request, input: str = Query(...)):
+    return await player_stats_response(request, input, "bowling")
+
+@app.get("/download-docx")
+def download_docx(request: Request, report_id: str = Query(...)):
+    # Kept for older clients; same as /reports/{report_id}/docx
+    return artifact_response(request, report_id, "docx")
+
 class SpeechResponse(BaseModel):
     text: str | None = None
     error: str | None = None
 
-# Ensure audio directory exists
-AUDIO_DIR = "audio"
+# Ensure audio directory exists (narrations are stored there under content-addressed names)
 os.makedirs(AUDIO_DIR, exist_ok=True)
 
 class MarkdownInput(BaseModel):
     content: str  # Markdown content string
+    report_id: str | None = None  # Report the narration belongs to; its audio is then listed with the report
+
+def record_narration(report_id: str, key: str):
+    """Records a finished narration as the audio artifact of a report."""
+    path = get_narration_cache().audio_path(key)
+    if path.exists():
+        get_artifact_store().record(report_id, "audio", path)
+
+# Identical narration requests in flight share one narration run
+narration_flights = SingleFlight()
+
+async def generate_and_store_narration(content: str) -> dict:
+    # The narration is written straight into the audio folder, or found there for a repeated request
+    filename = await narrate_cricket_report(content)
+
+    # Return downloadable/streamable link
+    return {
+        "audio_url": f"/audio/{filename}",
+        "filename": filename
+    }
 
 @app.post("/generate-narration-audio")
 async def generate_narration_audio(data: MarkdownInput):
     try:
-        audio_filename = await narrate_cricket_report(data.content)
-        saved_path = os.path.join(AUDIO_DIR, audio_filename)
-
-        # Move generated file to audio folder
-        if os.path.exists(audio_filename):
-            shutil.move(audio_filename, saved_path)
-        else:
-            raise FileNotFoundError("Audio file not generated.")
-
-        # Return downloadable/streamable link
-        return {
-            "audio_url": f"/audio/{audio_filename}",
-            "filename": audio_filename
-        }
+        key = narration_key_for(data.content)
+        response = await narration_flights.do(key, lambda: generate_and_store_narration(data.content))
+        if data.report_id:
+            await asyncio.to_thread(record_narration, data.report_id, key)
+        return response
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-# Serve audio files from the /audio/ path
-@app.get("/audio/{filename}", response_class=FileResponse)
-async def serve_audio_file(filename: str):
-    file_path = os.path.join(AUDIO_DIR, filename)
-    if os.path.exists(file_path):
-        return FileResponse(file_path, media_type="audio/mp3", filename=filename)
-    raise HTTPException(status_code=404, detail="Audio file not found.")
+# Narrations waiting to be streamed: session ID -> (markdown content, narration key, created at, report ID)
+NARRATION_SESSION_TTL = 300
+narration_sessions = {}
+
+@app.post("/narration/stream")
+async def start_narration_stream(data: MarkdownInput):
+    """
+    Starts a streamed narration. The returned `stream_url` is played directly by an <audio> element; the
+    complete MP3 is saved under `audio_url` once the stream has finished. A narration that already exists is
+    returned as the file itself.
+    """
+    key = narration_key_for(data.content)
+    filename = audio_filename(key)
+    response = {"audio_url": f"/audio/{filename}", "filename": filename}
+    if await asyncio.to_thread(get_narration_cache().get_audio, key) is not None:
+        if data.report_id:
+            await asyncio.to_thread(record_narration, data.report_id, key)
+        return {**response, "stream_url": response["audio_url"], "cached": True}
+
+    now = time.time()
+    for session_id, (_, _, created_at, _) in list(narration_sessions.items()):
+        if now - created_at > NARRATION_SESSION_TTL:
+            narration_sessions.pop(session_id, None)
+
+    session_id = uuid.uuid4().hex
+    narration_sessions[session_id] = (data.content, key, now, data.report_id)
+    return {**response, "stream_url": f"/narration/stream/{session_id}", "cached": False}
 
-# Path to your audio directory
-audio_dir = os.path.join(os.path.dirname(__file__), "audio")
+@app.get("/narration/stream/{session_id}")
+async def stream_narration(request: Request, session_id: str):
+    session = narration_sessions.pop(session_id, None)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Narration not found or expired.")
+    content, key, _, report_id = session
+    cache = get_narration_cache()
+    if await asyncio.to_thread(cache.get_audio, key) is not None:
+        # Generated meanwhile by another request
+        if report_id:
+            await asyncio.to_thread(record_narration, report_id, key)
+        return await asyncio.to_thread(audio_file_response, request, audio_filename(key))
 
-print(audio_dir)
+    async def audio_stream():
+        segments = []
+        async for segment in narrate_streaming(content):
+            segments.append(segment)
+            yield segment
+        await asyncio.to_thread(cache.put_audio, key, b"".join(segments))
+        if report_id:
+            await asyncio.to_thread(record_narration, report_id, key)
 
-# Serve audio files at `/audio/...`
-app.mount("/audio", StaticFiles(directory=audio_dir), name="audio")
+    return StreamingResponse(audio_stream(), media_type="audio/mpeg", headers={"Cache-Control": "no-store"})
+
+def audio_file_response(request: Request, filename: str) -> Response:
+    """
+    Serves a narration MP3 with byte ranges for seeking. Narrations are content-addressed (a new narration gets a
+    new file name), so clients may cache them indefinitely.
+    """
+    if os.path.basename(filename) != filename or filename.startswith("."):
+        raise HTTPException(status_code=404, detail="Audio file not found.")
+    try:
+        return file_response(
+            request, os.path.join(AUDIO_DIR, filename), "audio/mpeg", filename=filename,
+            cache_control=IMMUTABLE if filename.startswith(AUDIO_PREFIX) else REVALIDATE, disposition="inline",
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Audio file not found.")
+
+# Serve audio files from the /audio/ path
+@app.get("/audio/{filename}")
+def serve_audio_file(request: Request, filename: str):
+    return audio_file_response(request, filename)
 
 if __name__ == "__main__":
     import uvicorn
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     uvicorn.run(app, host="127.0.0.1", port=8000)
@@ -0,0 +1,45 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent async calls that share a key: the first caller (the leader) runs the work,
+    callers arriving while it is in flight (followers) wait for the leader's result instead of starting their own.
+
+    Only in-flight calls are shared; once the leader finishes, the next call with the same key runs again.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.counters = {"leaders": 0, "coalesced": 0}
+
+    async def do(self, key: str, fn):
+        """
+        Runs `fn()` for `key`, or waits for the in-flight run with the same key.
+
+        Args:
+            key (str): Identity of the work, e.g. a content hash.
+            fn (callable): Zero-argument function returning an awaitable.
+
+        Returns:
+            The leader's result. If the leader raised, every waiter receives the same exception.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(task)
+
+        self.counters["leaders"] += 1
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        # Shielded so a disconnecting leader does not cancel the work its followers wait on
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def stats(self) -> dict:
+        """Returns leader/coalesced counters and the number of keys currently in flight."""
+        return {**self.counters, "in_flight": len(self._inflight)}
@@ -0,0 +1,310 @@
+import re
+import numpy as np
+
+BATTING = "batting"
+BOWLING = "bowling"
+KINDS = (BATTING, BOWLING)
+
+# Aggregate over every format a player has data for
+ALL_FORMATS = "All"
+
+# Cricbuzz row header (lowercased) -> raw metric, per stats kind. Only counting stats are loaded; rates are
+# recomputed from them so every player is measured the same way.
+ROW_METRICS = {
+    BATTING: {
+        "matches": "matches", "innings": "innings", "runs": "runs", "balls": "balls",
+        "not out": "not_outs", "not outs": "not_outs", "fours": "fours", "sixes": "sixes",
+        "50s": "fifties", "100s": "hundreds", "200s": "double_hundreds", "highest": "highest", "ducks": "ducks",
+    },
+    BOWLING: {
+        "matches": "matches", "innings": "innings", "balls": "balls", "runs": "runs", "maidens": "maidens",
+        "wickets": "wickets", "4w": "four_wickets", "5w": "five_wickets", "10w": "ten_wickets",
+    },
+}
+# Raw metrics that are not summed across formats
+NON_ADDITIVE = {"highest"}
+
+# Derived metric -> (label, higher is better)
+DERIVED_METRICS = {
+    BATTING: {
+        "average": ("Avg", True),
+        "strike_rate": ("SR", True),
+        "boundary_pct": ("Boundary %", True),
+        "balls_per_boundary": ("Balls/Boundary", False),
+        "conversion_pct": ("50→100 %", True),
+        "runs_per_match": ("Runs/Match", True),
+        "runs_share_pct": ("Runs share %", True),
+    },
+    BOWLING: {
+        "average": ("Avg", False),
+        "economy": ("Econ", False),
+        "strike_rate": ("SR", False),
+        "wickets_per_match": ("Wkts/Match", True),
+        "maiden_pct": ("Maiden overs %", True),
+        "wickets_share_pct": ("Wickets share %", True),
+    },
+}
+RAW_LABELS = {
+    "matches": "M", "innings": "Inn", "runs": "Runs", "balls": "Balls", "not_outs": "NO", "fours": "4s",
+    "sixes": "6s", "fifties": "50s", "hundreds": "100s", "double_hundreds": "200s", "highest": "HS",
+    "ducks": "Ducks", "maidens": "Mdns", "wickets": "Wkts", "four_wickets": "4w", "five_wickets": "5w",
+    "ten_wickets": "10w",
+}
+# Default columns of comparison tables and default ranking metric
+TABLE_COLUMNS = {
+    BATTING: ["matches", "innings", "runs", "average", "strike_rate", "hundreds", "fifties", "boundary_pct"],
+    BOWLING: ["matches", "innings", "wickets", "average", "economy", "strike_rate", "five_wickets"],
+}
+DEFAULT_RANK_METRIC = {BATTING: "runs", BOWLING: "wickets"}
+# Minimum sample for rate-based rankings, so a two-match career does not top the table
+QUALIFIERS = {BATTING: ("innings", 10), BOWLING: ("balls", 300)}
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def _number(value) -> float:
+    # "183*" (not out highest score) -> 183.0; "-" or "" -> NaN
+    match = _NUMBER.search(str(value))
+    return float(match.group()) if match else np.nan
+
+
+def _divide(numerator, denominator, scale=1.0):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = scale * numerator / denominator
+    return np.where(np.isfinite(result), result, np.nan)
+
+
+class StatsTable:
+    """
+    Stats of several players across formats as one float array of shape (players, formats, metrics).
+
+    Missing values (a format the player never played, a malformed cell) are NaN. The last format is always
+    `ALL_FORMATS`, the players' aggregate over every format.
+
+    Attributes:
+        kind (str): "batting" or "bowling".
+        player_ids (list): Cricbuzz player IDs, one per row.
+        names (list): Display names, one per row.
+        formats (list): Format names, e.g. ["Test", "ODI", "T20", "IPL", "All"].
+        metrics (list): Raw and derived metric names, indexing the last axis.
+        values (numpy.ndarray): The data.
+    """
+
+    def __init__(self, kind, player_ids, names, formats, metrics, values):
+        self.kind = kind
+        self.player_ids = player_ids
+        self.names = names
+        self.formats = formats
+        self.metrics = metrics
+        self.values = values
+        self._metric_index = {metric: i for i, metric in enumerate(metrics)}
+
+    def column(self, metric: str) -> np.ndarray:
+        """Returns one metric for every player and format, shape (players, formats)."""
+        return self.values[:, :, self._metric_index[metric]]
+
+    def format_index(self, format_name: str) -> int:
+        """Returns the position of a format, matched case-insensitively."""
+        for i, name in enumerate(self.formats):
+            if name.lower() == format_name.lower():
+                return i
+        raise ValueError(f"Unknown format: {format_name}. Expected one of {', '.join(self.formats)}.")
+
+
+def load_tables(kind: str, payloads: list) -> StatsTable:
+    """
+    Loads Cricbuzz `headers`/`values` stats tables of many players into one `StatsTable` and computes the
+    derived metrics for every player and format at once.
+
+    Args:
+        kind (str): "batting" or "bowling".
+        payloads (list): (player ID, display name, payload) tuples; payloads are the decoded JSON of the
+                         `player_batting` or `player_bowling` endpoint. Error payloads give an all-NaN row.
+
+    Returns:
+        StatsTable: The loaded and derived stats.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown stats kind: {kind}. Expected one of {', '.join(KINDS)}.")
+    row_metrics = ROW_METRICS[kind]
+    raw_metrics = list(dict.fromkeys(row_metrics.values()))
+    raw_index = {metric: i for i, metric in enumerate(raw_metrics)}
+
+    formats = []
+    for _, _, payload in payloads:
+        for header in (payload or {}).get("headers", [])[1:]:
+            if header not in formats:
+                formats.append(header)
+
+    raw = np.full((len(payloads), len(formats) + 1, len(raw_metrics)), np.nan)
+    format_index = {name: i for i, name in enumerate(formats)}
+    for p, (_, _, payload) in enumerate(payloads):
+        if not isinstance(payload, dict) or "error" in payload:
+            continue
+        columns = [format_index[header] for header in payload.get("headers", [])[1:]]
+        for row in payload.get("values", []):
+            cells = row.get("values", []) if isinstance(row, dict) else row
+            if not cells:
+                continue
+            metric = row_metrics.get(str(cells[0]).strip().lower())
+            if metric is None:
+                continue
+            for f, cell in zip(columns, cells[1:]):
+                raw[p, f, raw_index[metric]] = _number(cell)
+
+    # Aggregate column: sums of counting stats, best of non-additive ones
+    per_format = raw[:, :-1, :]
+    played = ~np.all(np.isnan(per_format), axis=2, keepdims=True)
+    with np.errstate(invalid="ignore"):
+        raw[:, -1, :] = np.where(np.any(played, axis=1), np.nansum(per_format, axis=1), np.nan)
+    for metric in NON_ADDITIVE & set(raw_index):
+        column = per_format[:, :, raw_index[metric]]
+        has_value = ~np.all(np.isnan(column), axis=1)
+        raw[:, -1, raw_index[metric]] = np.where(has_value, np.nanmax(np.where(np.isnan(column), -np.inf, column), axis=1), np.nan)
+
+    derived = _derive(kind, {metric: raw[:, :, i] for metric, i in raw_index.items()})
+    metrics = raw_metrics + list(derived)
+    values = np.concatenate([raw, np.stack(list(derived.values()), axis=2)], axis=2)
+    return StatsTable(
+        kind,
+        [player_id for player_id, _, _ in payloads],
+        [name for _, name, _ in payloads],
+        formats + [ALL_FORMATS],
+        metrics,
+        values,
+    )
+
+
+def _derive(kind: str, m: dict) -> dict:
+    if kind == BATTING:
+        dismissals = m["innings"] - np.nan_to_num(m["not_outs"])
+        boundaries = m["fours"] + m["sixes"]
+        fifty_plus = m["fifties"] + m["hundreds"]
+        derived = {
+            "average": _divide(m["runs"], dismissals),
+            "strike_rate": _divide(m["runs"], m["balls"], 100),
+            "boundary_pct": _divide(4 * m["fours"] + 6 * m["sixes"], m["runs"], 100),
+            "balls_per_boundary": _divide(m["balls"], boundaries),
+            "conversion_pct": _divide(m["hundreds"], fifty_plus, 100),
+            "runs_per_match": _divide(m["runs"], m["matches"]),
+            "runs_share_pct": _divide(m["runs"], m["runs"][:, -1:], 100),
+        }
+    else:
+        derived = {
+            "average": _divide(m["runs"], m["wickets"]),
+            "economy": _divide(m["runs"], m["balls"], 6),
+            "strike_rate": _divide(m["balls"], m["wickets"]),
+            "wickets_per_match": _divide(m["wickets"], m["matches"]),
+            "maiden_pct": _divide(m["maidens"], m["balls"] / 6, 100),
+            "wickets_share_pct": _divide(m["wickets"], m["wickets"][:, -1:], 100),
+        }
+    return derived
+
+
+def percentiles(table: StatsTable) -> np.ndarray:
+    """
+    Computes every player's percentile for every format and metric in one pass, shape (players, formats, metrics).
+
+    100 is the best value among the players with data, taking into account whether lower is better (e.g. economy).
+    Players without a value get NaN.
+    """
+    values = table.values.copy()
+    lower_is_better = [
+        not DERIVED_METRICS[table.kind][metric][1] if metric in DERIVED_METRICS[table.kind] else False
+        for metric in table.metrics
+    ]
+    values[:, :, lower_is_better] *= -1
+    missing = np.isnan(values)
+    # NaNs sort last; the double argsort turns values into ranks along the player axis
+    ranks = np.argsort(np.argsort(np.where(missing, np.inf, values), axis=0, kind="stable"), axis=0).astype(float)
+    counts = np.sum(~missing, axis=0, keepdims=True).astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.where(counts > 1, 100 * ranks / (counts - 1), 100.0)
+    return np.where(missing, np.nan, result)
+
+
+def rank(table: StatsTable, metric: str = None, format_name: str = ALL_FORMATS, qualify: bool = True) -> list:
+    """
+    Orders the players by one metric in one format, best first.
+
+    Args:
+        table (StatsTable): Loaded stats.
+        metric (str, optional): Raw or derived metric. Defaults to runs for batting and wickets for bowling.
+        format_name (str): Format to rank in, or "All" for the aggregate.
+        qualify (bool): Leave out players below the minimum sample (innings for batting, balls for bowling)
+                        when ranking by a rate.
+
+    Returns:
+        list: Player row positions in ranking order; players without a value are left out.
+    """
+    metric = metric or DEFAULT_RANK_METRIC[table.kind]
+    if metric not in table.metrics:
+        raise ValueError(f"Unknown {table.kind} metric: {metric}. Expected one of {', '.join(table.metrics)}.")
+    f = table.format_index(format_name)
+    column = table.column(metric)[:, f]
+    higher_is_better = DERIVED_METRICS[table.kind].get(metric, (None, True))[1]
+    eligible = ~np.isnan(column)
+    if qualify and metric in DERIVED_METRICS[table.kind]:
+        qualifier, minimum = QUALIFIERS[table.kind]
+        eligible &= np.nan_to_num(table.column(qualifier)[:, f]) >= minimum
+    order = np.argsort(-column if higher_is_better else column, kind="stable")
+    return [int(p) for p in order if eligible[p]]
+
+
+def _label(kind: str, metric: str) -> str:
+    if metric in DERIVED_METRICS[kind]:
+        return DERIVED_METRICS[kind][metric][0]
+    return RAW_LABELS.get(metric, metric)
+
+
+def _format_value(value) -> str:
+    if np.isnan(value):
+        return "-"
+    return str(int(value)) if float(value).is_integer() else f"{value:.2f}"
+
+
+def to_markdown(table: StatsTable, format_name: str = ALL_FORMATS, columns: list = None, order: list = None,
+                with_percentile: str = None) -> str:
+    """
+    Renders one format of a `StatsTable` as a markdown table.
+
+    Args:
+        table (StatsTable): Loaded stats.
+        format_name (str): Format to show, or "All" for the aggregate.
+        columns (list, optional): Metrics to show. Defaults to the usual columns for the stats kind.
+        order (list, optional): Player row positions to show, in order (e.g. from `rank`). Defaults to all players.
+        with_percentile (str, optional): Metric whose percentile among the players is added as a last column.
+
+    Returns:
+        str: The markdown table.
+    """
+    f = table.format_index(format_name)
+    columns = columns or TABLE_COLUMNS[table.kind]
+    order = list(range(len(table.player_ids))) if order is None else order
+    header = ["#", "Player"] + [_label(table.kind, metric) for metric in columns]
+    if with_percentile:
+        header.append(f"{_label(table.kind, with_percentile)} pctl")
+        pctl = percentiles(table)[:, f, table.metrics.index(with_percentile)]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    indexes = [table.metrics.index(metric) for metric in columns]
+    for position, p in enumerate(order, start=1):
+        cells = [str(position), table.names[p]] + [_format_value(table.values[p, f, i]) for i in indexes]
+        if with_percentile:
+            cells.append(_format_value(round(pctl[p])) if not np.isnan(pctl[p]) else "-")
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def format_splits(table: StatsTable, player: int) -> str:
+    """Renders one player's stats in every format side by side as a markdown table."""
+    columns = TABLE_COLUMNS[table.kind]
+    header = ["Format"] + [_label(table.kind, metric) for metric in columns]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    indexes = [table.metrics.index(metric) for metric in columns]
+    matches = table.column("matches")[player]
+    for f, format_name in enumerate(table.formats):
+        row = table.values[player, f]
+        if not np.nan_to_num(matches[f]) > 0:
+            continue
+        lines.append("| " + " | ".join([format_name] + [_format_value(row[i]) for i in indexes]) + " |")
+    return "\n".join(lines)
@@ -0,0 +1,78 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+AGENTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, AGENTS_DIR)
+
+# Modules read their storage paths at import; keep test runs out of the repository's cache, audio and logs
+_workdir = tempfile.mkdtemp(prefix="sportsscribe_tests_")
+os.environ.setdefault("NARRATION_AUDIO_DIR", os.path.join(_workdir, "audio"))
+os.environ.setdefault("NARRATION_SCRIPT_CACHE_PATH", os.path.join(_workdir, "narration.sqlite3"))
+os.environ.setdefault("TRACE_LOG_PATH", os.path.join(_workdir, "logs", "trace.jsonl"))
+for _variable, _filename in (("CRICBUZZ_CACHE_PATH", "cricbuzz.sqlite3"), ("CRICBUZZ_ID_INDEX_PATH", "ids.sqlite3"),
+                             ("CRICBUZZ_RATE_LIMIT_PATH", "ratelimit.sqlite3"), ("REPORT_CACHE_PATH", "reports.sqlite3"),
+                             ("REPORT_ARTIFACT_INDEX_PATH", "artifacts.sqlite3")):
+    os.environ.setdefault(_variable, os.path.join(_workdir, "cache", _filename))
+
+
+# A two-agent coordinate team run by scripted models: the leader delegates once to the member, whose model calls
+# `fetch` (taking MEMBER_SECONDS) and answers; the leader then answers "Report done."
+MEMBER_SECONDS = 0.2
+
+
+def _leader_model(member_id: str):
+    from agno.models.response import ModelResponse
+    from benchmarks.standins import ScriptedModel
+
+    class Leader(ScriptedModel):
+        def respond(self, messages, tools):
+            if any(message.role == "tool" for message in messages):
+                return ModelResponse(role="assistant", content="Report done.")
+            arguments = json.dumps({"member_id": member_id, "task_description": "Fetch it.", "expected_output": "Data"})
+            return ModelResponse(role="assistant", tool_calls=[{
+                "id": "call_1", "type": "function",
+                "function": {"name": "transfer_task_to_member", "arguments": arguments},
+            }])
+
+    return Leader()
+
+
+def _member_model():
+    from agno.models.response import ModelResponse
+    from benchmarks.standins import ScriptedModel
+
+    class Member(ScriptedModel):
+        def respond(self, messages, tools):
+            if any(message.role == "tool" for message in messages):
+                return ModelResponse(role="assistant", content="Data.")
+            return ModelResponse(role="assistant", tool_calls=[{
+                "id": "call_2", "type": "function", "function": {"name": "fetch", "arguments": "{}"},
+            }])
+
+    return Member()
+
+
+def fetch() -> str:
+    """Fetches the data."""
+    time.sleep(MEMBER_SECONDS)
+    return "42"
+
+
+@pytest.fixture
+def desk_team():
+    """Builds the two-agent team; `tool_hooks` are attached to both agents."""
+    from agno.agent import Agent
+    from agno.team.team import Team
+    from agno.utils.string import url_safe_string
+
+    def build(member_name: str = "Fetcher", tool_hooks=()):
+        member = Agent(name=member_name, model=_member_model(), tools=[fetch], tool_hooks=list(tool_hooks))
+        return Team(name="Desk", mode="coordinate", model=_leader_model(url_safe_string(member_name)),
+                    members=[member], tool_hooks=list(tool_hooks))
+
+    return build
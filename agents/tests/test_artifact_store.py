@@ -0,0 +1,49 @@
+import hashlib
+
+import pytest
+
+from artifact_store import ArtifactStore, file_digest
+
+
+def test_writes_replace_the_file_atomically_and_record_it(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts.sqlite3")
+    path = tmp_path / "job-1" / "report.html"
+
+    store.write("job-1", "html", path, b"<h1>Draft</h1>")
+    entry = store.write("job-1", "html", path, b"<h1>Final</h1>")
+
+    assert path.read_bytes() == b"<h1>Final</h1>"
+    assert [file.name for file in path.parent.iterdir()] == ["report.html"]  # no temporary files left behind
+    assert (entry["sha256"], entry["size"]) == (hashlib.sha256(b"<h1>Final</h1>").hexdigest(), 14)
+    assert store.get("job-1", "html") == entry
+    assert store.stats()["artifacts"] == 1
+
+
+def test_recorded_files_are_hashed_and_kept_per_report(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts.sqlite3")
+    markdown = tmp_path / "report.md"
+    markdown.write_text("# Kohli", encoding="utf-8")
+
+    entry = store.record("job-1", "md", markdown)
+
+    assert (entry["sha256"], entry["size"]) == file_digest(markdown)
+    assert store.get("job-2", "md") is None
+    assert store.stats() == {"recorded": 1, "hits": 0, "misses": 1, "reports": 1, "artifacts": 1}
+
+
+def test_deleted_files_are_treated_as_missing(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts.sqlite3")
+    store.write("job-1", "md", tmp_path / "report.md", b"# Kohli")
+    audio = tmp_path / "narration.mp3"
+    store.write("job-1", "audio", audio, b"ID3")
+
+    audio.unlink()
+
+    assert store.get("job-1", "audio") is None
+    assert set(store.list("job-1")) == {"md"}
+
+
+def test_unknown_kinds_are_rejected(tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts.sqlite3")
+    with pytest.raises(ValueError):
+        store.write("job-1", "pdf", tmp_path / "report.pdf", b"%PDF")
@@ -0,0 +1,53 @@
+import compaction
+from compaction import compact, for_model
+
+
+def test_stats_tables_become_pipe_separated_rows():
+    payload = {
+        "headers": ["ROWHEADER", "Test", "ODI"],
+        "values": [{"values": ["Matches", "113", "295"]}, {"values": ["Runs", "9230", "14181"]}],
+        "seriesSpinner": [{"seriesId": 1, "seriesName": "IPL"}],
+        "appIndex": {"seoTitle": "Virat Kohli stats"},
+    }
+    assert compact(payload) == "ROWHEADER|Test|ODI\nMatches|113|295\nRuns|9230|14181"
+
+
+def test_repeated_records_become_one_table_with_a_header():
+    batters = {
+        "bat_1": {"batName": "Virat Kohli", "runs": 43, "balls": 35, "isCaptain": False},
+        "bat_2": {"batName": "Rajat Patidar", "runs": 26, "balls": 16, "isCaptain": True},
+    }
+    assert compact({"batsmenData": batters}) == (
+        "batsmenData:\n  batName|runs|balls|isCaptain\n  Virat Kohli|43|35|N\n  Rajat Patidar|26|16|Y"
+    )
+
+
+def test_noise_and_empty_fields_are_dropped_and_nesting_is_indented():
+    payload = {
+        "matchInfo": {"matchId": 1, "team1": {"name": "RCB", "imageId": 123}, "status": "", "tags": []},
+        "responseLastUpdated": 1700000000,
+    }
+    assert compact(payload) == "matchInfo:\n  matchId: 1\n  team1:\n    name: RCB"
+
+
+def test_cells_cannot_break_the_table_layout():
+    records = [{"text": "four | through cover\nagain"}, {"text": "dot"}]
+    assert compact(records) == "text\nfour / through cover again\ndot"
+
+
+def test_for_model_passes_errors_through_and_counts_tokens(monkeypatch):
+    monkeypatch.setattr(compaction, "_stats", {"payloads": 0, "raw_tokens": 0, "compact_tokens": 0})
+    error = {"error": "API request failed: 503"}
+    assert for_model(error) is error
+
+    text = for_model({"headers": ["ROWHEADER", "Test"], "values": [{"values": ["Runs", "9230"]}]})
+    assert text == "ROWHEADER|Test\nRuns|9230"
+    stats = compaction.compaction_stats()
+    assert stats["payloads"] == 1
+    assert 0 < stats["compact_tokens"] < stats["raw_tokens"]
+
+
+def test_for_model_returns_the_payload_when_compaction_is_disabled(monkeypatch):
+    monkeypatch.setattr(compaction, "COMPACT_PAYLOADS", False)
+    payload = {"headers": ["ROWHEADER"], "values": []}
+    assert for_model(payload) is payload
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+import compaction
+import cricbuzz_client
+from GetMatchDetails import CricketMatchTools
+from GetPlayerStats import CricketPlayerTool
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Replaces Cricbuzz with a fake `fetch` that records its calls and answers {"endpoint", "id"}."""
+    made = []
+
+    def fake_fetch(endpoint, resource_id, use_cache=True):
+        made.append((endpoint, resource_id))
+        return {"endpoint": endpoint, "id": resource_id}
+
+    monkeypatch.setattr(cricbuzz_client, "fetch", fake_fetch)
+    monkeypatch.setattr(compaction, "COMPACT_PAYLOADS", False)
+    return made
+
+
+def test_fetch_many_runs_calls_concurrently_and_keeps_their_order(monkeypatch):
+    def slow_fetch(endpoint, resource_id, use_cache=True):
+        time.sleep(0.2)
+        return {"id": resource_id}
+
+    monkeypatch.setattr(cricbuzz_client, "fetch", slow_fetch)
+    started = time.perf_counter()
+    results = cricbuzz_client.fetch_many([("player_info", player_id) for player_id in range(4)])
+
+    assert [result["id"] for result in results] == [0, 1, 2, 3]
+    assert time.perf_counter() - started < 0.6
+
+
+def test_player_dossier_fetches_every_section_once(calls):
+    dossier = CricketPlayerTool().get_player_dossier(1413)
+
+    assert sorted(calls) == sorted((endpoint, 1413) for endpoint in cricbuzz_client.PLAYER_SECTIONS.values())
+    assert dossier["playerID"] == 1413
+    for section, endpoint in cricbuzz_client.PLAYER_SECTIONS.items():
+        assert dossier[section] == {"endpoint": endpoint, "id": 1413}
+
+
+def test_match_dossier_fetches_every_section_once(calls):
+    dossier = CricketMatchTools().get_match_dossier(118928)
+
+    assert sorted(calls) == sorted((endpoint, 118928) for endpoint in cricbuzz_client.MATCH_SECTIONS.values())
+    assert dossier["info"] == {"endpoint": "match_info", "id": 118928}
+    assert dossier["scorecard"] == {"endpoint": "match_scorecard", "id": 118928}
+    assert dossier["commentary"] == {"endpoint": "match_commentary", "id": 118928}
+
+
+def test_dossiers_reject_invalid_ids(calls):
+    assert "error" in CricketPlayerTool().get_player_dossier(0)
+    assert "error" in CricketMatchTools().get_match_dossier(-1)
+    assert calls == []
+
+
+def test_bulk_fetch_dedupes_players_and_reports_failed_sections(monkeypatch):
+    made = []
+
+    def fake_fetch(endpoint, resource_id, use_cache=True):
+        made.append((endpoint, resource_id))
+        if endpoint == "player_bowling" and resource_id == 2:
+            return {"error": "API request failed: 404"}
+        return {"id": resource_id}
+
+    monkeypatch.setattr(cricbuzz_client, "fetch", fake_fetch)
+    players = cricbuzz_client.fetch_players_bulk([1, 2, 1], ["batting", "bowling", "batting"])
+
+    assert len(made) == 4
+    assert [player["playerID"] for player in players] == [1, 2]
+    assert players[0] == {"playerID": 1, "batting": {"id": 1}, "bowling": {"id": 1}, "errors": []}
+    assert players[1]["errors"] == ["bowling"]
+    assert players[1]["batting"] == {"id": 2}
+
+
+def test_bulk_fetch_keeps_concurrency_bounded(monkeypatch):
+    in_flight, peak = 0, 0
+    lock = threading.Lock()
+
+    def fake_fetch(endpoint, resource_id, use_cache=True):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return {"id": resource_id}
+
+    monkeypatch.setattr(cricbuzz_client, "fetch", fake_fetch)
+    players = cricbuzz_client.fetch_players_bulk(list(range(10)), ["batting"], max_concurrency=3)
+
+    assert len(players) == 10
+    assert peak == 3
+
+
+def test_bulk_fetch_rejects_unknown_sections():
+    with pytest.raises(ValueError, match="fielding"):
+        cricbuzz_client.fetch_players_bulk([1], ["fielding"])
+
+
+def test_multiple_players_stats_lists_players_that_failed_entirely(monkeypatch):
+    def fake_fetch(endpoint, resource_id, use_cache=True):
+        return {"error": "API request failed"} if resource_id == 7 else {"id": resource_id}
+
+    monkeypatch.setattr(cricbuzz_client, "fetch", fake_fetch)
+    monkeypatch.setattr(compaction, "COMPACT_PAYLOADS", False)
+    result = CricketPlayerTool().get_multiple_players_stats([5, 7])
+
+    assert result["failed"] == [7]
+    assert [player["playerID"] for player in result["players"]] == [5, 7]
@@ -0,0 +1,92 @@
+from docx import Document
+
+import docx_writer
+from docx_writer import convert_markdown_file, render_docx
+
+REPORT = """# Virat Kohli
+
+A **record** chase with *calm* finishing and ~~no~~ `one` [source](https://www.cricbuzz.com).
+
+## Key numbers
+
+- Runs
+  - 9230 in Tests
+1. First innings
+2. Second innings
+
+> Chasing is an art.
+
+| Format | Runs |
+|:-------|-----:|
+| Test   | 9230 |
+
+```
+print("century")
+```
+
+---
+"""
+
+
+def styles(document):
+    return [paragraph.style.name for paragraph in document.paragraphs]
+
+
+def test_reports_render_with_word_styles():
+    document = render_docx(REPORT)
+    assert styles(document)[:4] == ["Heading 1", "Normal", "Heading 2", "List Bullet"]
+    assert {"List Bullet 2", "List Number", "Quote", "Source Code"} <= set(styles(document))
+
+    runs = {run.text: run for run in document.paragraphs[1].runs}
+    assert runs["record"].bold and runs["calm"].italic and runs["no"].font.strike
+    assert runs["one"].font.name == docx_writer.CODE_FONT
+    assert "https://www.cricbuzz.com" in [rel.target_ref for rel in document.part.rels.values()]
+
+    table = document.tables[0]
+    assert [[cell.text for cell in row.cells] for row in table.rows] == [["Format", "Runs"], ["Test", "9230"]]
+    assert table.rows[0].cells[0].paragraphs[0].runs[0].bold
+
+
+def test_ordered_lists_restart_their_numbering():
+    document = render_docx("1. One\n2. Two\n\nText\n\n1. Again\n")
+    numbering = [paragraph._p.pPr.numPr.numId.val for paragraph in document.paragraphs
+                 if paragraph.style.name == "List Number"]
+    assert numbering[0] == numbering[1] != numbering[2]
+
+
+def test_files_are_converted_natively(tmp_path):
+    source = tmp_path / "report.md"
+    source.write_text(REPORT, encoding="utf-8")
+
+    assert convert_markdown_file(source, tmp_path / "report.docx") == "native"
+    assert Document(str(tmp_path / "report.docx")).paragraphs[0].text == "Virat Kohli"
+
+
+def test_unsupported_markdown_falls_back_to_pandoc(tmp_path, monkeypatch):
+    converted = []
+    monkeypatch.setattr(docx_writer, "pandoc_to_docx", lambda source, output: converted.append((source, output)))
+    before = docx_writer.docx_stats()
+    source = tmp_path / "report.md"
+
+    source.write_text("# Photo\n\n![Kohli](kohli.png)\n", encoding="utf-8")
+    assert convert_markdown_file(source, tmp_path / "photo.docx") == "pandoc"
+    source.write_text("<div>Raw HTML</div>\n", encoding="utf-8")
+    assert convert_markdown_file(source, tmp_path / "html.docx") == "pandoc"
+    # A <br> is a line break, not HTML pandoc is needed for
+    source.write_text("First line<br>second line\n", encoding="utf-8")
+    assert convert_markdown_file(source, tmp_path / "br.docx") == "native"
+
+    assert [output.name for _, output in converted] == ["photo.docx", "html.docx"]
+    after = docx_writer.docx_stats()
+    assert after["fallbacks"] - before["fallbacks"] == 2
+
+
+def test_the_pandoc_renderer_can_be_forced(tmp_path, monkeypatch):
+    converted = []
+    monkeypatch.setattr(docx_writer, "DOCX_RENDERER", "pandoc")
+    monkeypatch.setattr(docx_writer, "pandoc_to_docx", lambda source, output: converted.append(output))
+    source = tmp_path / "report.md"
+    source.write_text(REPORT, encoding="utf-8")
+
+    assert convert_markdown_file(source, tmp_path / "report.docx") == "pandoc"
+    assert converted == [tmp_path / "report.docx"]
@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI, Request
+
+import http_caching
+from http_caching import IMMUTABLE, choose_encoding, encoded_response, file_response, is_not_modified
+
+PAGE = ("<p>" + "Kohli's record chase. " * 100 + "</p>").encode("utf-8")
+ETAG = '"report-1"'
+
+
+def serve(tmp_path):
+    """An app serving PAGE from memory at /page and two files (text and audio) at /files/{name}."""
+    (tmp_path / "report.md").write_bytes(PAGE)
+    (tmp_path / "narration.mp3").write_bytes(bytes(range(256)) * 8)
+    app = FastAPI()
+
+    @app.get("/page")
+    def page(request: Request):
+        return encoded_response(request, PAGE, "text/html; charset=utf-8", etag=ETAG, cache_control=IMMUTABLE)
+
+    @app.get("/files/{name}")
+    def files(request: Request, name: str):
+        media_type = "audio/mpeg" if name.endswith(".mp3") else "text/markdown; charset=utf-8"
+        return file_response(request, tmp_path / name, media_type, filename=name)
+
+    return app
+
+
+def get(app, path: str, **headers) -> httpx.Response:
+    async def request():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get(path, headers=headers)
+
+    return asyncio.run(request())
+
+
+def test_accept_encoding_is_negotiated_honouring_q_zero():
+    assert choose_encoding("gzip, deflate, br") == "br"
+    assert choose_encoding("br;q=0, gzip") == "gzip"
+    assert choose_encoding("*") == "gzip"
+    assert choose_encoding("gzip;q=0, br;q=0") is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding(None) is None
+
+
+def test_conditional_requests_use_weak_comparison_and_if_modified_since():
+    assert is_not_modified({"if-none-match": 'W/"report-1"'}, ETAG)
+    assert is_not_modified({"if-none-match": '"other", "report-1"'}, 'W/"report-1"')
+    assert is_not_modified({"if-none-match": "*"}, ETAG)
+    assert not is_not_modified({"if-none-match": '"other"'}, ETAG)
+    # If-None-Match takes precedence over If-Modified-Since
+    assert not is_not_modified({"if-none-match": '"other"', "if-modified-since": "Tue, 03 Jun 2025 18:30:05 GMT"},
+                               ETAG, "Mon, 02 Jun 2025 10:00:00 GMT")
+    assert is_not_modified({"if-modified-since": "Tue, 03 Jun 2025 18:30:05 GMT"}, None, "Mon, 02 Jun 2025 10:00:00 GMT")
+    assert not is_not_modified({"if-modified-since": "Sun, 01 Jun 2025 00:00:00 GMT"}, None,
+                               "Mon, 02 Jun 2025 10:00:00 GMT")
+    assert not is_not_modified({"if-modified-since": "yesterday"}, None, "Mon, 02 Jun 2025 10:00:00 GMT")
+
+
+def test_text_bodies_are_compressed_with_a_weak_etag(tmp_path):
+    app = serve(tmp_path)
+
+    plain = get(app, "/page", **{"accept-encoding": "identity"})
+    assert plain.headers["etag"] == ETAG and "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+    for encoding in ("gzip", "br"):
+        compressed = get(app, "/page", **{"accept-encoding": encoding})
+        assert compressed.headers["content-encoding"] == encoding
+        assert compressed.headers["etag"] == "W/" + ETAG
+        assert int(compressed.headers["content-length"]) < len(PAGE)
+        assert compressed.content == PAGE  # decoded by httpx
+
+
+def test_small_bodies_are_sent_uncompressed(monkeypatch, tmp_path):
+    monkeypatch.setattr(http_caching, "MIN_COMPRESS_BYTES", len(PAGE) + 1)
+    response = get(serve(tmp_path), "/page", **{"accept-encoding": "gzip"})
+    assert "content-encoding" not in response.headers and response.content == PAGE
+
+
+def test_current_copies_are_answered_with_304(tmp_path):
+    app = serve(tmp_path)
+
+    response = get(app, "/page", **{"if-none-match": "W/" + ETAG, "accept-encoding": "gzip"})
+    assert response.status_code == 304 and response.content == b""
+    assert (response.headers["etag"], response.headers["cache-control"]) == (ETAG, IMMUTABLE)
+
+    first = get(app, "/files/narration.mp3")
+    for validator in ({"if-none-match": first.headers["etag"]}, {"if-modified-since": first.headers["last-modified"]}):
+        assert get(app, "/files/narration.mp3", **validator).status_code == 304
+
+
+def test_text_files_are_compressed_and_audio_is_served_in_ranges(tmp_path):
+    app = serve(tmp_path)
+
+    markdown = get(app, "/files/report.md", **{"accept-encoding": "gzip"})
+    assert markdown.headers["content-encoding"] == "gzip" and markdown.headers["etag"].startswith("W/")
+    assert markdown.headers["content-disposition"] == 'attachment; filename="report.md"'
+    assert markdown.content == PAGE
+
+    audio = get(app, "/files/narration.mp3", **{"accept-encoding": "gzip", "range": "bytes=256-511"})
+    assert audio.status_code == 206
+    assert audio.headers["content-range"] == "bytes 256-511/2048"
+    assert "content-encoding" not in audio.headers
+    assert audio.content == bytes(range(256))
+
+    stale = get(app, "/files/narration.mp3", **{"range": "bytes=0-9", "if-range": '"stale"'})
+    assert stale.status_code == 200 and len(stale.content) == 2048
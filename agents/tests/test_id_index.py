@@ -0,0 +1,55 @@
+import pytest
+
+from id_index import CricbuzzIDIndex, MATCH, PLAYER, normalize_name
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = CricbuzzIDIndex(tmp_path / "ids.sqlite3")
+    index.add(PLAYER, "Virat Kohli", 1413, aliases=["King Kohli"])
+    index.add(PLAYER, "Jasprit Bumrah", 9311)
+    index.add(MATCH, "Royal Challengers Bengaluru vs Punjab Kings Indian Premier League 2025 Final", 115059)
+    index.add(MATCH, "Royal Challengers Bengaluru vs Punjab Kings Indian Premier League 2024 Final", 89654)
+    index.add(MATCH, "India vs Australia Border-Gavaskar Trophy 4th Test", 91805)
+    return index
+
+
+def test_normalize_name_strips_accents_and_punctuation():
+    assert normalize_name("M.S.  Dhoni") == "m s dhoni"
+    assert normalize_name("Rassie van der Düssen") == "rassie van der dussen"
+
+
+def test_exact_names_and_aliases_resolve(index):
+    assert index.lookup(PLAYER, "virat kohli") == {"id": 1413, "name": "Virat Kohli", "score": 1.0}
+    assert index.lookup(PLAYER, "King Kohli")["id"] == 1413
+
+
+def test_misspelled_names_resolve_fuzzily(index):
+    result = index.lookup(PLAYER, "Jasprit Bumra")
+    assert result["id"] == 9311
+    assert 0.8 <= result["score"] < 1.0
+    assert index.lookup(PLAYER, "Joe Root") is None
+
+
+def test_match_aliases_resolve_through_the_canonical_form(index):
+    assert index.lookup(MATCH, "RCB vs PBKS IPL 2025 final")["id"] == 115059
+    assert index.lookup(MATCH, "RCB v PBKS IPL 2024 finals")["id"] == 89654
+
+
+def test_fuzzy_match_lookups_require_the_same_year_number_and_stage(index):
+    assert index.lookup(MATCH, "RCB vs Punjab Kngs IPL 2025 final")["id"] == 115059
+    assert index.lookup(MATCH, "RCB vs PBKS IPL 2023 final") is None
+    assert index.lookup(MATCH, "RCB vs PBKS IPL 2025 qualifier") is None
+    assert index.lookup(MATCH, "India vs Australia Border Gavaskar Trophy 4th Test")["id"] == 91805
+    assert index.lookup(MATCH, "India vs Australia Border Gavaskar Trophy 5th Test") is None
+
+
+def test_entries_written_by_another_process_are_found(index, tmp_path):
+    other = CricbuzzIDIndex(tmp_path / "ids.sqlite3")
+    other.add(PLAYER, "Joe Root", 8019)
+    assert index.lookup(PLAYER, "Joe Root")["id"] == 8019
+
+
+def test_unknown_kinds_are_rejected(index):
+    with pytest.raises(ValueError, match="team"):
+        index.add("team", "India", 2)
@@ -0,0 +1,77 @@
+import payload_store as payload_store_module
+from FinalDrafter import PayloadTools
+from payload_store import PayloadStore, offload_if_large, payload_store, summarize
+from run_context import run_scope
+
+COMMENTARY = {
+    "matchHeader": {"status": "RCB won by 6 runs"},
+    "commentaryList": [
+        {"inningsId": 1, "overNumber": 0.1, "event": "NONE", "commText": "Dot ball"},
+        {"inningsId": 1, "overNumber": 19.6, "event": "FOUR", "commText": "Driven through cover"},
+        {"inningsId": 2, "overNumber": 1.1, "event": "WICKET", "commText": "Bowled him"},
+        {"inningsId": 2, "overNumber": 19.2, "event": "SIX", "commText": "Over long-on"},
+    ],
+}
+
+
+def test_summaries_count_balls_and_events_per_innings():
+    assert summarize(COMMENTARY) == (
+        "status: RCB won by 6 runs\n"
+        "innings 1, overs 0.1-19.6, 2 entries, 1 fours\n"
+        "innings 2, overs 1.1-19.2, 2 entries, 1 sixes, 1 wickets"
+    )
+
+
+def test_slices_filter_by_innings_and_over():
+    store = PayloadStore()
+    with run_scope("run-1"):
+        handle = store.put(COMMENTARY, "match_commentary:1")["handle"]
+        death_overs = store.get_slice(handle, innings=2, from_over=19)
+
+    assert "Over long-on" in death_overs
+    assert "Bowled him" not in death_overs and "Driven through cover" not in death_overs
+
+
+def test_long_slices_are_cut_at_a_line_with_a_note():
+    store = PayloadStore()
+    with run_scope("run-1"):
+        handle = store.put(COMMENTARY, "match_commentary:1")["handle"]
+        text = store.get_slice(handle, max_chars=60)
+
+    assert text.splitlines()[-1].startswith("[truncated:")
+    assert len(text.split("\n[truncated")[0]) <= 60
+
+
+def test_handles_only_resolve_in_their_run_and_are_released_when_it_ends():
+    with run_scope("run-1"):
+        handle = payload_store.put(COMMENTARY, "match_commentary:1")["handle"]
+        assert payload_store.get(handle) is not None
+        with run_scope("run-2"):
+            assert payload_store.get(handle) is None
+    with run_scope("run-1"):
+        assert payload_store.get(handle) is None
+
+
+def test_small_outputs_are_returned_and_large_ones_offloaded(monkeypatch):
+    monkeypatch.setattr(payload_store_module, "HANDLE_MIN_CHARS", 100)
+    assert offload_if_large(COMMENTARY, "short text", "match_commentary:1") == "short text"
+
+    with run_scope("run-1"):
+        text = offload_if_large(COMMENTARY, "x" * 100, "match_commentary:1")
+        assert text.startswith("[payload handle pl_")
+        assert "innings 2" in text
+
+
+def test_readers_stop_once_their_budget_is_used_up():
+    tools = PayloadTools("match_drafter", char_budget=150)
+    with run_scope("run-1"):
+        handle = payload_store.put(COMMENTARY, "match_commentary:1")["handle"]
+        first = tools.read_payload(handle)
+        second = tools.read_payload(handle, innings=2)
+
+    assert first.startswith("matchHeader:")
+    assert second.startswith("Error: payload reading budget")
+    # Each run starts with a fresh budget
+    with run_scope("run-2"):
+        handle = payload_store.put(COMMENTARY, "match_commentary:1")["handle"]
+        assert "Over long-on" in tools.read_payload(handle, innings=2)
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+import cricbuzz_client
+import server
+
+BATTING = {"headers": ["ROWHEADER", "Test", "ODI"], "values": [{"values": ["Runs", "9230", "14181"]}]}
+BOWLING = {"headers": ["ROWHEADER", "Test", "ODI"], "values": [{"values": ["Wickets", "205", "149"]}]}
+
+
+@pytest.fixture
+def cricbuzz(monkeypatch):
+    """Answers Cricbuzz requests locally and records them with the thread that did the cache and index I/O."""
+    requests, io_threads = [], []
+
+    async def fake_network(endpoint, resource_id):
+        requests.append((endpoint, resource_id))
+        if endpoint == "player_search":
+            players = {"virat kohli": [{"id": "1413", "name": "Virat Kohli"}],
+                       "jasprit bumrah": [{"id": "9311", "name": "Jasprit Bumrah"}]}
+            return {"player": players.get(resource_id, [])}
+        if resource_id == 666:
+            return {"error": "API request failed: 503"}
+        return BATTING if endpoint == "player_batting" else BOWLING
+
+    def recorded(function):
+        def wrapper(*args, **kwargs):
+            io_threads.append(threading.current_thread())
+            return function(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(cricbuzz_client, "_afetch_network", fake_network)
+    monkeypatch.setattr(cricbuzz_client, "_cache_lookup", recorded(cricbuzz_client._cache_lookup))
+    monkeypatch.setattr(cricbuzz_client, "_record", recorded(cricbuzz_client._record))
+    return requests, io_threads
+
+
+def call(method, path, **kwargs):
+    async def send():
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.request(method, path, **kwargs), threading.current_thread()
+    return asyncio.run(send())
+
+
+def test_batting_table_is_served_without_the_agents(cricbuzz):
+    requests, io_threads = cricbuzz
+    response, loop_thread = call("GET", "/get_batting", params={"input": "Virat Kohli batting stats"})
+
+    assert response.status_code == 200
+    assert response.json() == BATTING
+    assert requests == [("player_search", "virat kohli"), ("player_batting", 1413)]
+    # Cache and index I/O never runs on the event loop thread
+    assert io_threads and loop_thread not in io_threads
+
+
+def test_bowling_table_is_served_for_a_post_and_revalidated_by_etag(cricbuzz):
+    response, _ = call("POST", "/get_bowling", json={"input": "Jasprit Bumrah"})
+    assert response.status_code == 200
+    assert response.json() == BOWLING
+
+    again, _ = call("POST", "/get_bowling", json={"input": "jasprit bumrah"},
+                    headers={"If-None-Match": response.headers["ETag"]})
+    assert again.status_code == 304
+
+
+def test_known_players_are_resolved_from_the_id_index(cricbuzz):
+    requests, _ = cricbuzz
+    call("GET", "/get_batting", params={"input": "Virat Kohli"})
+    requests.clear()
+
+    response, _ = call("GET", "/get_bowling", params={"input": "Virat Kohli"})
+    assert response.status_code == 200
+    assert requests == [("player_bowling", 1413)]
+
+
+def test_unknown_players_and_empty_input_are_rejected(cricbuzz):
+    response, _ = call("GET", "/get_batting", params={"input": "Nobody Atall"})
+    assert response.status_code == 404
+
+    response, _ = call("POST", "/get_batting", json={"input": "   "})
+    assert response.status_code == 400
+
+
+def test_cricbuzz_failures_are_reported_as_bad_gateway(cricbuzz):
+    server.get_id_index().add("player", "Ravi Failure", 666)
+    response, _ = call("GET", "/get_bowling", params={"input": "Ravi Failure"})
+    assert response.status_code == 502
+    assert "503" in response.json()["error"]
@@ -0,0 +1,25 @@
+from query_utils import canonical_query, normalize_query
+
+
+def test_normalize_query_lowercases_and_trims():
+    assert normalize_query("  Give me a report on   IPL 2025 Final!! ") == "give me a report on ipl 2025 final"
+
+
+def test_team_competition_and_plural_aliases_map_to_one_key():
+    assert (canonical_query("Give me a report on RCB vs PBKS IPL 2025 finals")
+            == canonical_query("rcb v pbks ipl 2025 final report")
+            == canonical_query("Royal Challengers Bangalore versus Kings XI Punjab Indian Premier League 2025 final")
+            == "royal challengers bengaluru vs punjab kings indian premier league 2025 final")
+
+
+def test_aliases_only_match_whole_words():
+    # "mi" inside "Smith" and "ind" inside "Indore" stay as they are
+    assert canonical_query("Steve Smith at Indore") == "steve smith at indore"
+
+
+def test_filler_words_and_punctuation_do_not_change_the_key():
+    assert canonical_query("Please create a detailed report about Virat Kohli, stats!") == "virat kohli statistics"
+
+
+def test_different_seasons_keep_different_keys():
+    assert canonical_query("IPL 2024 final") != canonical_query("IPL 2025 final")
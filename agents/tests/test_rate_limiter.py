@@ -0,0 +1,129 @@
+import asyncio
+import types
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+import rate_limiter
+from rate_limiter import BATCH, INTERACTIVE, RateLimiter, RateLimitError, parse_retry_after, priority_scope
+
+HOST = "cricbuzz.test"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A fake clock for the limiter; sleeping moves it forward instantly."""
+    now = types.SimpleNamespace(value=1_000_000.0, slept=0.0)
+
+    def sleep(seconds):
+        now.value += seconds
+        now.slept += seconds
+
+    monkeypatch.setattr(rate_limiter, "time", types.SimpleNamespace(
+        time=lambda: now.value, monotonic=lambda: now.value, sleep=sleep,
+    ))
+    monkeypatch.setattr(rate_limiter.random, "uniform", lambda low, high: 0.0)
+    return now
+
+
+def limiter(tmp_path, **kwargs):
+    return RateLimiter(tmp_path / "ratelimit.sqlite3", **{"rate": 2, "burst": 4, "daily_quota": 0, **kwargs})
+
+
+def test_a_burst_is_granted_at_once_and_later_requests_wait_for_a_refill(tmp_path, clock):
+    bucket = limiter(tmp_path)
+    assert [bucket.acquire(HOST) for _ in range(4)] == [0.0] * 4
+
+    assert bucket.acquire(HOST) == pytest.approx(0.5)
+    stats = bucket.stats()
+    assert (stats["granted"], stats["waited"]) == (5, 1)
+
+
+def test_requests_that_would_wait_too_long_are_rejected(tmp_path, clock):
+    bucket = limiter(tmp_path, max_wait=0.1)
+    for _ in range(4):
+        bucket.acquire(HOST)
+    with pytest.raises(RateLimitError, match="no request slot"):
+        bucket.acquire(HOST)
+
+
+def test_batch_requests_leave_a_reserve_for_interactive_ones(tmp_path, clock):
+    bucket = limiter(tmp_path, burst=10, max_wait=0)
+    with priority_scope(BATCH):
+        granted = 0
+        with pytest.raises(RateLimitError):
+            while True:
+                bucket.acquire(HOST)
+                granted += 1
+    # 30% of the bucket stays available to interactive requests
+    assert granted == 7
+    assert [bucket.acquire(HOST, INTERACTIVE) for _ in range(3)] == [0.0] * 3
+
+
+def test_a_429_blocks_the_host_for_its_retry_after(tmp_path, clock):
+    bucket = limiter(tmp_path)
+    bucket.block(HOST, parse_retry_after("3"))
+
+    assert bucket.acquire(HOST) == pytest.approx(3.0)
+    assert bucket.stats()["throttled"] == 1
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) == rate_limiter.DEFAULT_RETRY_AFTER
+    assert parse_retry_after("soon") == rate_limiter.DEFAULT_RETRY_AFTER
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < parse_retry_after(later) <= 30
+
+
+def test_the_daily_quota_keeps_a_reserve_from_batch_work(tmp_path, clock):
+    bucket = limiter(tmp_path, burst=100, daily_quota=10)
+    for _ in range(9):
+        bucket.acquire(HOST, BATCH)
+    with pytest.raises(RateLimitError, match="quota"):
+        bucket.acquire(HOST, BATCH)
+
+    bucket.acquire(HOST, INTERACTIVE)
+    with pytest.raises(RateLimitError, match="quota"):
+        bucket.acquire(HOST, INTERACTIVE)
+    assert bucket.stats()["hosts"][HOST]["used_today"] == 10
+
+
+def test_the_quota_follows_what_the_api_reports_as_remaining(tmp_path, clock):
+    bucket = limiter(tmp_path, burst=100, daily_quota=10)
+    bucket.sync_quota(HOST, "1")
+    bucket.acquire(HOST)
+    with pytest.raises(RateLimitError, match="quota"):
+        bucket.acquire(HOST)
+
+
+def test_processes_sharing_the_database_share_the_bucket(tmp_path, clock):
+    first, second = limiter(tmp_path, max_wait=0), limiter(tmp_path, max_wait=0)
+    for _ in range(2):
+        first.acquire(HOST)
+        second.acquire(HOST)
+    with pytest.raises(RateLimitError):
+        second.acquire(HOST)
+
+
+def test_async_acquire_waits_without_blocking_the_loop(tmp_path):
+    bucket = limiter(tmp_path, rate=20, burst=1)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        waits = [await bucket.aacquire(HOST) for _ in range(3)]
+        task.cancel()
+        return waits, ticks
+
+    waits, ticks = asyncio.run(main())
+    assert waits[0] < 0.02 and waits[2] > 0.03
+    assert ticks > 5
@@ -0,0 +1,40 @@
+import asyncio
+import threading
+
+import httpx
+
+import server
+from report_jobs import ReportJobQueue
+
+
+def get_ready():
+    async def request():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://test") as client:
+            return await client.get("/ready")
+
+    return asyncio.run(request())
+
+
+def test_ready_waits_for_every_worker_team(monkeypatch):
+    built, release = [], threading.Event()
+
+    def build_team():
+        release.wait(5)
+        built.append(threading.current_thread().name)
+
+    queue = ReportJobQueue(server.generate_report_markdown, max_workers=2)
+    monkeypatch.setattr(server, "report_jobs", queue)
+    monkeypatch.setattr(server, "get_worker_team", build_team)
+    monkeypatch.setattr(server, "AGENT_WARMUP", True)
+
+    server.start_agent_warmup()
+    starting = get_ready()
+    assert (starting.status_code, starting.json()["status"]) == (503, "starting")
+
+    release.set()
+    for future in queue._warmup:
+        future.result(5)
+    ready = get_ready()
+    assert (ready.status_code, ready.json()["status"]) == (200, "ready")
+    assert len(set(built)) == 2
+    queue.shutdown()
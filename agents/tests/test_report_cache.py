@@ -0,0 +1,29 @@
+import time
+
+from report_cache import ReportCache
+
+
+def test_reports_are_served_for_rephrased_queries(tmp_path):
+    cache = ReportCache(tmp_path / "reports.sqlite3", ttl_seconds=3600)
+    cache.put("RCB vs PBKS IPL 2025 final report", "# Final", "<h1>Final</h1>", report_id="abc")
+
+    entry = cache.get("Give me a report on rcb v pbks ipl 2025 finals")
+    assert (entry["markdown"], entry["html"], entry["report_id"]) == ("# Final", "<h1>Final</h1>", "abc")
+    assert cache.get("RCB vs PBKS IPL 2024 final report") is None
+
+
+def test_reports_past_the_freshness_window_are_regenerated(tmp_path):
+    cache = ReportCache(tmp_path / "reports.sqlite3", ttl_seconds=0.05)
+    cache.put("Kohli report", "# Kohli", "<h1>Kohli</h1>")
+    time.sleep(0.1)
+    assert cache.get("Kohli report") is None
+
+
+def test_empty_reports_are_not_cached_and_invalidate_drops_entries(tmp_path):
+    cache = ReportCache(tmp_path / "reports.sqlite3", ttl_seconds=3600)
+    cache.put("Empty report", "", "")
+    assert cache.get("Empty report") is None
+
+    cache.put("Kohli report", "# Kohli", "<h1>Kohli</h1>")
+    cache.invalidate("kohli")
+    assert cache.get("Kohli report") is None
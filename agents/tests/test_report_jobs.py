@@ -0,0 +1,146 @@
+import threading
+
+import pytest
+
+from report_jobs import ReportJobQueue, CANCELLED, QUEUED, SUCCEEDED
+from rate_limiter import BATCH, INTERACTIVE
+
+
+class GatedRunner:
+    """Report runner that emits a stage and a chunk, then waits until the test opens the gate."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.queries = []
+
+    def __call__(self, query, emit):
+        self.queries.append(query)
+        emit("stage", {"stage": "data_fetch", "member": "fetcher"})
+        self.started.set()
+        self.gate.wait(5)
+        emit("chunk", {"markdown": f"# {query}"})
+        return f"# {query}"
+
+
+@pytest.fixture
+def runner():
+    runner = GatedRunner()
+    yield runner
+    runner.gate.set()
+
+
+def test_identical_in_flight_submissions_share_one_job(runner):
+    queue = ReportJobQueue(runner, max_workers=1)
+    first = queue.submit("Kohli report", key="kohli")
+    second = queue.submit("kohli report!", key="kohli")
+    runner.gate.set()
+    first.future.result(5)
+
+    assert second is first
+    assert runner.queries == ["Kohli report"]
+    assert first.status == SUCCEEDED and first.result == "# Kohli report"
+    assert queue.stats()["coalesced"] == 1
+
+
+def test_a_finished_job_is_not_joined(runner):
+    queue = ReportJobQueue(runner, max_workers=1)
+    runner.gate.set()
+    first = queue.submit("Kohli report", key="kohli")
+    first.future.result(5)
+
+    second = queue.submit("Kohli report", key="kohli")
+    second.future.result(5)
+    assert second is not first
+    assert len(runner.queries) == 2
+
+
+def test_a_listener_joining_a_plain_job_receives_its_progress(runner):
+    queue = ReportJobQueue(runner, max_workers=1)
+    job = queue.submit("Kohli report", key="kohli")
+    assert runner.started.wait(5)
+
+    events = []
+    joined = queue.submit("Kohli report", key="kohli", listener=lambda event, data: events.append((event, data)))
+    runner.gate.set()
+    job.future.result(5)
+
+    assert joined is job
+    assert events == [("stage", {"stage": "data_fetch", "member": "fetcher"}), ("chunk", {"markdown": "# Kohli report"})]
+    assert job.events == []
+
+
+def test_an_interactive_request_raises_the_priority_of_a_queued_batch_job(runner):
+    queue = ReportJobQueue(runner, max_workers=1)
+    queue.submit("Busy worker", key="busy")
+    job = queue.submit("Kohli report", key="kohli", priority=BATCH)
+    queue.submit("Kohli report", key="kohli", priority=INTERACTIVE)
+    assert job.priority == INTERACTIVE
+
+
+def test_a_cancelled_queued_job_never_runs(runner):
+    queue = ReportJobQueue(runner, max_workers=1)
+    running = queue.submit("Busy worker", key="busy")
+    queued = queue.submit("Kohli report", key="kohli")
+
+    assert queue.cancel(queued.id).status == CANCELLED
+    runner.gate.set()
+    running.future.result(5)
+    assert runner.queries == ["Busy worker"]
+    # The key is free again once its job is cancelled
+    assert queue.submit("Kohli report", key="kohli") is not queued
+
+
+def test_a_cancelled_running_job_discards_its_result(runner):
+    queue = ReportJobQueue(runner, max_workers=1)
+    job = queue.submit("Kohli report", key="kohli")
+    assert runner.started.wait(5)
+
+    queue.cancel(job.id)
+    runner.gate.set()
+    job.future.result(5)
+    assert job.status == CANCELLED
+    assert job.result is None
+
+
+def test_shutdown_cancels_queued_jobs_with_a_reason(runner):
+    queue = ReportJobQueue(runner, max_workers=1)
+    running = queue.submit("Busy worker", key="busy")
+    assert runner.started.wait(5)
+    queued = queue.submit("Kohli report", key="kohli")
+    assert queued.status == QUEUED
+
+    queue.shutdown()
+    assert queued.status == CANCELLED
+    assert "shutting down" in queued.error
+    runner.gate.set()
+    running.future.result(5)
+    assert running.status == SUCCEEDED
+    assert queue.stats()[CANCELLED] == 1
+
+
+def test_warm_up_prepares_every_worker_thread_once(runner):
+    queue = ReportJobQueue(runner, max_workers=3)
+    assert queue.warmup_stats()["warmup"] == "not started"
+    prepared = []
+
+    for future in queue.warm_up(lambda: prepared.append(threading.current_thread().name)):
+        future.result(5)
+    job = queue.submit("Kohli report")
+    runner.gate.set()
+    job.future.result(5)
+
+    assert len(set(prepared)) == len(prepared) == 3
+    assert queue.warmup_stats() == {"warmup": "done", "errors": []}
+
+
+def test_warm_up_reports_failed_workers(runner):
+    queue = ReportJobQueue(runner, max_workers=2)
+
+    def prepare():
+        raise ValueError("GOOGLE_API_KEY is not set")
+
+    for future in queue.warm_up(prepare):
+        future.exception(5)
+
+    assert queue.warmup_stats() == {"warmup": "done", "errors": ["ValueError: GOOGLE_API_KEY is not set"] * 2}
@@ -0,0 +1,74 @@
+import asyncio
+import gc
+import time
+
+import narration_cache
+import report_narration
+from benchmarks.standins import fake_groq_client, fake_tts_backend
+
+# Cache and file I/O made this slow; on the event loop it would stall every other request for as long
+BLOCKING_IO_SECONDS = 0.2
+# Well below a single blocking call, with headroom for thread start-up and GIL contention
+MAX_LOOP_LAG = BLOCKING_IO_SECONDS / 2
+
+
+def slow(method):
+    def wrapper(*args, **kwargs):
+        time.sleep(BLOCKING_IO_SECONDS)
+        return method(*args, **kwargs)
+    return wrapper
+
+
+async def narrate_while_measuring_lag(reports):
+    worst = 0.0
+    done = asyncio.Event()
+
+    async def monitor():
+        nonlocal worst
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            worst = max(worst, time.perf_counter() - started - 0.01)
+
+    watcher = asyncio.create_task(monitor())
+    files = await asyncio.gather(*(report_narration.narrate_cricket_report(report) for report in reports))
+    done.set()
+    await watcher
+    return files, worst
+
+
+def test_narration_keeps_event_loop_responsive(monkeypatch):
+    monkeypatch.setattr(report_narration, "groq_client", fake_groq_client(0.05))
+    monkeypatch.setattr(report_narration, "tts_backend", fake_tts_backend(0.05))
+    for name in ("get_audio", "put_audio", "get_script", "put_script"):
+        monkeypatch.setattr(narration_cache.NarrationCache, name, slow(getattr(narration_cache.NarrationCache, name)))
+
+    reports = [f"# Responsiveness report {i}\n\nBumrah took {i} wickets in the final." for i in range(3)]
+    # SQLite connections left behind by earlier tests checkpoint their WAL when collected; do that before measuring
+    gc.collect()
+    files, lag = asyncio.run(narrate_while_measuring_lag(reports))
+    assert len(set(files)) == 3
+    assert lag < MAX_LOOP_LAG
+
+    # Repeated reports are answered from the cache, also without stalling the loop
+    cached, lag = asyncio.run(narrate_while_measuring_lag(reports))
+    assert cached == files
+    assert lag < MAX_LOOP_LAG
+
+
+def test_closing_a_narration_stream_early_leaves_no_tasks_behind():
+    async def script():
+        for i in range(20):
+            yield f"Sentence number {i} of a long narration script. "
+            await asyncio.sleep(0)
+
+    async def main():
+        stream = report_narration.narrate_streaming("# Report", backend=fake_tts_backend(0.05), concurrency=2,
+                                                    script=script())
+        first = await stream.__anext__()
+        await stream.aclose()
+        return first, [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    first, leftover = asyncio.run(main())
+    assert first.startswith(b"\xff\xfb")
+    assert leftover == []
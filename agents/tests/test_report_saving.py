@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+import ReportSavingAgent
+from artifact_store import ArtifactStore
+from ReportSavingAgent import persist_report, report_filename, report_title, with_report_header
+from run_context import run_scope
+
+NOW = datetime(2025, 6, 3, 18, 30, 5, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def reports(tmp_path, monkeypatch):
+    """Saves reports under tmp_path and records their artifacts in a fresh store."""
+    store = ArtifactStore(tmp_path / "artifacts.sqlite3")
+    monkeypatch.setattr(ReportSavingAgent, "base_directory", tmp_path / "reports")
+    monkeypatch.setattr(ReportSavingAgent, "get_artifact_store", lambda: store)
+    return store
+
+
+def test_the_title_comes_from_the_first_heading_else_the_query():
+    assert report_title("Intro\n\n## **Kohli**: the chase master\n\n# Later") == "Kohli: the chase master"
+    assert report_title("No heading here.", "  Kohli report ") == "Kohli report"
+    assert report_title("No heading here.") == "Cricket Report"
+
+
+def test_file_names_are_sanitized_and_timestamped():
+    assert report_filename("RCB vs PBKS: IPL 2025 / Final", NOW) == "RCB_vs_PBKS_IPL_2025_Final_20250603183005"
+    assert report_filename("???", NOW) == "cricket_report_20250603183005"
+    assert len(report_filename("x" * 200, NOW)) == ReportSavingAgent.MAX_FILENAME_CHARS + len("_20250603183005")
+
+
+def test_the_header_adds_the_title_only_when_the_report_has_none():
+    generated = "*Generated: 2025-06-03 18:30:05 UTC*"
+    assert with_report_header("# Kohli\nBody.", "Kohli", NOW) == f"# Kohli\n\n{generated}\n\nBody.\n"
+    assert with_report_header("Body.", "Kohli report", NOW) == f"# Kohli report\n\n{generated}\n\nBody.\n"
+
+
+def test_reports_are_saved_into_their_run_directory_and_recorded(reports):
+    with run_scope("job-1"):
+        saved = persist_report("# Kohli\n\nA record chase.", "Kohli report", now=NOW)
+
+    markdown_path, docx_path = Path(saved["markdown_path"]), Path(saved["docx_path"])
+    assert saved["title"] == "Kohli"
+    assert markdown_path.parent == ReportSavingAgent.base_directory / "job-1"
+    assert markdown_path.name == "Kohli_20250603183005.md"
+    assert markdown_path.read_text(encoding="utf-8").startswith("# Kohli\n\n*Generated: 2025-06-03 18:30:05 UTC*")
+    assert docx_path.exists()
+    assert set(reports.list("job-1")) == {"md", "docx"}
+    assert reports.get("job-1", "md")["path"] == str(markdown_path.resolve())
+
+
+def test_reports_outside_a_run_are_saved_but_not_recorded(reports):
+    saved = persist_report("A record chase.", "Kohli report", now=NOW)
+
+    assert Path(saved["markdown_path"]).parent == ReportSavingAgent.base_directory
+    assert Path(saved["docx_path"]).exists()
+    assert reports.stats()["artifacts"] == 0
+
+
+def test_empty_reports_are_rejected(reports):
+    with pytest.raises(ValueError):
+        persist_report("  \n", "Kohli report", now=NOW)
+    assert not ReportSavingAgent.base_directory.exists()
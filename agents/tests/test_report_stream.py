@@ -0,0 +1,12 @@
+from report_stream import run_team_streaming
+
+
+def test_run_team_streaming_reports_stages_and_markdown(desk_team):
+    events = []
+    team = desk_team(member_name="Cricket Data Fetcher")
+
+    markdown = run_team_streaming(team, "Write the report.", lambda event, data: events.append((event, data)))
+
+    assert markdown == "Report done."
+    assert ("stage", {"stage": "data_fetch", "member": "cricket-data-fetcher"}) in events
+    assert "".join(data["markdown"] for event, data in events if event == "chunk") == "Report done."
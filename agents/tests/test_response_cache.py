@@ -0,0 +1,87 @@
+import types
+
+import pytest
+
+import response_cache
+from response_cache import CachePolicy, SQLiteTTLCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces the cache's clock with one the test moves forward."""
+    now = types.SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(response_cache, "time", types.SimpleNamespace(time=lambda: now.value))
+    return now
+
+
+def test_entries_are_fresh_then_stale_then_gone(tmp_path, clock):
+    cache = SQLiteTTLCache(tmp_path / "cache.sqlite3")
+    cache.set("match:1", "payload", CachePolicy(ttl=60, stale_ttl=600))
+
+    assert cache.get("match:1") == ("payload", "fresh")
+    clock.value += 61
+    assert cache.get("match:1") == ("payload", "stale")
+    clock.value += 600
+    assert cache.get("match:1") == (None, None)
+    assert cache.stats()["entries"] == 0
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_entries_without_a_stale_window_expire_with_their_ttl(tmp_path, clock):
+    cache = SQLiteTTLCache(tmp_path / "cache.sqlite3")
+    cache.set("player:1", "payload", CachePolicy(ttl=60))
+
+    clock.value += 60
+    assert cache.get("player:1") == (None, None)
+
+
+def test_least_recently_used_entries_are_evicted_beyond_the_size_cap(tmp_path, clock):
+    cache = SQLiteTTLCache(tmp_path / "cache.sqlite3", max_bytes=30)
+    policy = CachePolicy(ttl=3600)
+    for key in ("a", "b", "c"):
+        cache.set(key, "x" * 10, policy)
+        clock.value += 1
+    # Reading "a" makes "b" the least recently used entry
+    cache.get("a")
+    clock.value += 1
+
+    cache.set("d", "x" * 10, policy)
+
+    assert cache.get("b") == (None, None)
+    assert all(cache.get(key)[1] == "fresh" for key in ("a", "c", "d"))
+    stats = cache.stats()
+    assert (stats["evictions"], stats["bytes"]) == (1, 30)
+
+
+def test_replacing_and_deleting_entries_keep_the_size_total(tmp_path, clock):
+    cache = SQLiteTTLCache(tmp_path / "cache.sqlite3", max_bytes=30)
+    policy = CachePolicy(ttl=3600)
+    for _ in range(5):
+        cache.set("a", "x" * 20, policy)
+    cache.set("b", "x" * 10, policy)
+    assert cache.stats()["evictions"] == 0
+
+    cache.delete("a")
+    cache.set("c", "x" * 20, policy)
+    assert cache.stats()["evictions"] == 0
+    assert cache.stats()["bytes"] == 30
+
+
+def test_values_larger_than_the_cap_are_not_stored(tmp_path, clock):
+    cache = SQLiteTTLCache(tmp_path / "cache.sqlite3", max_bytes=10)
+    cache.set("big", "x" * 11, CachePolicy(ttl=60))
+    assert cache.get("big") == (None, None)
+
+
+def test_the_size_total_is_read_back_when_the_cache_is_reopened(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    SQLiteTTLCache(path, max_bytes=30).set("a", "x" * 20, CachePolicy(ttl=3600))
+
+    cache = SQLiteTTLCache(path, max_bytes=30)
+    clock.value += 1
+    cache.set("b", "x" * 20, CachePolicy(ttl=3600))
+
+    assert cache.get("a") == (None, None)
+    assert cache.get("b")[1] == "fresh"
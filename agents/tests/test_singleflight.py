@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_concurrent_calls_with_one_key_share_the_leaders_result():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return "audio.mp3"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("narration", work) for _ in range(3)))
+
+    assert asyncio.run(main()) == ["audio.mp3"] * 3
+    assert len(runs) == 1
+    assert flight.stats() == {"leaders": 1, "coalesced": 2, "in_flight": 0}
+
+
+def test_calls_after_the_leader_finished_run_again():
+    flight = SingleFlight()
+    runs = []
+
+    async def work():
+        runs.append(1)
+        return len(runs)
+
+    async def main():
+        return await flight.do("key", work), await flight.do("key", work)
+
+    assert asyncio.run(main()) == (1, 2)
+
+
+def test_followers_receive_the_leaders_exception():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("synthesis failed")
+
+    async def main():
+        return await asyncio.gather(flight.do("key", work), flight.do("key", work), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_a_cancelled_leader_does_not_cancel_the_work_of_its_followers():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.1)
+        return "done"
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "done"
@@ -0,0 +1,89 @@
+import math
+
+import numpy as np
+import pytest
+
+import stats_engine
+from stats_engine import ALL_FORMATS, BATTING, BOWLING
+
+
+def batting(test, odi):
+    """A Cricbuzz batting table with Test and ODI columns; each argument is (matches, innings, runs, balls, not outs, 4s, 6s, 50s, 100s, highest)."""
+    rows = ["Matches", "Innings", "Runs", "Balls", "Not Out", "Fours", "Sixes", "50s", "100s", "Highest"]
+    return {
+        "headers": ["ROWHEADER", "Test", "ODI"],
+        "values": [{"values": [row, str(t), str(o)]} for row, t, o in zip(rows, test, odi)],
+    }
+
+
+KOHLI = batting((10, 20, 900, 1800, 2, 100, 5, 4, 2, "254*"), (20, 20, 1000, 1000, 0, 90, 20, 6, 4, "183"))
+ROOT = batting((12, 22, 1000, 2000, 2, 110, 2, 6, 3, "262"), (5, 5, 100, 150, 0, 8, 1, 1, 0, "60"))
+NEWCOMER = batting((1, 2, 80, 100, 1, 10, 1, 1, 0, "50*"), ("-", "-", "-", "-", "-", "-", "-", "-", "-", "-"))
+
+
+@pytest.fixture
+def table():
+    return stats_engine.load_tables(BATTING, [
+        (1413, "Virat Kohli", KOHLI), (8019, "Joe Root", ROOT), (99, "New Comer", NEWCOMER),
+        (7, "Unavailable", {"error": "API request failed"}),
+    ])
+
+
+def value(table, player, metric, format_name=ALL_FORMATS):
+    return table.column(metric)[player, table.format_index(format_name)]
+
+
+def test_formats_are_aggregated_and_rates_recomputed(table):
+    assert table.formats == ["Test", "ODI", ALL_FORMATS]
+    assert value(table, 0, "runs") == 1900
+    assert value(table, 0, "highest") == 254
+    assert value(table, 0, "average") == pytest.approx(1900 / 38)
+    assert value(table, 0, "strike_rate") == pytest.approx(100 * 1900 / 2800)
+    assert value(table, 0, "conversion_pct") == pytest.approx(100 * 6 / 16)
+    assert value(table, 0, "runs_share_pct", "Test") == pytest.approx(100 * 900 / 1900)
+
+
+def test_missing_data_is_nan(table):
+    assert math.isnan(value(table, 2, "runs", "ODI"))
+    assert value(table, 2, "runs") == 80
+    assert np.all(np.isnan(table.values[3]))
+
+
+def test_rankings_skip_missing_players_and_unqualified_rates(table):
+    assert stats_engine.rank(table) == [0, 1, 2]
+    assert stats_engine.rank(table, "runs", "Test") == [1, 0, 2]
+    # The newcomer's average of 80 is the best, but from 2 innings
+    assert stats_engine.rank(table, "average") == [0, 1]
+    assert stats_engine.rank(table, "average", qualify=False)[0] == 2
+
+
+def test_rankings_reject_unknown_metrics_and_formats(table):
+    with pytest.raises(ValueError, match="metric"):
+        stats_engine.rank(table, "catches")
+    with pytest.raises(ValueError, match="format"):
+        stats_engine.rank(table, "runs", "T10")
+
+
+def test_percentiles_follow_whether_lower_is_better():
+    table = stats_engine.load_tables(BOWLING, [
+        (1, "Tight", {"headers": ["ROWHEADER", "T20"], "values": [["Balls", "600"], ["Runs", "600"], ["Wickets", "30"]]}),
+        (2, "Loose", {"headers": ["ROWHEADER", "T20"], "values": [["Balls", "600"], ["Runs", "900"], ["Wickets", "30"]]}),
+    ])
+    economy = table.metrics.index("economy")
+    assert value(table, 0, "economy") == pytest.approx(6.0)
+    assert list(stats_engine.percentiles(table)[:, -1, economy]) == [100.0, 0.0]
+    assert stats_engine.rank(table, "economy", qualify=False) == [0, 1]
+
+
+def test_markdown_tables_and_splits(table):
+    markdown = stats_engine.to_markdown(table, order=stats_engine.rank(table), columns=["runs", "average"],
+                                        with_percentile="runs")
+    assert markdown.splitlines() == [
+        "| # | Player | Runs | Avg | Runs pctl |",
+        "|---|---|---|---|---|",
+        "| 1 | Virat Kohli | 1900 | 50 | 100 |",
+        "| 2 | Joe Root | 1100 | 44 | 50 |",
+        "| 3 | New Comer | 80 | 80 | 0 |",
+    ]
+    splits = stats_engine.format_splits(table, 2).splitlines()
+    assert [line.split(" | ")[0] for line in splits[2:]] == ["| Test", "| All"]
@@ -0,0 +1,28 @@
+import pytest
+
+import tracing
+from conftest import MEMBER_SECONDS
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_delegation_span_covers_member_run(monkeypatch, desk_team, stream):
+    spans = []
+    monkeypatch.setattr(tracing, "record_span", lambda kind, name, duration, status="ok", started_at=None,
+                        span_id=None, parent_id=None, **attributes: spans.append(
+                            {"kind": kind, "name": name, "duration": duration, "span_id": span_id, "parent_id": parent_id}))
+
+    team = desk_team(tool_hooks=[tracing.trace_tool_call])
+    with tracing.span("team", "Desk") as team_span:
+        if stream:
+            content = "".join(event.content for event in team.run("Write the report.", stream=True)
+                              if event.event == "RunResponse")
+        else:
+            content = team.run("Write the report.").content
+    assert content == "Report done."
+
+    delegation = next(span for span in spans if span["kind"] == "delegation")
+    tool = next(span for span in spans if span["kind"] == "tool" and span["name"] == "fetch")
+    assert delegation["name"] == "fetcher"
+    assert delegation["parent_id"] == team_span.span_id
+    assert delegation["duration"] >= tool["duration"] >= MEMBER_SECONDS
+    assert tool["parent_id"] == delegation["span_id"]
@@ -0,0 +1,314 @@
+import contextvars
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from run_context import get_run_id
+
+TRACING_ENABLED = os.getenv("TRACING", "1") != "0"
+# JSON lines, one per finished span; empty disables the log (metrics are still collected)
+TRACE_LOG_PATH = os.getenv("TRACE_LOG_PATH", "../logs/trace.jsonl")
+
+# Upper bounds (seconds) of the duration histogram buckets, from a cache hit up to a full report run
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# Team tools that hand a task to a member; their spans are recorded as delegations
+DELEGATION_TOOLS = ("transfer_task_to_member", "forward_task_to_member")
+
+METRIC_PREFIX = "sportsscribe_"
+
+current_request_id = contextvars.ContextVar("current_request_id", default=None)
+current_span = contextvars.ContextVar("current_span", default=None)
+
+
+def get_trace_id():
+    """ID spans are tied to: the HTTP request ID, or the report job ID on job worker threads."""
+    return current_request_id.get() or get_run_id()
+
+
+@contextmanager
+def request_scope(request_id: str = None):
+    """Ties the spans recorded inside the `with` block (and threads started from it with a copied context) to a request."""
+    token = current_request_id.set(request_id or uuid.uuid4().hex)
+    try:
+        yield current_request_id.get()
+    finally:
+        current_request_id.reset(token)
+
+
+class Metrics:
+    """
+    In-process counters and histograms, rendered in the Prometheus text format.
+
+    Each uvicorn worker process keeps its own; scrape every worker, or run a single one.
+    """
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+
+    @staticmethod
+    def _key(name: str, labels: dict) -> tuple:
+        return name, tuple(sorted((labels or {}).items()))
+
+    def describe(self, name: str, kind: str, text: str):
+        self._help[METRIC_PREFIX + name] = (kind, text)
+
+    def inc(self, name: str, labels: dict = None, value: float = 1):
+        key = self._key(METRIC_PREFIX + name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, labels: dict = None):
+        key = self._key(METRIC_PREFIX + name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram["buckets"][index] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+
+    def snapshot(self) -> dict:
+        """Returns the counter values by (name, labels), e.g. to compare them before and after a benchmark run."""
+        with self._lock:
+            return dict(self._counters)
+
+    @staticmethod
+    def _labels(labels, extra=()) -> str:
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+        return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+    def render(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: {**value, "buckets": list(value["buckets"])} for key, value in self._histograms.items()}
+        lines = []
+        described = set()
+
+        def header(name, kind):
+            if name not in described:
+                described.add(name)
+                text = self._help.get(name, (kind, name))[1]
+                lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in sorted(counters.items()):
+            header(name, "counter")
+            lines.append(f"{name}{self._labels(labels)} {value:g}")
+        for (name, labels), histogram in sorted(histograms.items()):
+            header(name, "histogram")
+            for bound, count in zip(self.buckets, histogram["buckets"]):
+                lines.append(f"{name}_bucket{self._labels(labels, [('le', f'{bound:g}')])} {count}")
+            lines.append(f"{name}_bucket{self._labels(labels, [('le', '+Inf')])} {histogram['count']}")
+            lines.append(f"{name}_sum{self._labels(labels)} {histogram['sum']:.6f}")
+            lines.append(f"{name}_count{self._labels(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+metrics.describe("span_duration_seconds", "histogram", "Duration of pipeline spans by kind and name.")
+metrics.describe("spans_total", "counter", "Finished pipeline spans by kind, name and status.")
+metrics.describe("llm_tokens_total", "counter", "LLM tokens by model and direction (input/output).")
+metrics.describe("http_request_duration_seconds", "histogram", "Duration of API requests served, by route.")
+metrics.describe("http_requests_total", "counter", "API requests served, by method, route and status.")
+
+
+_logger = None
+_logger_lock = threading.Lock()
+
+
+def _trace_logger():
+    # Spans are written through `logging`, whose handler serializes writes from concurrent threads
+    global _logger
+    if _logger is None:
+        with _logger_lock:
+            if _logger is None:
+                logger = logging.getLogger("sportsscribe.trace")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                if TRACE_LOG_PATH:
+                    Path(TRACE_LOG_PATH).parent.mkdir(parents=True, exist_ok=True)
+                    handler = logging.FileHandler(TRACE_LOG_PATH, encoding="utf-8")
+                    handler.setFormatter(logging.Formatter("%(message)s"))
+                    logger.addHandler(handler)
+                _logger = logger
+    return _logger
+
+
+class Span:
+    """A timed step of the pipeline; attributes added with `set` end up in the JSON log line."""
+
+    def __init__(self, kind: str, name: str, attributes: dict):
+        self.kind = kind
+        self.name = name
+        self.attributes = attributes
+        self.span_id = uuid.uuid4().hex[:16]
+        parent = current_span.get()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.trace_id = get_trace_id()
+        self.started_at = time.time()
+        self.status = "ok"
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+
+def record_span(kind: str, name: str, duration: float, status: str = "ok", started_at: float = None,
+                span_id: str = None, parent_id: str = None, **attributes):
+    """
+    Records a finished span: observes its duration and writes it to the JSON trace log.
+
+    Used directly for steps timed elsewhere (e.g. LLM calls, whose timings agno reports after a run).
+    """
+    if not TRACING_ENABLED:
+        return
+    labels = {"kind": kind, "name": name}
+    metrics.observe("span_duration_seconds", duration, labels)
+    metrics.inc("spans_total", {**labels, "status": status})
+    logger = _trace_logger()
+    if not logger.handlers:
+        return
+    if parent_id is None:
+        parent = current_span.get()
+        parent_id = parent.span_id if parent is not None else None
+    started_at = started_at if started_at is not None else time.time() - duration
+    logger.info(json.dumps({
+        "ts": datetime.fromtimestamp(started_at, timezone.utc).isoformat(timespec="milliseconds"),
+        "trace_id": get_trace_id(),
+        "span_id": span_id or uuid.uuid4().hex[:16],
+        "parent_id": parent_id,
+        "kind": kind,
+        "name": name,
+        "duration_ms": round(duration * 1000, 2),
+        "status": status,
+        **attributes,
+    }, default=str, ensure_ascii=False))
+
+
+@contextmanager
+def span(kind: str, name: str, **attributes):
+    """
+    Times the `with` block as a span of the given kind ("delegation", "tool", "http", "llm", "conversion", ...).
+    Spans opened inside it become its children. An exception marks the span as failed and is re-raised.
+
+    Example:
+        with span("http", "cricbuzz.match_info", resource_id=123) as s:
+            response = session.get(url)
+            s.set(status_code=response.status_code)
+    """
+    current = Span(kind, name, attributes)
+    token = current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.set(error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        current_span.reset(token)
+        record_span(
+            kind, name, time.perf_counter() - started, current.status, current.started_at,
+            current.span_id, current.parent_id, **current.attributes,
+        )
+
+
+def record_tokens(model: str, input_tokens: int = 0, output_tokens: int = 0):
+    """Adds LLM token usage to the token counters."""
+    if input_tokens:
+        metrics.inc("llm_tokens_total", {"model": model, "type": "input"}, input_tokens)
+    if output_tokens:
+        metrics.inc("llm_tokens_total", {"model": model, "type": "output"}, output_tokens)
+
+
+def trace_tool_call(function_name: str, function_call, arguments: dict):
+    """
+    agno tool hook: times every tool call of the agent or team it is attached to. Member delegations of a team
+    (`transfer_task_to_member`) are recorded as "delegation" spans named after the member, and cover the
+    member's whole run: agno returns them as generators, and their span ends once the generator is exhausted.
+    """
+    if function_name in DELEGATION_TOOLS:
+        kind, name = "delegation", (arguments or {}).get("member_id") or function_name
+    else:
+        kind, name = "tool", function_name
+    with ExitStack() as stack:
+        stack.enter_context(span(kind, name))
+        result = function_call(**(arguments or {}))
+        # Delegations are generators that run the member as agno iterates over them; keep the span open until then
+        if inspect.isgenerator(result):
+            return _close_when_exhausted(result, stack.pop_all())
+        if inspect.isasyncgen(result):
+            return _aclose_when_exhausted(result, stack.pop_all())
+        return result
+
+
+def _close_when_exhausted(generator, stack: ExitStack):
+    with stack:
+        yield from generator
+
+
+async def _aclose_when_exhausted(generator, stack: ExitStack):
+    with stack:
+        async for item in generator:
+            yield item
+
+
+def _value(metrics_value) -> float:
+    # agno run metrics hold one value per model call in a list; message metrics hold a single value
+    if isinstance(metrics_value, (list, tuple)):
+        return sum(value or 0 for value in metrics_value)
+    return metrics_value or 0
+
+
+def trace_run_response(response, agent: str = None):
+    """
+    Records an "llm" span with token counts for every model call of a finished agno run, including the runs of
+    team members. agno times each call and counts its tokens on the assistant message it produced.
+    """
+    if response is None or not TRACING_ENABLED:
+        return
+    model = getattr(response, "model", None) or "unknown"
+    agent = agent or getattr(response, "team_name", None) or getattr(response, "agent_name", None) or model
+    for message in getattr(response, "messages", None) or []:
+        if getattr(message, "role", None) != "assistant" or getattr(message, "metrics", None) is None:
+            continue
+        message_metrics = message.metrics
+        input_tokens = int(_value(getattr(message_metrics, "input_tokens", 0)))
+        output_tokens = int(_value(getattr(message_metrics, "output_tokens", 0)))
+        duration = float(_value(getattr(message_metrics, "time", 0)))
+        created_at = getattr(message, "created_at", None)
+        record_span(
+            "llm", model, duration, started_at=created_at - duration if created_at else None,
+            agent=agent, input_tokens=input_tokens, output_tokens=output_tokens,
+        )
+        record_tokens(model, input_tokens, output_tokens)
+    for member_response in getattr(response, "member_responses", None) or []:
+        trace_run_response(member_response)
+
+
+def observe_http_request(method: str, route: str, status: int, duration: float):
+    """Records one request served by the API."""
+    labels = {"method": method, "route": route}
+    metrics.observe("http_request_duration_seconds", duration, labels)
+    metrics.inc("http_requests_total", {**labels, "status": str(status)})
+
+
+def render_metrics() -> str:
+    """Returns all metrics in the Prometheus text exposition format."""
+    return metrics.render()
@@ -7,7 +7,7 @@ import { Textarea } from "@/components/ui/textarea"
 import { Alert, AlertDescription } from "@/components/ui/alert"
 import { Loader2, FileText, Download, AlertCircle, CheckCircle, Mic, MicOff, Volume2, Play, Pause, VolumeX } from "lucide-react"
 import { CricketBall } from "@/components/cricket-icons"
-import { generateReport, downloadReport } from "@/lib/api"
+import { streamReport, downloadReport, startNarrationStream } from "@/lib/api"
 import ReactMarkdown from "react-markdown"
 import { Prism as SyntaxHighlighter } from "react-syntax-highlighter"
 import { vscDarkPlus } from "react-syntax-highlighter/dist/esm/styles/prism"
@@ -25,10 +25,28 @@ const extractMarkdownFromHtml = (html: string): string => {
   return ""
 }
 
+// Strip the ```markdown fence the journalist team wraps its report in, including a still-open one while streaming
+const stripMarkdownFence = (text: string): string => {
+  return text.replace(/^[\s\S]*?```markdown\s*\n/, "").replace(/\n?```\s*$/, "")
+}
+
+// Human-readable labels for the report pipeline stages streamed by the server
+const STAGE_LABELS: Record<string, string> = {
+  queued: "Waiting for a free report writer...",
+  id_resolution: "Looking up Cricbuzz IDs...",
+  data_fetch: "Fetching match and player data...",
+  drafting: "Drafting the report...",
+  saving: "Saving the report...",
+  rendering: "Rendering the report...",
+  cached: "Loading a recently generated report...",
+}
+
 export default function ReportGeneratorPage() {
   const [input, setInput] = useState("")
   const [isLoading, setIsLoading] = useState(false)
+  const [stage, setStage] = useState("")
   const [markdownContent, setMarkdownContent] = useState(``)
+  const [reportId, setReportId] = useState("")
   const [error, setError] = useState("")
   const [success, setSuccess] = useState("")
   
@@ -136,20 +154,31 @@ export default function ReportGeneratorPage() {
     setError("")
     setSuccess("")
     setMarkdownContent("")
+    setReportId("")
+    setStage("")
 
     try {
-      const html = await generateReport(input)
-      const markdown = extractMarkdownFromHtml(html)
+      let partial = ""
+      const report = await streamReport(input, {
+        onStage: (nextStage) => setStage(nextStage),
+        onChunk: (chunk) => {
+          partial += chunk
+          setMarkdownContent(stripMarkdownFence(partial))
+        },
+      })
+      const markdown = extractMarkdownFromHtml(report.html) || stripMarkdownFence(report.markdown)
       if (!markdown) {
         throw new Error("No valid Markdown content found in the response.")
       }
       setMarkdownContent(markdown)
+      setReportId(report.reportId)
       setSuccess("Report generated successfully! You can now preview and download it.")
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : "An unexpected error occurred"
       setError(errorMessage)
     } finally {
       setIsLoading(false)
+      setStage("")
     }
   }
 
@@ -164,29 +193,11 @@ export default function ReportGeneratorPage() {
     setAudioUrl("")
 
     try {
-      const response = await fetch('http://127.0.0.1:8000/generate-narration-audio', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({ content: markdownContent }),
-      })
-
-      if (!response.ok) {
-        throw new Error(`HTTP error! status: ${response.status}`)
-      }
-
-      const data = await response.json()
-      console.log('Audio response:', data) // Debug log
-      
-      // Construct full URL if needed
-      const fullAudioUrl = data.audio_url
-
-      console.log('Full audio URL:', fullAudioUrl) // Debug log
-      
-      setAudioUrl(fullAudioUrl)
-      setAudioFilename(data.filename)
-      setSuccess("Audio narration generated successfully!")
+      // The narration is streamed: playback starts with the first synthesized sentences
+      const narration = await startNarrationStream(markdownContent, reportId || undefined)
+      setAudioUrl(narration.streamUrl)
+      setAudioFilename(narration.filename)
+      setSuccess("Audio narration started!")
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : "Failed to generate audio narration"
       setAudioError(errorMessage)
@@ -198,6 +209,9 @@ export default function ReportGeneratorPage() {
   useEffect(() => {
   if (audioRef.current && audioUrl) {
     audioRef.current.load()
+    audioRef.current.play().catch(() => {
+      // Autoplay can be blocked by the browser; the play button still works
+    })
   }
 }, [audioUrl])
 
@@ -228,6 +242,7 @@ export default function ReportGeneratorPage() {
 
     try {
       const response = await fetch(`http://127.0.0.1:8000/audio/${audioFilename}`)
+      if (response.status === 404) throw new Error('The narration is still being generated. Try again once playback has finished loading.')
       if (!response.ok) throw new Error('Download failed')
       
       const blob = await response.blob()
@@ -247,8 +262,13 @@ export default function ReportGeneratorPage() {
   }
 
   const handleDownloadReport = async () => {
+    if (!reportId) {
+      setError("Generate a report first to download it.")
+      return
+    }
+
     try {
-      await downloadReport()
+      await downloadReport(reportId)
       setSuccess("Download started successfully!")
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : "Failed to download report"
@@ -391,11 +411,11 @@ export default function ReportGeneratorPage() {
               <CardDescription>Generated report will appear here in Markdown format</CardDescription>
             </CardHeader>
             <CardContent>
-              {isLoading ? (
+              {isLoading && !markdownContent ? (
                 <div className="flex items-center justify-center py-12">
                   <div className="text-center">
                     <Loader2 className="w-8 h-8 animate-spin text-green-600 mx-auto mb-4" />
-                    <p className="text-green-700">Generating your cricket report...</p>
+                    <p className="text-green-700">{STAGE_LABELS[stage] || "Generating your cricket report..."}</p>
                   </div>
                 </div>
               ) : markdownContent ? (
@@ -431,7 +451,7 @@ export default function ReportGeneratorPage() {
                   <div className="space-y-3">
                     <Button
                       onClick={handleGenerateAudio}
-                      disabled={isGeneratingAudio}
+                      disabled={isGeneratingAudio || isLoading}
                       className="w-full bg-purple-600 hover:bg-purple-700"
                       size="sm"
                     >
@@ -77,6 +77,91 @@ export async function generateReport(input: string): Promise<string> {
   }
 }
 
+export interface ReportStreamHandlers {
+  onStage?: (stage: string, member: string | null) => void
+  onChunk?: (markdown: string) => void
+}
+
+export interface StreamedReport {
+  jobId: string
+  reportId: string
+  markdown: string
+  html: string
+}
+
+// Streams report generation over server-sent events, reporting stages and partial markdown as they arrive
+// Pass bypassCache to regenerate a report that was recently generated for the same query
+export async function streamReport(
+  input: string,
+  handlers: ReportStreamHandlers = {},
+  bypassCache = false,
+): Promise<StreamedReport> {
+  try {
+    const response = await makeAPICall("/get_report/stream", { input, bypass_cache: bypassCache })
+    if (!response.body) {
+      throw new Error("Streaming is not supported by this browser.")
+    }
+
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ""
+
+    while (true) {
+      const { done, value } = await reader.read()
+      if (done) break
+      buffer += decoder.decode(value, { stream: true })
+
+      let boundary = buffer.indexOf("\n\n")
+      while (boundary !== -1) {
+        const rawEvent = buffer.slice(0, boundary)
+        buffer = buffer.slice(boundary + 2)
+        boundary = buffer.indexOf("\n\n")
+
+        let event = "message"
+        let data = ""
+        for (const line of rawEvent.split("\n")) {
+          if (line.startsWith("event: ")) event = line.slice(7)
+          else if (line.startsWith("data: ")) data += line.slice(6)
+        }
+        if (!data) continue
+        const payload = JSON.parse(data)
+
+        if (event === "stage") handlers.onStage?.(payload.stage, payload.member)
+        else if (event === "chunk") handlers.onChunk?.(payload.markdown)
+        else if (event === "done") {
+          return { jobId: payload.job_id, reportId: payload.report_id, markdown: payload.markdown, html: payload.html }
+        }
+        else if (event === "error") throw new Error(payload.error)
+      }
+    }
+    throw new Error("The report stream ended unexpectedly.")
+  } catch (error) {
+    console.error("Error streaming report:", error)
+    const errorMessage = error instanceof Error ? error.message : "An unexpected error occurred"
+    throw new Error(`Failed to generate report: ${errorMessage}`)
+  }
+}
+
+export interface NarrationStream {
+  streamUrl: string
+  audioUrl: string
+  filename: string
+}
+
+// Starts a streamed narration; play streamUrl right away, the full MP3 is available at audioUrl once it finished
+// Pass the report's ID to list the narration with the report's other files
+export async function startNarrationStream(content: string, reportId?: string): Promise<NarrationStream> {
+  try {
+    const response = await makeAPICall("/narration/stream", { content, report_id: reportId })
+    const data = await response.json()
+    return { streamUrl: data.stream_url, audioUrl: data.audio_url, filename: data.filename }
+  } catch (error) {
+    console.error("Error starting narration:", error)
+    const errorMessage = error instanceof Error ? error.message : "An unexpected error occurred"
+    throw new Error(`Failed to generate audio narration: ${errorMessage}`)
+  }
+}
+
 export async function getBattingStats(input: string): Promise<BattingStats> {
   try {
     const response = await makeAPICall("/get_batting", { input })
@@ -111,9 +196,10 @@ export async function getBowlingStats(input: string): Promise<BowlingStats> {
   }
 }
 
-export async function downloadReport(): Promise<void> {
+// Downloads the DOCX file of the report with the given ID (the reportId of a generated report)
+export async function downloadReport(reportId: string): Promise<void> {
   try {
-    const response = await makeAPICall('/download-docx', null, "GET")
+    const response = await makeAPICall(`/reports/${encodeURIComponent(reportId)}/docx`, null, "GET")
 
     const blob = await response.blob()
 